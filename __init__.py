@@ -24,7 +24,16 @@ for dependency in dependencies:
 import bpy
 from bpy.app.handlers import persistent
 
-from . import exporter, importer, material_panel, preferences, view3d_panel
+from . import (
+    exporter,
+    filters,
+    importer,
+    material_panel,
+    multiblock,
+    playback,
+    preferences,
+    view3d_panel,
+)
 from .mesh import update_mesh
 from .view3d_panel.filters_panel import update_filters
 
@@ -47,23 +56,56 @@ def update_frame(scene):
     update_filters(scene)
 
 
+def update_resolution(scene, final_render):
+    # The handlers set the full resolution state explicitly, the render job is
+    # still running when render_complete and render_cancel are called
+    playback.set_rendering(final_render)
+    if scene.vtk_lod_enabled or scene.vtk_frame_stride > 1:
+        update_mesh(scene, force=True)
+        update_filters(scene)
+
+
+@persistent
+def swap_full_resolution(scene, *args):
+    # Rendered frames use every file at full resolution instead of the preview,
+    # following frames of an animation are read at full resolution directly
+    if not playback.is_rendering():
+        update_resolution(scene, final_render=True)
+
+
+@persistent
+def swap_preview(scene, *args):
+    if playback.is_rendering():
+        update_resolution(scene, final_render=False)
+
+
 def register():
     exporter.register()
+    filters.register()
     importer.register()
     material_panel.register()
+    multiblock.register()
     preferences.register()
     view3d_panel.register()
 
     bpy.types.WindowManager.on_frame_change = update_frame
     bpy.app.handlers.frame_change_post.append(bpy.types.WindowManager.on_frame_change)
+    bpy.app.handlers.render_pre.append(swap_full_resolution)
+    bpy.app.handlers.render_complete.append(swap_preview)
+    bpy.app.handlers.render_cancel.append(swap_preview)
 
 
 def unregister():
     exporter.unregister()
+    filters.unregister()
     importer.unregister()
     preferences.unregister()
     material_panel.unregister()
+    multiblock.unregister()
     view3d_panel.unregister()
 
     bpy.app.handlers.frame_change_post.remove(bpy.types.WindowManager.on_frame_change)
+    bpy.app.handlers.render_pre.remove(swap_full_resolution)
+    bpy.app.handlers.render_complete.remove(swap_preview)
+    bpy.app.handlers.render_cancel.remove(swap_preview)
     del bpy.types.WindowManager.on_frame_change
@@ -5,6 +5,21 @@ import bpy
 import numpy as np
 import pyvista as pv
 
+from .nodes import (
+    apply_colormap,
+    get_colormap_lut,
+    get_data_range,
+    get_material_colormap,
+)
+
+# Attribute read by the materials in packed display mode: the node tree never
+# changes, switching the displayed attribute only uploads new values
+DISPLAY_ATTRIBUTE = "vtk_display_scalar"
+# Byte colors of the displayed values for the solid mode attribute coloring
+BAKED_COLORS_ATTRIBUTE = "vtk_colors"
+# Attributes written by the add-on for display, not data of the VTK file
+INTERNAL_ATTRIBUTES = (DISPLAY_ATTRIBUTE, BAKED_COLORS_ATTRIBUTE)
+
 
 def initialize_material_attributes(attr_name, attr_values, mesh, material, domain):
     if attr_name == "id":
@@ -29,8 +44,8 @@ def initialize_material_attributes(attr_name, attr_values, mesh, material, domai
         attr_type = "value"
         attr.data.foreach_set(attr_type, attr_values)
 
-        min_value = np.min(attr_values).item()
-        max_value = np.max(attr_values).item()
+        min_value = np.nanmin(attr_values).item()
+        max_value = np.nanmax(attr_values).item()
 
         material["attributes"][attr_name] = {
             "current_frame_min": min_value,
@@ -46,8 +61,8 @@ def initialize_material_attributes(attr_name, attr_values, mesh, material, domai
             #     attr_type = 'color'
 
             magnitude = np.linalg.norm(attr_values, axis=1)
-            min_value = np.min(magnitude).item()
-            max_value = np.max(magnitude).item()
+            min_value = np.nanmin(magnitude).item()
+            max_value = np.nanmax(magnitude).item()
 
             material["attributes"][attr_name] = {}
 
@@ -61,8 +76,8 @@ def initialize_material_attributes(attr_name, attr_values, mesh, material, domai
             components = ["X", "Y", "Z"] if attr_values.shape[1] == 3 else ["X", "Y"]
             for component in components:
                 index = components.index(component)
-                min_value = np.min(attr_values[:, index]).item()
-                max_value = np.max(attr_values[:, index]).item()
+                min_value = np.nanmin(attr_values[:, index]).item()
+                max_value = np.nanmax(attr_values[:, index]).item()
 
                 material["attributes"][attr_name][component] = {
                     "current_frame_min": min_value,
@@ -83,8 +98,8 @@ def initialize_material_attributes(attr_name, attr_values, mesh, material, domai
 
 
 def update_material_attributes(attr_name, attr_values, mesh, material, domain):
-    frame_min = np.min(attr_values).item()
-    frame_max = np.max(attr_values).item()
+    frame_min = np.nanmin(attr_values).item()
+    frame_max = np.nanmax(attr_values).item()
 
     if attr_name == "id":
         attr_name = "id_"
@@ -109,8 +124,8 @@ def update_material_attributes(attr_name, attr_values, mesh, material, domain):
             # elif component in ['X', 'Y', 'Z']:
             #     index = ['X', 'Y', 'Z'].index(component)
             #     array = attr_values[:, index]
-            frame_min = np.min(array).item()
-            frame_max = np.max(array).item()
+            frame_min = np.nanmin(array).item()
+            frame_max = np.nanmax(array).item()
 
         mesh.attributes.new(attr_name, type=value_type, domain=domain)
 
@@ -178,6 +193,104 @@ def update_material_attributes(attr_name, attr_values, mesh, material, domain):
         )
 
 
+def merge_range(stats, previous):
+    stats["global_min"] = min(stats["global_min"], previous["global_min"])
+    stats["global_max"] = max(stats["global_max"], previous["global_max"])
+
+
+def merge_attribute_ranges(ranges, previous):
+    # Ranges accumulated before the mesh was rebuilt: the attributes are
+    # created again, their ranges restarted from the current frame
+    for attr_name, previous_stats in previous.items():
+        if attr_name not in ranges:
+            ranges[attr_name] = previous_stats
+            continue
+        stats = ranges[attr_name]
+        if "global_min" in previous_stats:
+            if "global_min" in stats:
+                merge_range(stats, previous_stats)
+            continue
+        for component, component_stats in previous_stats.items():
+            if component not in stats:
+                stats[component] = component_stats
+            else:
+                merge_range(stats[component], component_stats)
+
+
+def get_display_values(values, component="Magnitude"):
+    values = np.asarray(values)
+    if values.ndim == 1:
+        return values
+    if component == "Magnitude":
+        return np.sqrt(np.einsum("ij,ij->i", values, values))
+    return values[:, "XYZ".index(component)]
+
+
+def get_displayed_values(mesh, material):
+    # Values of the selected attribute or component, as shown by the material
+    source = mesh.attributes[material.vtk_attributes]
+    if source.data_type == "FLOAT":
+        values = np.empty(len(source.data), dtype=np.float32)
+        source.data.foreach_get("value", values)
+        return values
+    size = 3 if source.data_type == "FLOAT_VECTOR" else 2
+    values = np.empty(size * len(source.data), dtype=np.float32)
+    source.data.foreach_get("vector", values)
+    return get_display_values(
+        values.reshape(-1, size), material.vtk_attribute_component
+    )
+
+
+def update_display_scalar(mesh, material):
+    source = mesh.attributes[material.vtk_attributes]
+    values = get_displayed_values(mesh, material)
+
+    display = mesh.attributes.get(DISPLAY_ATTRIBUTE)
+    if display is not None and display.domain != source.domain:
+        mesh.attributes.remove(display)
+        display = None
+    if display is None:
+        display = mesh.attributes.new(
+            DISPLAY_ATTRIBUTE, type="FLOAT", domain=source.domain
+        )
+    display.data.foreach_set("value", values)
+
+
+def update_baked_colors(mesh, material):
+    source = mesh.attributes[material.vtk_attributes]
+    values = get_displayed_values(mesh, material)
+    lut = get_colormap_lut(
+        get_material_colormap(material), int(bpy.context.scene.vtk_lut_size)
+    )
+    colors = apply_colormap(values, *get_data_range(material), lut)
+
+    domain = "POINT"
+    if source.domain == "FACE":
+        # Color attributes are shown per point or per face corner
+        loop_totals = np.empty(len(mesh.polygons), dtype=np.int64)
+        mesh.polygons.foreach_get("loop_total", loop_totals)
+        colors = np.repeat(colors, loop_totals, axis=0)
+        domain = "CORNER"
+
+    baked = mesh.attributes.get(BAKED_COLORS_ATTRIBUTE)
+    if baked is not None and baked.domain != domain:
+        mesh.attributes.remove(baked)
+        baked = None
+    if baked is None:
+        baked = mesh.color_attributes.new(BAKED_COLORS_ATTRIBUTE, "BYTE_COLOR", domain)
+    baked.data.foreach_set("color_srgb", colors.ravel())
+    mesh.color_attributes.active_color = baked
+
+
+def update_display_attributes(mesh, material):
+    if material.vtk_attributes not in mesh.attributes:
+        return
+    if material.vtk_packed_display:
+        update_display_scalar(mesh, material)
+    if material.vtk_bake_colors:
+        update_baked_colors(mesh, material)
+
+
 def update_attributes_from_vtk(polydata: pv.PolyData, mesh_name: str) -> None:
     mesh = bpy.data.meshes[mesh_name]
     mesh.attributes["position"].data.foreach_set("vector", np.ravel(polydata.points))
@@ -189,4 +302,5 @@ def update_attributes_from_vtk(polydata: pv.PolyData, mesh_name: str) -> None:
     for attr_name, values in polydata.cell_data.items():
         update_material_attributes(attr_name, values, mesh, mat, "FACE")
 
+    update_display_attributes(mesh, mat)
     mesh.update()
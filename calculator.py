@@ -0,0 +1,256 @@
+import ast
+import json
+import keyword
+import warnings
+from collections import OrderedDict
+
+import bpy
+import numpy as np
+
+from .reader import get_array_selection, get_frame_file_path
+
+# Names available in expressions besides the arrays
+FUNCTIONS = {
+    "abs": np.abs,
+    "sqrt": np.sqrt,
+    "exp": np.exp,
+    "log": np.log,
+    "log10": np.log10,
+    "sin": np.sin,
+    "cos": np.cos,
+    "tan": np.tan,
+    "arctan2": np.arctan2,
+    "minimum": np.minimum,
+    "maximum": np.maximum,
+    "clip": np.clip,
+    "where": np.where,
+    "min": np.min,
+    "max": np.max,
+    "ptp": np.ptp,
+    "mean": np.mean,
+    "pi": np.pi,
+}
+
+# Syntax allowed in expressions: arithmetic and comparisons of the arrays,
+# subscripts and calls to FUNCTIONS. Without attribute access, expressions
+# saved in a .blend file can't reach modules or object internals.
+ALLOWED_NODES = (
+    ast.Expression,
+    ast.Name,
+    ast.Load,
+    ast.Constant,
+    ast.BinOp,
+    ast.UnaryOp,
+    ast.Compare,
+    ast.Subscript,
+    ast.Slice,
+    ast.Tuple,
+    ast.Call,
+    ast.keyword,
+    ast.Add,
+    ast.Sub,
+    ast.Mult,
+    ast.Div,
+    ast.FloorDiv,
+    ast.Mod,
+    ast.Pow,
+    ast.MatMult,
+    ast.BitAnd,
+    ast.BitOr,
+    ast.BitXor,
+    ast.Invert,
+    ast.UAdd,
+    ast.USub,
+    ast.Not,
+    ast.Eq,
+    ast.NotEq,
+    ast.Lt,
+    ast.LtE,
+    ast.Gt,
+    ast.GtE,
+)
+
+# Largest constant exponent: Python integer powers are computed exactly and
+# can freeze Blender, while constants are folded at compile time
+MAX_EXPONENT = 100
+
+_compiled_expressions = {}
+
+# Calculator results by object, frame and calculators
+_results = OrderedDict()
+
+
+def mag(vectors):
+    return np.linalg.norm(vectors, axis=-1)
+
+
+def dot(a, b):
+    return np.sum(np.multiply(a, b), axis=-1)
+
+
+def von_mises(tensors):
+    # Symmetric tensors as 6 components (xx, yy, zz, xy, yz, xz) or 9 components
+    tensors = np.asarray(tensors)
+    if tensors.shape[-1] == 9:
+        tensors = tensors[..., [0, 4, 8, 1, 5, 2]]
+    xx, yy, zz, xy, yz, xz = np.moveaxis(tensors, -1, 0)
+    return np.sqrt(
+        0.5 * ((xx - yy) ** 2 + (yy - zz) ** 2 + (zz - xx) ** 2)
+        + 3.0 * (xy**2 + yz**2 + xz**2)
+    )
+
+
+FUNCTIONS.update({"mag": mag, "dot": dot, "cross": np.cross, "von_mises": von_mises})
+
+
+def is_constant(node):
+    if isinstance(node, ast.UnaryOp):
+        return is_constant(node.operand)
+    if isinstance(node, ast.BinOp):
+        return is_constant(node.left) and is_constant(node.right)
+    return isinstance(node, ast.Constant)
+
+
+def get_number(node):
+    # Value of a number with optional signs, None for other expressions
+    sign = 1
+    while isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+        if isinstance(node.op, ast.USub):
+            sign = -sign
+        node = node.operand
+    if isinstance(node, ast.Constant) and type(node.value) in (int, float):
+        return sign * node.value
+    return None
+
+
+def check_power(node):
+    if is_constant(node.left) and is_constant(node.right):
+        raise ValueError("Unsupported power of constants")
+    if is_constant(node.right):
+        exponent = get_number(node.right)
+        if exponent is None or abs(exponent) > MAX_EXPONENT:
+            raise ValueError(f"Exponents are limited to {MAX_EXPONENT}")
+
+
+def check_expression(tree):
+    for node in ast.walk(tree):
+        if not isinstance(node, ALLOWED_NODES):
+            raise ValueError(f"Unsupported syntax: {type(node).__name__}")
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Pow):
+            check_power(node)
+        if isinstance(node, ast.Call) and (
+            not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS
+        ):
+            raise NameError(f"{ast.unparse(node.func)} is not a calculator function")
+
+
+def compile_expression(expression):
+    if expression not in _compiled_expressions:
+        tree = ast.parse(expression, "<vtk calculator>", "eval")
+        check_expression(tree)
+        _compiled_expressions[expression] = compile(tree, "<vtk calculator>", "eval")
+    return _compiled_expressions[expression]
+
+
+def is_auto_run_allowed():
+    # Expressions are saved in the .blend file, like driver expressions they
+    # are only evaluated when Blender may auto-run the file's scripts
+    return (
+        bpy.context.preferences.filepaths.use_scripts_auto_execute
+        and not bpy.app.autoexec_fail
+    )
+
+
+def evaluate_expression(expression, vtk_data, domain="POINT"):
+    data = vtk_data.point_data if domain == "POINT" else vtk_data.cell_data
+    size = vtk_data.n_points if domain == "POINT" else vtk_data.n_cells
+
+    # Arrays whose name is not an identifier are accessed as data["name"]
+    arrays = {name: np.asarray(data[name]) for name in data.keys()}
+    namespace = {"__builtins__": {}, **FUNCTIONS, "data": arrays}
+    namespace.update(
+        {
+            name: array
+            for name, array in arrays.items()
+            if name.isidentifier() and not keyword.iskeyword(name)
+        }
+    )
+    if domain == "POINT":
+        namespace["coords"] = np.asarray(vtk_data.points)
+
+    result = np.asarray(eval(compile_expression(expression), namespace), dtype=float)
+    if result.ndim == 0:
+        result = np.full(size, result.item())
+    if result.shape[0] != size:
+        raise ValueError(f"{result.shape[0]} values instead of {size}")
+    if result.ndim > 2 or (result.ndim == 2 and result.shape[1] not in (2, 3)):
+        raise ValueError(f"Unsupported result shape {result.shape}")
+    return np.ascontiguousarray(result)
+
+
+def get_calculators(obj):
+    if obj is None or "vtk_calculators" not in obj:
+        return []
+    return [calculator.to_dict() for calculator in obj["vtk_calculators"]]
+
+
+def get_results_key(obj, calculators):
+    return (
+        obj.name,
+        get_frame_file_path(obj),
+        json.dumps(get_array_selection(), sort_keys=True),
+        json.dumps(calculators, sort_keys=True),
+    )
+
+
+def set_result(vtk_data, name, domain, array):
+    if domain == "POINT":
+        vtk_data.point_data[name] = array
+    else:
+        vtk_data.cell_data[name] = array
+
+
+def apply_calculators(vtk_data, obj, cache=True):
+    calculators = get_calculators(obj)
+    if len(calculators) == 0:
+        return vtk_data
+    if not is_auto_run_allowed():
+        warnings.warn(
+            "Calculators are skipped, Auto Run Python Scripts is disabled",
+            stacklevel=2,
+        )
+        return vtk_data
+
+    key = get_results_key(obj, calculators)
+    if not cache or key not in _results:
+        results = []
+        for calculator in calculators:
+            try:
+                array = evaluate_expression(
+                    calculator["expression"], vtk_data, calculator["domain"]
+                )
+            except Exception as error:
+                warnings.warn(
+                    f"Calculator {calculator['name']} failed: {error}", stacklevel=2
+                )
+                continue
+            # Following expressions can use the previous results
+            set_result(vtk_data, calculator["name"], calculator["domain"], array)
+            results.append((calculator["name"], calculator["domain"], array))
+        if not cache:
+            return vtk_data
+        _results[key] = results
+        while len(_results) > max(bpy.context.scene.vtk_filter_cache_size, 1):
+            _results.popitem(last=False)
+        return vtk_data
+
+    _results.move_to_end(key)
+    for name, domain, array in _results[key]:
+        set_result(vtk_data, name, domain, array)
+    return vtk_data
+
+
+def clear_calculator_results(obj=None):
+    for key in list(_results):
+        if obj is None or key[0] == obj.name:
+            del _results[key]
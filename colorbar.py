@@ -1,203 +1,173 @@
+import warnings
+from collections import OrderedDict
+
 import bpy
 import numpy as np
-
-import matplotlib.pyplot as plt
-
-from .attributes import update_attributes_from_vtk
-
-def create_colorbar(context):
-    mat = context.object.active_material
-
-    n_colors = len(mat.node_tree.nodes["Color Ramp"].color_ramp.elements)
-
-    cbar_scale = 0.25
-    y = np.linspace(0.0, cbar_scale, n_colors)
-
-    grid = np.zeros(shape=(2 * n_colors, 3))
-    grid[1::2, 0] = 0.1 * cbar_scale
-    grid[0::2, 1] = y
-    grid[1::2, 1] = y
-
-    faces = [(i, i + 1, i + 3, i + 2) for i in range(0, 2 * (n_colors - 1), 2)]
-
-    cbar_name = f"{mat.name}_cbar"
-    cbar_mesh = bpy.data.meshes.new(cbar_name)
-    cbar_mesh.from_pydata(vertices=grid, edges=[], faces=faces)
-
-    cbar_obj = bpy.data.objects.new(cbar_name, cbar_mesh)
-    bpy.context.scene.collection.objects.link(cbar_obj)
-
-    attr_value = grid[:, 1]
-    min_value = np.min(attr_value)
-    max_value = np.max(attr_value)
-    color_fac = (attr_value - min_value) / (max_value - min_value)
-
-    cbar_mat = bpy.data.materials.new(name=cbar_name)
-    attr = cbar_mesh.attributes.new("Color Fac", type='FLOAT', domain='POINT')
-    attr.data.foreach_set('value', color_fac)
-
-    cbar_mat.use_nodes = True
-    bsdf = cbar_mat.node_tree.nodes["Principled BSDF"]
-    cbar_mat.node_tree.nodes.remove(bsdf)
-
-    emission_shader_node = cbar_mat.node_tree.nodes.new("ShaderNodeEmission")
-    material_output_node = cbar_mat.node_tree.nodes["Material Output"]
-
-    attribute_node = cbar_mat.node_tree.nodes.new("ShaderNodeAttribute")
-    attribute_node.attribute_name = "Color Fac"
-
-    #cbar_mat.vtk_colormaps = colormap
-    color_ramp_node = cbar_mat.node_tree.nodes.new("ShaderNodeValToRGB")
-    cmap = plt.get_cmap(mat.vtk_colormaps)
-
-    # remove last element to create it again in the last iteration to have it selected
-    last_elem = color_ramp_node.color_ramp.elements[-1]
-    color_ramp_node.color_ramp.elements.remove(last_elem)
-
-    for i in range(n_colors):
-        location = i / (n_colors - 1)
-        if i != 0:
-            color_ramp_node.color_ramp.elements.new(location)
-
-    cbar_mat.node_tree.links.new(
-        attribute_node.outputs["Fac"],
-        color_ramp_node.inputs["Fac"]
-    )
-    cbar_mat.node_tree.links.new(
-        color_ramp_node.outputs["Color"],
-        emission_shader_node.inputs["Color"]
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.cm import ScalarMappable
+from matplotlib.colors import Normalize
+from matplotlib.figure import Figure
+
+from .nodes import get_cmap, get_data_range, get_material_colormap, linear_to_srgb
+
+# Size of the colorbar image in pixels, the plane has the same aspect ratio
+CBAR_WIDTH = 192
+CBAR_HEIGHT = 512
+CBAR_DPI = 128
+CBAR_SCALE = 0.25
+N_TICKS = 5
+
+# Rendered colorbar images by colormap, range and labels
+_colorbar_pixels = OrderedDict()
+MAX_CACHED_COLORBARS = 16
+
+
+def render_colorbar_pixels(
+    colormap, min_value, max_value, label, labels_color, scale, number_format
+):
+    # Flat RGBA buffer of the colorbar image, bottom row first as in Blender
+    key = (colormap, min_value, max_value, label, tuple(labels_color), scale)
+    key += (number_format,)
+    if key in _colorbar_pixels:
+        _colorbar_pixels.move_to_end(key)
+        return _colorbar_pixels[key]
+
+    fig = Figure(figsize=(CBAR_WIDTH / CBAR_DPI, CBAR_HEIGHT / CBAR_DPI), dpi=CBAR_DPI)
+    fig.patch.set_alpha(0.0)
+    canvas = FigureCanvasAgg(fig)
+    ax = fig.add_axes((0.05, 0.05, 0.2, 0.9))
+    if max_value <= min_value:
+        max_value = min_value + 1.0
+    mappable = ScalarMappable(
+        norm=Normalize(vmin=min_value, vmax=max_value), cmap=get_cmap(colormap)
     )
-    cbar_mat.node_tree.links.new(
-        emission_shader_node.outputs["Emission"],
-        material_output_node.inputs["Surface"]
+    colorbar = fig.colorbar(mappable, cax=ax)
+
+    numbers_format = "{" + number_format + "}"
+    ticks = np.linspace(min_value, max_value, N_TICKS)
+    colorbar.set_ticks(ticks)
+    colorbar.set_ticklabels([numbers_format.format(tick * scale) for tick in ticks])
+    colorbar.outline.set_edgecolor(labels_color)
+    ax.tick_params(colors=labels_color, labelsize=8)
+    colorbar.set_label(label, color=labels_color)
+
+    canvas.draw()
+    pixels = np.asarray(canvas.buffer_rgba(), dtype=np.float32)[::-1] / 255.0
+    pixels = np.ascontiguousarray(pixels).ravel()
+
+    _colorbar_pixels[key] = pixels
+    while len(_colorbar_pixels) > MAX_CACHED_COLORBARS:
+        _colorbar_pixels.popitem(last=False)
+    return pixels
+
+
+def get_colorbar_pixels(mat):
+    min_value, max_value = get_data_range(mat)
+    labels_color = linear_to_srgb(mat.vtk_scalar_bar_labels_color[:3]).tolist()
+    return render_colorbar_pixels(
+        get_material_colormap(mat),
+        min_value,
+        max_value,
+        mat.vtk_scalar_bar_attribute_name or mat.vtk_attributes,
+        (*labels_color, mat.vtk_scalar_bar_labels_color[3]),
+        mat.vtk_scalar_bar_scale_numbers,
+        mat.vtk_scalar_bar_number_format,
     )
 
-    cbar_obj.data.materials.append(cbar_mat)
 
+def create_colorbar_material(cbar_name, image):
+    cbar_mat = bpy.data.materials.new(name=cbar_name)
+    cbar_mat.use_nodes = True
+    if hasattr(cbar_mat, "blend_method"):  # Eevee before Blender 4.2
+        cbar_mat.blend_method = "BLEND"
 
-    scale = 0.1 * cbar_scale
+    nodes = cbar_mat.node_tree.nodes
+    nodes.remove(nodes["Principled BSDF"])
+    material_output_node = nodes["Material Output"]
 
-    min_range_curve = bpy.data.curves.new(name=f"{mat.name}_min", type='FONT')
-    min_range_obj = bpy.data.objects.new(name=f"{mat.name}_min", object_data=min_range_curve)
-    min_range_obj.scale = (scale, scale, scale)
-    min_range_obj.location = (0.15 * cbar_scale, 0, 0)
+    image_node = nodes.new("ShaderNodeTexImage")
+    image_node.image = image
+    emission_node = nodes.new("ShaderNodeEmission")
+    transparent_node = nodes.new("ShaderNodeBsdfTransparent")
+    mix_node = nodes.new("ShaderNodeMixShader")
 
-    max_range_curve = bpy.data.curves.new(name=f"{mat.name}_max", type='FONT')
-    max_range_obj = bpy.data.objects.new(name=f"{mat.name}_max", object_data=max_range_curve)
-    max_range_obj.scale = (scale, scale, scale)
-    max_range_obj.location = (
-        0.15 * cbar_scale,
-        cbar_scale - scale * max_range_obj.dimensions[1],
-        0
-    )
+    links = cbar_mat.node_tree.links
+    links.new(image_node.outputs["Color"], emission_node.inputs["Color"])
+    links.new(image_node.outputs["Alpha"], mix_node.inputs["Fac"])
+    links.new(transparent_node.outputs["BSDF"], mix_node.inputs[1])
+    links.new(emission_node.outputs["Emission"], mix_node.inputs[2])
+    links.new(mix_node.outputs["Shader"], material_output_node.inputs["Surface"])
 
-    attribute_curve = bpy.data.curves.new(name=f"{mat.name}_attribute_name", type='FONT')
-    attribute_obj = bpy.data.objects.new(
-        name=f"{mat.name}_attribute_name",
-        object_data=attribute_curve
-    )
-    attribute_obj.scale = (scale, scale, scale)
-    attribute_obj.rotation_euler = (0, 0, np.pi / 2)
-    attribute_obj.location = (
-        0.2 * cbar_scale,
-        0.25 * (cbar_scale - scale * attribute_obj.dimensions[1]),
-        0
-    )
+    image_node.location = (-500, 0)
+    transparent_node.location = (-200, 100)
+    emission_node.location = (-200, -50)
+    mix_node.location = (0, 0)
+    material_output_node.location = (200, 0)
 
+    return cbar_mat
 
-    cbar_label_mat = bpy.data.materials.new(name=f"{cbar_name}_labels")
 
-    cbar_label_mat.use_nodes = True
-
-    bsdf = cbar_label_mat.node_tree.nodes["Principled BSDF"]
-    cbar_label_mat.node_tree.nodes.remove(bsdf)
-
-    combine_color_node = cbar_label_mat.node_tree.nodes.new("ShaderNodeCombineColor")
-    emission_shader_node = cbar_label_mat.node_tree.nodes.new("ShaderNodeEmission")
-    material_output_node = cbar_label_mat.node_tree.nodes["Material Output"]
+def create_colorbar(context):
+    mat = context.object.active_material
+    cbar_name = f"{mat.name}_cbar"
 
-    cbar_label_mat.node_tree.links.new(
-        combine_color_node.outputs["Color"],
-        emission_shader_node.inputs["Color"]
-    )
-    cbar_label_mat.node_tree.links.new(
-        emission_shader_node.outputs["Emission"],
-        material_output_node.inputs["Surface"]
+    width = CBAR_SCALE * CBAR_WIDTH / CBAR_HEIGHT
+    cbar_mesh = bpy.data.meshes.new(cbar_name)
+    cbar_mesh.from_pydata(
+        vertices=[(0, 0, 0), (width, 0, 0), (width, CBAR_SCALE, 0), (0, CBAR_SCALE, 0)],
+        edges=[],
+        faces=[(0, 1, 2, 3)],
     )
+    uv_layer = cbar_mesh.uv_layers.new()
+    uv_layer.data.foreach_set("uv", [0, 0, 1, 0, 1, 1, 0, 1])
 
-    min_range_obj.data.materials.append(cbar_label_mat)
-    max_range_obj.data.materials.append(cbar_label_mat)
-    attribute_obj.data.materials.append(cbar_label_mat)
-
-    min_range_obj.parent = cbar_obj
-    max_range_obj.parent = cbar_obj
-    attribute_obj.parent = cbar_obj
-
-    bpy.context.scene.collection.objects.link(min_range_obj)
-    bpy.context.scene.collection.objects.link(max_range_obj)
-    bpy.context.scene.collection.objects.link(attribute_obj)
+    image = bpy.data.images.new(cbar_name, CBAR_WIDTH, CBAR_HEIGHT, alpha=True)
+    cbar_mesh.materials.append(create_colorbar_material(cbar_name, image))
 
+    cbar_obj = bpy.data.objects.new(cbar_name, cbar_mesh)
+    context.scene.collection.objects.link(cbar_obj)
 
-    cbar_obj.parent = bpy.data.objects['Camera']
-    cbar_obj.location = (-0.35, -0.2, -1)
+    if context.scene.camera is not None:
+        cbar_obj.parent = context.scene.camera
+        cbar_obj.location = (-0.35, -0.2, -1)
+    else:
+        warnings.warn("No scene camera, the colorbar is not attached", stacklevel=2)
     cbar_obj.select_set(False)
 
     update_colorbar(None, context)
 
+
 def update_colorbar(self, context):
     mat = context.object.active_material
 
     if not mat.vtk_show_scalar_bar:
         return
 
-    cbar_name = f"{mat.name}_cbar"
-    cbar_mat = bpy.data.materials[cbar_name]
-    cbar_label_mat = bpy.data.materials[f"{cbar_name}_labels"]
-
-    color_ramp_node = cbar_mat.node_tree.nodes["Color Ramp"]
-    cmap = plt.get_cmap(mat.vtk_colormaps)
-    n_colors = len(color_ramp_node.color_ramp.elements)
-    for i in range(n_colors):
-        location = i / (n_colors - 1)
-        rgb = [c**2.2 for c in cmap(location)] # sRGB to Linear RGB
-        color_ramp_node.color_ramp.elements[i].color = rgb
-
-    scale = mat.vtk_scalar_bar_scale_numbers
-    numbers_format = "{" + mat.vtk_scalar_bar_number_format + "}"
-    min_range_curve = bpy.data.curves[f"{mat.name}_min"]
-    min_value = mat.node_tree.nodes["Map Range"].inputs["From Min"].default_value
-    # min_value = mat["attributes"][mat.vtk_attributes]["global_min"]
-    min_range_curve.body = numbers_format.format(min_value * scale)
-    max_range_curve = bpy.data.curves[f"{mat.name}_max"]
-    max_value = mat.node_tree.nodes["Map Range"].inputs["From Max"].default_value
-    # max_value = mat["attributes"][mat.vtk_attributes]["global_max"]
-    # mat.node_tree.nodes["Map Range"].inputs["From Max"].default_value = max_value
-    max_range_curve.body = numbers_format.format(max_value * scale)
-    attribute_curve = bpy.data.curves[f"{mat.name}_attribute_name"]
-    attribute_curve.body = mat.vtk_attributes
-
-    combine_color_node = cbar_label_mat.node_tree.nodes["Combine Color"]
-    combine_color_node.inputs["Red"].default_value = mat.vtk_scalar_bar_labels_color[0]
-    combine_color_node.inputs["Green"].default_value = mat.vtk_scalar_bar_labels_color[1]
-    combine_color_node.inputs["Blue"].default_value = mat.vtk_scalar_bar_labels_color[2]
-
-    mat.vtk_scalar_bar_attribute_name = mat.vtk_attributes
+    image = bpy.data.images.get(f"{mat.name}_cbar")
+    if image is None:
+        return
+    image.pixels.foreach_set(get_colorbar_pixels(mat))
+    image.update()
+    # Generated images are not saved with the file unless packed
+    image.pack()
+
 
 def remove_colorbar(context):
     mat = context.object.active_material
+    cbar_name = f"{mat.name}_cbar"
 
-    cbar_mat = bpy.data.materials[f"{mat.name}_cbar"]
-    cbar_label_mat = bpy.data.materials[f"{mat.name}_cbar_labels"]
-
-    bpy.data.materials.remove(cbar_mat)
-    bpy.data.materials.remove(cbar_label_mat)
-
-    cbar_mesh = bpy.data.meshes[f"{mat.name}_cbar"]
-    bpy.data.meshes.remove(cbar_mesh)
-
-    min_range_curve = bpy.data.curves[f"{mat.name}_min"]
-    bpy.data.curves.remove(min_range_curve)
-    max_range_curve = bpy.data.curves[f"{mat.name}_max"]
-    bpy.data.curves.remove(max_range_curve)
-    attribute_curve = bpy.data.curves[f"{mat.name}_attribute_name"]
-    bpy.data.curves.remove(attribute_curve)
+    if cbar_name in bpy.data.objects:
+        bpy.data.objects.remove(bpy.data.objects[cbar_name])
+    if cbar_name in bpy.data.meshes:
+        bpy.data.meshes.remove(bpy.data.meshes[cbar_name])
+    if cbar_name in bpy.data.materials:
+        bpy.data.materials.remove(bpy.data.materials[cbar_name])
+    if cbar_name in bpy.data.images:
+        bpy.data.images.remove(bpy.data.images[cbar_name])
+
+    # Labels of the colorbars made of a mesh and font curves
+    if f"{cbar_name}_labels" in bpy.data.materials:
+        bpy.data.materials.remove(bpy.data.materials[f"{cbar_name}_labels"])
+    for suffix in ("min", "max", "attribute_name"):
+        if f"{mat.name}_{suffix}" in bpy.data.curves:
+            bpy.data.curves.remove(bpy.data.curves[f"{mat.name}_{suffix}"])
@@ -5,6 +5,8 @@ import numpy as np
 import pyvista as pv
 from bpy_extras.io_utils import ExportHelper
 
+from .attributes import INTERNAL_ATTRIBUTES
+
 
 class ExportVTK(bpy.types.Operator, ExportHelper):
     """Export mesh to a VTK file"""
@@ -39,6 +41,8 @@ class ExportVTK(bpy.types.Operator, ExportHelper):
         vtk_mesh = pv.PolyData(vertices, faces)
 
         for attr in mesh.attributes:
+            if attr.name in INTERNAL_ATTRIBUTES:
+                continue
             if attr.domain == "POINT":
                 array_length = len(mesh.vertices)
             elif attr.domain == "FACE":
@@ -97,6 +101,8 @@ class ExportCSV(bpy.types.Operator, ExportHelper):
         }
 
         for attr in mesh.attributes:
+            if attr.name in INTERNAL_ATTRIBUTES:
+                continue
             if attr.domain == "POINT":
                 array_length = len(mesh.vertices)
             elif attr.domain == "FACE":
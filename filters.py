@@ -0,0 +1,540 @@
+import threading
+import warnings
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import bpy
+import numpy as np
+import pyvista as pv
+
+from .calculator import apply_calculators
+from .instancing import fingerprint
+from .reader import (
+    POLYDATA_CELL_ARRAYS,
+    cell_array_to_numpy,
+    concatenate_cell_arrays,
+    get_block,
+    get_frame_file_path,
+    get_read_settings,
+    read_frame,
+)
+
+FILTERS = {}
+THREADED_FILTERS = set()
+
+# Output of each pipeline stage, keyed by the input frame and all upstream parameters
+_stage_cache = OrderedDict()
+
+# Threaded stage computed for each object: {object name: (stage key, future)}
+_pending_stages = {}
+_executor = ThreadPoolExecutor(max_workers=1)
+
+# Datasets kept across frames of the same geometry, VTK reuses their locators
+_streamline_templates = OrderedDict()
+_streamline_lock = threading.Lock()
+_seed_cache = {}
+
+
+def register_filter(filter_type, threaded=False):
+    def decorator(function):
+        FILTERS[filter_type] = function
+        if threaded:
+            THREADED_FILTERS.add(filter_type)
+        return function
+
+    return decorator
+
+
+@register_filter("clip")
+def clip_filter(vtk_data, params):
+    return vtk_data.clip(
+        normal=tuple(params["normal"]),
+        origin=tuple(params["origin"]),
+        invert=bool(params["invert"]),
+    )
+
+
+@register_filter("slice")
+def slice_filter(vtk_data, params):
+    return vtk_data.slice(
+        normal=tuple(params["normal"]), origin=tuple(params["origin"])
+    )
+
+
+def get_cell_point_ids(vtk_data):
+    # Offsets and connectivity of all cells, in cell id order
+    if isinstance(vtk_data, pv.PolyData):
+        cell_arrays = [getattr(vtk_data, getter)() for getter, _ in POLYDATA_CELL_ARRAYS]
+    else:
+        if not isinstance(vtk_data, pv.UnstructuredGrid):
+            vtk_data = vtk_data.cast_to_unstructured_grid()
+        cell_arrays = [vtk_data.GetCells()]
+    return concatenate_cell_arrays(cell_arrays, [0] * len(cell_arrays))
+
+
+def get_threshold_values(data, name):
+    if name not in data and name == "id_":
+        name = "id"  # renamed at import, id is a reserved keyword
+    if name not in data:
+        return None
+    values = np.asarray(data[name], dtype=float)
+    if values.ndim > 1:
+        values = np.linalg.norm(values, axis=1)
+    return values
+
+
+def threshold_mask(vtk_data, params):
+    lower, upper = params["lower"], params["upper"]
+
+    values = get_threshold_values(vtk_data.cell_data, params["scalars"])
+    if values is not None:
+        return (lower <= values) & (values <= upper)
+
+    values = get_threshold_values(vtk_data.point_data, params["scalars"])
+    if values is None:
+        return None
+
+    offsets, connectivity = get_cell_point_ids(vtk_data)
+    counts = np.diff(offsets)
+    if len(connectivity) == 0:
+        return np.zeros(len(counts), dtype=bool)
+    # Reduced over the non-empty cells only, each reduction then ends at the
+    # start of the next cell
+    non_empty = counts > 0
+    starts = offsets[:-1][non_empty]
+    counts = counts[non_empty]
+    cell_values = values[connectivity]
+    in_range = ((lower <= cell_values) & (cell_values <= upper)).astype(np.int64)
+
+    method = params.get("method", "ALL")
+    if method == "CENTROID":
+        centroid = np.add.reduceat(cell_values, starts) / counts
+        cell_mask = (lower <= centroid) & (centroid <= upper)
+    elif method == "ANY":
+        cell_mask = np.add.reduceat(in_range, starts) > 0
+    else:
+        cell_mask = np.add.reduceat(in_range, starts) == counts
+
+    mask = np.zeros(len(non_empty), dtype=bool)
+    mask[non_empty] = cell_mask
+    return mask
+
+
+def get_slice_offsets(params):
+    if params.get("mode", "RANGE") == "LIST":
+        return np.asarray(params["values"], dtype=float)
+    return np.linspace(params["first"], params["last"], max(params["count"], 1))
+
+
+@register_filter("multi_slice")
+def multi_slice_filter(vtk_data, params):
+    # All the slices are the contours of the signed distance to the plane,
+    # computed by a single contour pass
+    offsets = get_slice_offsets(params)
+    normal = np.asarray(params["normal"], dtype=float)
+    normal /= max(np.linalg.norm(normal), np.finfo(float).tiny)
+    distance = (np.asarray(vtk_data.points) - params["origin"]) @ normal
+
+    vtk_data = vtk_data.copy(deep=False)
+    vtk_data.point_data["_slice_distance"] = distance
+    slices = vtk_data.contour(isosurfaces=list(offsets), scalars="_slice_distance")
+    if slices.n_points == 0:
+        return slices
+
+    slice_distance = np.asarray(slices.point_data.pop("_slice_distance"))
+    slice_id = np.abs(slice_distance[:, None] - offsets[None, :]).argmin(axis=1)
+    slices.point_data["slice_id"] = slice_id.astype(float)
+
+    offsets_array, connectivity = get_cell_point_ids(slices)
+    first_points = connectivity[np.minimum(offsets_array[:-1], len(connectivity) - 1)]
+    slices.cell_data["slice_id"] = slice_id[first_points].astype(float)
+    return slices
+
+
+@register_filter("threshold")
+def threshold_filter(vtk_data, params):
+    mask = threshold_mask(vtk_data, params)
+    if mask is None:
+        warnings.warn(f"No attribute {params['scalars']} to threshold", stacklevel=2)
+        return vtk_data
+    if params["invert"]:
+        mask = ~mask
+    return vtk_data.extract_cells(np.flatnonzero(mask))
+
+
+def get_image_indices(image, points):
+    # Continuous (i, j, k) index of points in an axis aligned image
+    first_point = np.reshape(image.bounds, (3, 2))[:, 0]
+    spacing = np.where(np.array(image.spacing) > 0, image.spacing, 1.0)
+    return (points - first_point) / spacing
+
+
+def interpolate_image_data(image, indices, values):
+    # Vectorized trilinear interpolation of point values at continuous indices
+    dims = np.array(image.dimensions)
+    lower = np.clip(np.floor(indices).astype(np.int64), 0, np.maximum(dims - 2, 0))
+    upper = np.minimum(lower + 1, dims - 1)
+    weights = np.clip(indices - lower, 0.0, 1.0)
+
+    values = np.asarray(values, dtype=float)
+    result = np.zeros((len(indices), *values.shape[1:]))
+    for corner in np.ndindex(2, 2, 2):
+        ijk = np.where(corner, upper, lower)
+        weight = np.prod(np.where(corner, weights, 1.0 - weights), axis=1)
+        flat = ijk[:, 0] + dims[0] * (ijk[:, 1] + dims[1] * ijk[:, 2])
+        result += weight.reshape(-1, *[1] * (values.ndim - 1)) * values[flat]
+    return result
+
+
+def contour_image_data(image, values, scalars):
+    # Flying edges only output the contoured scalars, the other point attributes are
+    # interpolated on the isosurface and cell attributes taken from the crossed cell
+    surface = image.contour(isosurfaces=values, scalars=scalars, method="flying_edges")
+    if surface.n_points == 0:
+        return surface
+
+    indices = get_image_indices(image, np.asarray(surface.points))
+    for name in image.point_data.keys():
+        if name not in surface.point_data:
+            surface.point_data[name] = interpolate_image_data(
+                image, indices, image.point_data[name]
+            )
+
+    if len(image.cell_data.keys()) > 0:
+        cell_dims = np.maximum(np.array(image.dimensions) - 1, 1)
+        centers = get_image_indices(image, np.asarray(surface.cell_centers().points))
+        ijk = np.clip(np.floor(centers).astype(np.int64), 0, cell_dims - 1)
+        cell_ids = ijk[:, 0] + cell_dims[0] * (ijk[:, 1] + cell_dims[1] * ijk[:, 2])
+        for name in image.cell_data.keys():
+            surface.cell_data[name] = np.asarray(image.cell_data[name])[cell_ids]
+
+    return surface
+
+
+@register_filter("contour")
+def contour_filter(vtk_data, params):
+    scalars = params["scalars"]
+    values = list(params["values"])
+    if scalars not in vtk_data.point_data:
+        if scalars not in vtk_data.cell_data:
+            warnings.warn(f"No attribute {scalars} to contour", stacklevel=2)
+            return pv.PolyData()
+        vtk_data = vtk_data.cell_data_to_point_data(pass_cell_data=True)
+
+    if isinstance(vtk_data, pv.ImageData) and np.allclose(
+        vtk_data.direction_matrix, np.eye(3)
+    ):
+        return contour_image_data(vtk_data, values, scalars)
+    # Point and cell attributes are interpolated by the VTK contour filter
+    return vtk_data.contour(isosurfaces=values, scalars=scalars)
+
+
+def get_seeds(params):
+    seed_type = params["seed_type"]
+    names = {
+        "LINE": ("point_a", "point_b", "resolution"),
+        "PLANE": ("center", "normal", "size", "resolution"),
+        "POINTS": ("seed_points",),
+    }[seed_type]
+    key = freeze({name: params[name] for name in (*names, "seed_type")})
+    if key in _seed_cache:
+        return _seed_cache[key]
+
+    if seed_type == "LINE":
+        seeds = pv.Line(
+            params["point_a"], params["point_b"], resolution=params["resolution"]
+        )
+    elif seed_type == "PLANE":
+        plane = pv.Plane(
+            center=params["center"],
+            direction=params["normal"],
+            i_size=params["size"],
+            j_size=params["size"],
+            i_resolution=params["resolution"],
+            j_resolution=params["resolution"],
+        )
+        seeds = pv.PolyData(plane.points)
+    else:
+        seeds = pv.PolyData(np.reshape(params["seed_points"], (-1, 3)))
+
+    if len(_seed_cache) > 8:
+        _seed_cache.clear()
+    _seed_cache[key] = seeds
+    return seeds
+
+
+def get_streamline_template(vtk_data):
+    # Same points and cells as a previous frame: swap the arrays of the dataset
+    # traced then, its point and cell locators are not rebuilt
+    offsets, connectivity = get_cell_point_ids(vtk_data)
+    key = fingerprint(vtk_data.points, offsets, connectivity)
+    if key not in _streamline_templates:
+        _streamline_templates[key] = vtk_data.copy(deep=False)
+        while len(_streamline_templates) > 2:
+            _streamline_templates.popitem(last=False)
+        return _streamline_templates[key]
+
+    template = _streamline_templates[key]
+    _streamline_templates.move_to_end(key)
+    for data, template_data in (
+        (vtk_data.point_data, template.point_data),
+        (vtk_data.cell_data, template.cell_data),
+    ):
+        template_data.clear()
+        for name in data.keys():
+            template_data[name] = data[name]
+    return template
+
+
+def trace_image_data(image, seeds, params):
+    # Vectorized RK4 of all the seeds along the normalized vector field
+    vectors = np.asarray(image.point_data[params["vectors"]], dtype=float)
+    spacing = np.array(image.spacing, dtype=float)
+    step = params["step_length"] * spacing[spacing > 0].min()
+    max_steps = min(params["max_steps"], int(np.ceil(4 * image.length / step)))
+    upper_index = np.array(image.dimensions) - 1 + 1e-6
+
+    def direction(points):
+        indices = get_image_indices(image, points)
+        velocity = interpolate_image_data(image, indices, vectors)
+        speed = np.linalg.norm(velocity, axis=1)
+        inside = np.all((indices >= -1e-6) & (indices <= upper_index), axis=1)
+        valid = inside & (speed > 1e-12)
+        velocity[valid] /= speed[valid, None]
+        return velocity, valid
+
+    signs = {"FORWARD": (1.0,), "BACKWARD": (-1.0,), "BOTH": (-1.0, 1.0)}
+    branches = []
+    for sign in signs[params["direction"]]:
+        points = np.asarray(seeds.points, dtype=float)
+        _, alive = direction(points)
+        history, valid = [points], [alive]
+        for _ in range(max_steps):
+            k1, valid1 = direction(points)
+            k2, valid2 = direction(points + 0.5 * sign * step * k1)
+            k3, valid3 = direction(points + 0.5 * sign * step * k2)
+            k4, valid4 = direction(points + sign * step * k3)
+            alive = alive & valid1 & valid2 & valid3 & valid4
+            if not alive.any():
+                break
+            increment = sign * step / 6 * (k1 + 2 * k2 + 2 * k3 + k4)
+            points = np.where(alive[:, None], points + increment, points)
+            history.append(points)
+            valid.append(alive)
+        branches.append((np.stack(history), np.stack(valid)))
+
+    lines_points, lines = [], []
+    n_points = 0
+    for i in range(seeds.n_points):
+        line = []
+        for branch, (history, valid) in enumerate(branches):
+            branch_points = history[valid[:, i], i]
+            if branch == 0 and len(branches) == 2:
+                line.append(branch_points[::-1])
+            else:
+                line.append(branch_points[1:] if len(line) > 0 else branch_points)
+        line = np.concatenate(line)
+        if len(line) < 2:
+            continue
+        lines_points.append(line)
+        lines += [len(line), *range(n_points, n_points + len(line))]
+        n_points += len(line)
+
+    if n_points == 0:
+        return pv.PolyData()
+    streamlines = pv.PolyData(np.concatenate(lines_points), lines=lines)
+    indices = get_image_indices(image, np.asarray(streamlines.points))
+    for name in image.point_data.keys():
+        streamlines.point_data[name] = interpolate_image_data(
+            image, indices, image.point_data[name]
+        )
+    return streamlines
+
+
+def polylines_to_segments(polydata):
+    # Blender meshes only hold 2-point edges
+    offsets, connectivity = cell_array_to_numpy(polydata.GetLines())
+    counts = np.diff(offsets)
+    keep = np.ones(max(len(connectivity) - 1, 0), dtype=bool)
+    keep[offsets[1:-1] - 1] = False  # last point of a line to first of the next
+    starts, ends = connectivity[:-1][keep], connectivity[1:][keep]
+
+    cells = np.column_stack((np.full(len(starts), 2), starts, ends)).ravel()
+    celltypes = np.full(len(starts), pv.CellType.LINE, dtype=np.uint8)
+    segments = pv.UnstructuredGrid(cells, celltypes, np.asarray(polydata.points))
+    for name in polydata.point_data.keys():
+        segments.point_data[name] = polydata.point_data[name]
+    n_segments = np.maximum(counts - 1, 0)
+    for name in polydata.cell_data.keys():
+        segments.cell_data[name] = np.repeat(
+            polydata.cell_data[name], n_segments, axis=0
+        )
+    return segments
+
+
+@register_filter("streamlines", threaded=True)
+def streamlines_filter(vtk_data, params):
+    if params["vectors"] not in vtk_data.point_data:
+        warnings.warn(f"No point vectors {params['vectors']} to trace", stacklevel=2)
+        return pv.PolyData()
+
+    seeds = get_seeds(params)
+    if isinstance(vtk_data, pv.ImageData) and np.allclose(
+        vtk_data.direction_matrix, np.eye(3)
+    ):
+        streamlines = trace_image_data(vtk_data, seeds, params)
+    else:
+        with _streamline_lock:
+            template = get_streamline_template(vtk_data)
+            streamlines = template.streamlines_from_source(
+                seeds,
+                vectors=params["vectors"],
+                integration_direction=params["direction"].lower(),
+                initial_step_length=params["step_length"],
+                max_steps=params["max_steps"],
+            )
+    if streamlines.n_points == 0:
+        return streamlines
+
+    if params["tubes"]:
+        radius = params["radius"] or 0.005 * vtk_data.length
+        return streamlines.tube(radius=radius).triangulate()
+    return polylines_to_segments(streamlines)
+
+
+def freeze(value):
+    if hasattr(value, "to_dict"):
+        value = value.to_dict()
+    if isinstance(value, dict):
+        return tuple(sorted((key, freeze(item)) for key, item in value.items()))
+    if hasattr(value, "__len__") and not isinstance(value, str):
+        return tuple(freeze(item) for item in value)
+    return value
+
+
+def get_pipeline(obj):
+    if "vtk_filters" not in obj:
+        return []
+    stages = obj["vtk_filters"]
+    if hasattr(stages, "keys"):  # former {"clip": {...}} layout
+        stages = [{"type": name, **params.to_dict()} for name, params in stages.items()]
+        obj["vtk_filters"] = stages
+        stages = obj["vtk_filters"]
+    return [
+        stage.to_dict() if hasattr(stage, "to_dict") else dict(stage)
+        for stage in stages
+    ]
+
+
+def set_pipeline_stage(obj, stage, index=-1):
+    stages = get_pipeline(obj)
+    if 0 <= index < len(stages):
+        stages[index] = stage
+    else:
+        stages.append(stage)
+    obj["vtk_filters"] = stages
+
+
+def remove_pipeline_stage(obj, index):
+    stages = get_pipeline(obj)
+    del stages[index]
+    obj["vtk_filters"] = stages
+
+
+def get_stage_keys(obj, frame_key):
+    keys = []
+    key = (obj.name, frame_key)
+    for stage in get_pipeline(obj):
+        key = (key, freeze(stage))
+        keys.append(key)
+    return keys
+
+
+def cache_stage(key, vtk_data):
+    _stage_cache[key] = vtk_data
+    _stage_cache.move_to_end(key)
+    while len(_stage_cache) > max(bpy.context.scene.vtk_filter_cache_size, 1):
+        _stage_cache.popitem(last=False)
+
+
+def clear_filter_cache(obj=None):
+    for key in list(_stage_cache):
+        root = key
+        while isinstance(root[0], tuple):
+            root = root[0]
+        if obj is None or root[0] == obj.name:
+            del _stage_cache[key]
+
+
+def read_filter_input(obj):
+    file_path = get_frame_file_path(obj)
+    return apply_calculators(get_block(read_frame(file_path), obj), obj)
+
+
+def get_frame_key(obj):
+    array_selection, merge_points = get_read_settings()
+    return (get_frame_file_path(obj), freeze(array_selection), merge_points)
+
+
+def run_pipeline(obj, wait=True):
+    stages = get_pipeline(obj)
+    frame_key = get_frame_key(obj)
+    keys = get_stage_keys(obj, frame_key)
+
+    # Restart from the last stage whose output is still cached
+    start = len(keys)
+    while start > 0 and keys[start - 1] not in _stage_cache:
+        start -= 1
+
+    # The frame read is cached as well, editing the first stage doesn't reread it
+    input_key = (obj.name, frame_key)
+    cached_key = keys[start - 1] if start > 0 else input_key
+    if cached_key in _stage_cache:
+        vtk_data = _stage_cache[cached_key]
+        _stage_cache.move_to_end(cached_key)
+    else:
+        vtk_data = read_filter_input(obj)
+        cache_stage(input_key, vtk_data)
+
+    for stage, key in zip(stages[start:], keys[start:]):
+        if vtk_data.n_points > 0:
+            vtk_data = run_stage(obj, stage, key, vtk_data, wait)
+            if vtk_data is None:
+                return None, keys[-1]
+        cache_stage(key, vtk_data)
+
+    return vtk_data, keys[-1] if keys else None
+
+
+def run_stage(obj, stage, key, vtk_data, wait=True):
+    if stage["type"] not in THREADED_FILTERS:
+        return FILTERS[stage["type"]](vtk_data, stage)
+
+    # Returns None while the worker thread is computing, without waiting
+    pending_key, future = _pending_stages.get(obj.name, (None, None))
+    if pending_key != key:
+        if future is not None:
+            future.cancel()  # stale frame, only cancelled if not started yet
+        future = _executor.submit(FILTERS[stage["type"]], vtk_data, stage)
+        _pending_stages[obj.name] = (key, future)
+    if not wait and not future.done():
+        return None
+    del _pending_stages[obj.name]
+    return future.result()
+
+
+def is_pipeline_pending(obj):
+    return obj.name in _pending_stages and not _pending_stages[obj.name][1].done()
+
+
+def register():
+    bpy.types.Scene.vtk_filter_cache_size = bpy.props.IntProperty(
+        name="Filter cache size",
+        description="Number of filter results kept in memory",
+        default=32,
+        min=1,
+    )
+
+
+def unregister():
+    del bpy.types.Scene.vtk_filter_cache_size
@@ -5,7 +5,16 @@ import pyvista as pv
 from bpy.props import StringProperty
 from bpy_extras.io_utils import ImportHelper
 
-from .mesh import create_object
+from .instancing import clear_geometry_registry, create_or_instance_object
+from .mesh import clear_displayed_frames, create_object
+from .multiblock import create_block_placeholders
+from .reader import (
+    clear_prefetched_frames,
+    get_array_names,
+    get_block_names,
+    merge_blocks,
+    read_frame,
+)
 
 
 def sort_files(file_list, frame_sep):
@@ -28,6 +37,15 @@ def sort_files(file_list, frame_sep):
     return sorted_file_list
 
 
+class VTK_ArraySelection(bpy.types.PropertyGroup):
+    name: bpy.props.StringProperty(name="Name")
+    domain: bpy.props.EnumProperty(
+        name="Domain",
+        items=[("point", "Point", "Point data"), ("cell", "Cell", "Cell data")],
+    )
+    enabled: bpy.props.BoolProperty(name="Enabled", default=True)
+
+
 class ImportVTK(bpy.types.Operator, ImportHelper):
     """Load a VTK file"""
 
@@ -36,7 +54,7 @@ class ImportVTK(bpy.types.Operator, ImportHelper):
 
     filename_ext = ".vtk"
     filter_glob: StringProperty(
-        default="*.vtk;*.vtu;*.vtp;*.vtm",
+        default="*.vtk;*.vtu;*.vtp;*.vtm;*.pvtu;*.pvtp",
         options={"HIDDEN"},
         maxlen=255,  # Max internal buffer length, longer would be clamped.
     )
@@ -51,6 +69,62 @@ class ImportVTK(bpy.types.Operator, ImportHelper):
         default="-",
     )
 
+    merge_points: bpy.props.BoolProperty(
+        name="Merge Partition Points",
+        description="Merge the duplicated interface points of partitioned files",
+        default=False,
+    )
+
+    arrays: bpy.props.CollectionProperty(
+        type=VTK_ArraySelection, options={"HIDDEN", "SKIP_SAVE"}
+    )
+    arrays_file_path: bpy.props.StringProperty(options={"HIDDEN", "SKIP_SAVE"})
+
+    lazy_blocks: bpy.props.BoolProperty(
+        name="Lazy Blocks",
+        description="Import MultiBlock files as placeholders, blocks are loaded when enabled",
+        default=False,
+    )
+
+    merge_blocks: bpy.props.BoolProperty(
+        name="Merge Blocks",
+        description="Merge all MultiBlock blocks into one mesh with a block_id attribute",
+        default=False,
+    )
+
+    instance_duplicates: bpy.props.BoolProperty(
+        name="Instance Duplicates",
+        description="Share one mesh between identical or rigidly moved geometries (not for sequences)",
+        default=False,
+    )
+
+    def update_array_list(self):
+        if self.arrays_file_path == self.filepath:
+            return
+        self.arrays_file_path = self.filepath
+        self.arrays.clear()
+        if not os.path.isfile(self.filepath):
+            return
+
+        point_arrays, cell_arrays = get_array_names(self.filepath)
+        for domain, names in (("point", point_arrays), ("cell", cell_arrays)):
+            for name in names:
+                item = self.arrays.add()
+                item.name = name
+                item.domain = domain
+
+    def get_array_selection(self):
+        if all(item.enabled for item in self.arrays):
+            return None
+        return {
+            domain: [
+                item.name
+                for item in self.arrays
+                if item.enabled and item.domain == domain
+            ]
+            for domain in ("point", "cell")
+        }
+
     def draw(self, context):
         layout = self.layout
 
@@ -68,6 +142,22 @@ class ImportVTK(bpy.types.Operator, ImportHelper):
         col = split.column()
         col.prop(operator, "frame_sep", text="")
 
+        layout.prop(operator, "merge_points")
+        layout.prop(operator, "lazy_blocks")
+        layout.prop(operator, "merge_blocks")
+        layout.prop(operator, "instance_duplicates")
+
+        operator.update_array_list()
+        if len(operator.arrays) == 0:
+            return
+
+        box = layout.box()
+        box.label(text="Arrays")
+        for item in operator.arrays:
+            row = box.row()
+            row.prop(item, "enabled", text=item.name)
+            row.label(text=item.domain.capitalize())
+
     def execute(self, context):
         # global files, directory
 
@@ -79,21 +169,51 @@ class ImportVTK(bpy.types.Operator, ImportHelper):
         bpy.context.scene["vtk_directory"] = directory
         bpy.context.scene["mesh_attributes"] = {}
         bpy.context.scene["frame_sep"] = self.frame_sep
+        bpy.context.scene["vtk_merge_points"] = self.merge_points
+
+        array_selection = self.get_array_selection()
+        if array_selection is None:
+            if "vtk_array_selection" in bpy.context.scene:
+                del bpy.context.scene["vtk_array_selection"]
+        else:
+            bpy.context.scene["vtk_array_selection"] = array_selection
+
+        clear_geometry_registry()
+        clear_displayed_frames()
+        clear_prefetched_frames()
 
         for file in files:
             file_path = f"{directory}/{file[0]}"
-            vtk_data = pv.read(file_path)
+            vtk_data = read_frame(file_path)
             mesh_name = file[0].split(".")[0].split(self.frame_sep)[0]
 
-            if isinstance(vtk_data, pv.MultiBlock):
+            # Sequence frames may diverge, their meshes can't be shared
+            create = create_object
+            if self.instance_duplicates and len(file) == 1:
+                create = create_or_instance_object
+
+            if isinstance(vtk_data, pv.MultiBlock) and self.merge_blocks:
+                obj = create_object(context, merge_blocks(vtk_data), mesh_name)
+                obj["vtk_file_path"] = file_path
+                obj["vtk_sequence_name"] = mesh_name
+                obj["vtk_merged_blocks"] = get_block_names(vtk_data)
+            elif isinstance(vtk_data, pv.MultiBlock) and self.lazy_blocks:
+                root = create_block_placeholders(
+                    context, vtk_data, mesh_name, file_path
+                )
+                for obj in (root, *root.children_recursive):
+                    obj["vtk_sequence_name"] = mesh_name
+            elif isinstance(vtk_data, pv.MultiBlock):
                 for block_name in vtk_data.keys():
                     name = f"{mesh_name} : {block_name}"
-                    obj = create_object(context, vtk_data[block_name], name)
+                    obj = create(context, vtk_data[block_name], name)
                     obj["vtk_file_path"] = file_path
                     obj["vtk_block_name"] = block_name
+                    obj["vtk_sequence_name"] = mesh_name
             else:
-                obj = create_object(context, vtk_data, mesh_name)
+                obj = create(context, vtk_data, mesh_name)
                 obj["vtk_file_path"] = file_path
+                obj["vtk_sequence_name"] = mesh_name
 
         max_frame = 0
         for file in files:
@@ -101,7 +221,8 @@ class ImportVTK(bpy.types.Operator, ImportHelper):
 
         if max_frame != 0:
             bpy.context.scene.frame_start = 0
-            bpy.context.scene.frame_end = max_frame
+            frames_per_file = bpy.context.scene.vtk_frames_per_file
+            bpy.context.scene.frame_end = max_frame * frames_per_file
             bpy.context.scene.frame_current = 0
 
         return {"FINISHED"}
@@ -132,11 +253,12 @@ class VTK_PT_import(bpy.types.Panel):
 
 
 def menu_func_import(self, context):
-    self.layout.operator(ImportVTK.bl_idname, text="VTK (.vtk, .vtu, .vtp, .vtm)")
+    self.layout.operator(ImportVTK.bl_idname, text="VTK (.vtk, .vtu, .vtp, .vtm, .pvtu, .pvtp)")
 
 
 def register():
     bpy.types.TOPBAR_MT_file_import.append(menu_func_import)
+    bpy.utils.register_class(VTK_ArraySelection)
     bpy.utils.register_class(ImportVTK)
     bpy.utils.register_class(VTK_PT_import)
 
@@ -144,4 +266,5 @@ def register():
 def unregister():
     bpy.types.TOPBAR_MT_file_import.remove(menu_func_import)
     bpy.utils.unregister_class(ImportVTK)
+    bpy.utils.unregister_class(VTK_ArraySelection)
     bpy.utils.unregister_class(VTK_PT_import)
@@ -0,0 +1,101 @@
+import hashlib
+
+import bpy
+import numpy as np
+from mathutils import Matrix
+
+from .mesh import create_object
+
+# Objects created during the current import, by topology fingerprint:
+# [(points, points fingerprint, object name), ...]
+_geometry_registry = {}
+
+
+def clear_geometry_registry():
+    _geometry_registry.clear()
+
+
+def fingerprint(*arrays):
+    digest = hashlib.blake2b(digest_size=16)
+    for array in arrays:
+        array = np.ascontiguousarray(array)
+        digest.update(str((array.dtype, array.shape)).encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def topology_fingerprint(vtk_data):
+    # Connectivity and attributes must match, points may differ by a rigid transform
+    arrays = [np.array([vtk_data.n_points])]
+    if hasattr(vtk_data, "celltypes"):
+        arrays += [vtk_data.cells, vtk_data.celltypes]
+    else:
+        arrays += [vtk_data.verts, vtk_data.lines, vtk_data.faces, vtk_data.strips]
+    for data in (vtk_data.point_data, vtk_data.cell_data):
+        for name in sorted(data.keys()):
+            arrays += [np.frombuffer(name.encode(), dtype=np.uint8), data[name]]
+    return fingerprint(*arrays)
+
+
+def rigid_transform(reference_points, points, tolerance=1e-6):
+    # Kabsch algorithm: rotation R and translation t such that points = R @ reference + t
+    dtype = np.result_type(reference_points, points)
+    eps = np.finfo(dtype).eps if np.issubdtype(dtype, np.inexact) else 0.0
+    reference_points = np.asarray(reference_points, dtype=float)
+    points = np.asarray(points, dtype=float)
+    reference_center = reference_points.mean(axis=0)
+    center = points.mean(axis=0)
+    p = reference_points - reference_center
+    q = points - center
+
+    u, _, vt = np.linalg.svd(p.T @ q)
+    d = np.sign(np.linalg.det(vt.T @ u.T))
+    rotation = vt.T @ np.diag([1.0, 1.0, d]) @ u.T
+
+    size = max(np.ptp(reference_points, axis=0).max(), np.finfo(float).tiny)
+    # Tolerance relative to the part size, plus the rounding of the stored
+    # coordinates which grows with their distance to the origin
+    magnitude = max(np.abs(reference_points).max(), np.abs(points).max())
+    residual = np.abs(p @ rotation.T - q).max()
+    if residual > tolerance * size + 8 * eps * magnitude:
+        return None
+
+    transform = np.eye(4)
+    transform[:3, :3] = rotation
+    transform[:3, 3] = center - rotation @ reference_center
+    return transform
+
+
+def find_instance(vtk_data, topology_key, points_key):
+    points = np.asarray(vtk_data.points)
+    for reference_points, reference_key, obj_name in _geometry_registry.get(
+        topology_key, []
+    ):
+        if reference_key == points_key:
+            return obj_name, np.eye(4)
+        if len(points) < 3:
+            continue
+        transform = rigid_transform(reference_points, points)
+        if transform is not None:
+            return obj_name, transform
+    return None, None
+
+
+def create_or_instance_object(context, vtk_data, mesh_name) -> bpy.types.Object:
+    topology_key = topology_fingerprint(vtk_data)
+    points_key = fingerprint(vtk_data.points)
+
+    obj_name, transform = find_instance(vtk_data, topology_key, points_key)
+    if obj_name is None:
+        obj = create_object(context, vtk_data, mesh_name)
+        _geometry_registry.setdefault(topology_key, []).append(
+            (np.asarray(vtk_data.points), points_key, obj.name)
+        )
+        return obj
+
+    # Linked duplicate: shares the mesh, its material and the object modifiers
+    obj = bpy.data.objects[obj_name].copy()
+    obj.name = mesh_name
+    obj.matrix_world = Matrix(transform.tolist())
+    context.scene.collection.objects.link(obj)
+    return obj
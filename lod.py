@@ -0,0 +1,87 @@
+from collections import OrderedDict
+
+import bpy
+import numpy as np
+import pyvista as pv
+
+from .playback import is_final_render
+
+# Decimated proxies of the frames shown in the viewport, by file, object and
+# number of clusters
+_proxies = OrderedDict()
+
+
+def is_proxy_shown(scene):
+    return scene.vtk_lod_enabled and not is_final_render()
+
+
+def cluster_average(cluster, counts, array):
+    array = np.asarray(array, dtype=float)
+    if array.ndim == 1:
+        return np.bincount(cluster, weights=array, minlength=len(counts)) / counts
+    return np.column_stack(
+        [cluster_average(cluster, counts, column) for column in array.T]
+    )
+
+
+def cluster_vertices(vtk_data, divisions):
+    # Vertex clustering: the points of each cell of a uniform grid are merged
+    # at their mean, triangles collapsed by the merge are dropped
+    if isinstance(vtk_data, pv.PolyData):
+        surface = vtk_data
+    else:
+        surface = vtk_data.extract_surface(pass_pointid=False, pass_cellid=False)
+    surface = surface.triangulate()
+    faces = surface.faces
+    if surface.n_cells == 0 or len(faces) != 4 * surface.n_cells:
+        return None  # lines or vertices are kept at full resolution
+
+    points = np.asarray(surface.points, dtype=float)
+    lower = points.min(axis=0)
+    size = np.ptp(points, axis=0).max() / divisions
+    if size == 0.0:
+        return None
+
+    ijk = np.floor((points - lower) / size).astype(np.int64)
+    keys = np.ravel_multi_index(ijk.T, ijk.max(axis=0) + 1)
+    _, cluster, counts = np.unique(keys, return_inverse=True, return_counts=True)
+    cluster = cluster.ravel()
+
+    triangles = cluster[faces.reshape(-1, 4)[:, 1:]]
+    keep = (
+        (triangles[:, 0] != triangles[:, 1])
+        & (triangles[:, 1] != triangles[:, 2])
+        & (triangles[:, 0] != triangles[:, 2])
+    )
+    proxy = pv.PolyData.from_regular_faces(
+        cluster_average(cluster, counts, points), triangles[keep]
+    )
+    for name, array in surface.point_data.items():
+        proxy.point_data[name] = cluster_average(cluster, counts, array)
+    for name, array in surface.cell_data.items():
+        proxy.cell_data[name] = np.asarray(array)[keep]
+    return proxy
+
+
+def get_proxy(vtk_data, key, divisions):
+    key = (*key, divisions)
+    if key not in _proxies:
+        _proxies[key] = cluster_vertices(vtk_data, divisions)
+        while len(_proxies) > max(bpy.context.scene.vtk_filter_cache_size, 1):
+            _proxies.popitem(last=False)
+    _proxies.move_to_end(key)
+    return _proxies[key]
+
+
+def get_display_data(vtk_data, key):
+    # Frame uploaded to the mesh: the proxy in the viewport, the full
+    # resolution data when rendering
+    scene = bpy.context.scene
+    if not is_proxy_shown(scene) or vtk_data.n_cells < scene.vtk_lod_min_cells:
+        return vtk_data
+    proxy = get_proxy(vtk_data, key, scene.vtk_lod_divisions)
+    return vtk_data if proxy is None else proxy
+
+
+def clear_proxies():
+    _proxies.clear()
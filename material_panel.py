@@ -4,37 +4,60 @@ from typing import Literal
 import bpy
 import matplotlib.pyplot as plt
 
+from .attributes import (
+    BAKED_COLORS_ATTRIBUTE,
+    DISPLAY_ATTRIBUTE,
+    update_baked_colors,
+    update_display_scalar,
+)
 from .colorbar import create_colorbar, remove_colorbar, update_colorbar
+from .nodes import (
+    get_color_ramp_node,
+    get_colormap_node,
+    get_colormap_node_group,
+    get_data_range,
+    get_data_range_node,
+    get_material_colormap,
+    set_color_ramp_colors,
+    set_data_range,
+)
 
 
 def update_data_range(context, frame_range: Literal["global", "current_frame"]):
     mat = context.object.active_material
     vtk_attribute = mat.vtk_attributes
     if vtk_attribute in mat["attributes"]:
-        map_range_node = mat.node_tree.nodes["Map Range"]
-
         obj = context.object
         mesh = obj.data
 
         if vtk_attribute not in mesh.attributes:
             warnings.warn(f"Attribute {vtk_attribute} not found in mesh", stacklevel=2)
             return
-        attr_type = mesh.attributes[vtk_attribute].data.data.data_type
-        if attr_type == "FLOAT":
-            min_value = mat["attributes"][vtk_attribute][f"{frame_range}_min"]
-            max_value = mat["attributes"][vtk_attribute][f"{frame_range}_max"]
-            map_range_node.inputs["From Min"].default_value = min_value
-            map_range_node.inputs["From Max"].default_value = max_value
-        elif attr_type in ["FLOAT2", "FLOAT_VECTOR"]:
-            component = mat.vtk_attribute_component
-            min_value = mat["attributes"][vtk_attribute][component][
-                f"{frame_range}_min"
-            ]
-            max_value = mat["attributes"][vtk_attribute][component][
-                f"{frame_range}_max"
-            ]
-            map_range_node.inputs["From Min"].default_value = min_value
-            map_range_node.inputs["From Max"].default_value = max_value
+        min_value, max_value = get_attribute_range(
+            mat, vtk_attribute, mat.vtk_attribute_component, frame_range
+        )
+        set_data_range(mat, min_value, max_value)
+        rebake_colors(mat, mesh)
+
+
+def get_attribute_range(mat, attribute, component, frame_range):
+    # Statistics cached in the material: scalars directly, vectors by component
+    stats = mat["attributes"][attribute]
+    if f"{frame_range}_min" not in stats:
+        stats = stats[component]
+    return stats[f"{frame_range}_min"], stats[f"{frame_range}_max"]
+
+
+def get_linked_range(ranges):
+    ranges = list(ranges)
+    return min(r[0] for r in ranges), max(r[1] for r in ranges)
+
+
+def rebake_colors(mat, mesh):
+    # Baked colors follow the colormap and the data range of the material
+    if mat.vtk_bake_colors and mat.vtk_attributes in mesh.attributes:
+        update_baked_colors(mesh, mat)
+        mesh.update_tag()
 
 
 class VTK_OT_Data_range_all_frames(bpy.types.Operator):
@@ -80,12 +103,8 @@ class VTK_OT_Data_range_custom(bpy.types.Operator):
 
     def execute(self, context):
         mat = context.object.active_material
-        mat.node_tree.nodes["Map Range"].inputs[
-            "From Min"
-        ].default_value = self.min_value
-        mat.node_tree.nodes["Map Range"].inputs[
-            "From Max"
-        ].default_value = self.max_value
+        set_data_range(mat, self.min_value, self.max_value)
+        rebake_colors(mat, context.object.data)
 
         update_colorbar(self, context)
 
@@ -93,12 +112,7 @@ class VTK_OT_Data_range_custom(bpy.types.Operator):
 
     def invoke(self, context, event):
         mat = context.object.active_material
-        self.min_value = (
-            mat.node_tree.nodes["Map Range"].inputs["From Min"].default_value
-        )
-        self.max_value = (
-            mat.node_tree.nodes["Map Range"].inputs["From Max"].default_value
-        )
+        self.min_value, self.max_value = get_data_range(mat)
         return context.window_manager.invoke_props_dialog(self)
 
 
@@ -137,6 +151,9 @@ class MATERIAL_PT_VTK_Attributes(bpy.types.Panel):
             icon_value=0,
             emboss=True,
         )
+        row = layout.row()
+        row.prop(material, "vtk_packed_display")
+        row.prop(material, "vtk_bake_colors")
 
         row = layout.row(align=True)
         row.label(text="Data range")
@@ -165,9 +182,11 @@ class MATERIAL_PT_VTK_Attributes(bpy.types.Panel):
         row = layout.row()
         row.label(text="Color Map")
         row.prop(material, "vtk_colormaps", text="", icon_value=0, emboss=True)
-        color_ramp_node = material.node_tree.nodes["Color Ramp"]
-        box = layout.box()
-        box.template_color_ramp(color_ramp_node, "color_ramp", expand=True)
+        row.prop(material, "vtk_colormap_reversed", text="", icon="ARROW_LEFTRIGHT")
+        color_ramp_node = get_color_ramp_node(material)
+        if color_ramp_node is not None:
+            box = layout.box()
+            box.template_color_ramp(color_ramp_node, "color_ramp", expand=True)
 
         layout.prop(material, "vtk_show_scalar_bar", text="Show Scalar Bar")
         if material.vtk_show_scalar_bar:
@@ -185,6 +204,11 @@ class MATERIAL_PT_VTK_Attributes(bpy.types.Panel):
             row.label(text="Number format")
             row.prop(material, "vtk_scalar_bar_number_format", text="")
 
+        row = layout.row(align=True)
+        row.label(text="All objects")
+        row.operator("vtk.batch_colormap", text="Colormap")
+        row.operator("vtk.batch_data_range", text="Attribute and range")
+
 
 def get_availbale_colormaps():
     colormaps = list(filter(lambda cmap: cmap[-2:] != "_r", plt.colormaps()))
@@ -232,56 +256,91 @@ def vtk_enum_attribute_component(self, context):
 
 
 def update_colormap_enum(self, context):
-    if "Color Ramp" not in self.node_tree.nodes:
-        return
-    color_ramp_node = self.node_tree.nodes["Color Ramp"]
-    cmap = plt.get_cmap(self.vtk_colormaps)
-    n_colors = len(color_ramp_node.color_ramp.elements)
-    for i in range(n_colors):
-        location = i / (n_colors - 1)
-        sRGB = cmap(location)
-        linear_rgb = [c**2.2 for c in sRGB]
-        color_ramp_node.color_ramp.elements[i].color = linear_rgb
-    color_ramp_node.label = self.vtk_colormaps
+    colormap = get_material_colormap(self)
+    colormap_node = get_colormap_node(self)
+    if colormap_node is None:
+        if "Color Ramp" not in self.node_tree.nodes:
+            return
+        # Material created before the shared colormap groups
+        color_ramp_node = self.node_tree.nodes["Color Ramp"]
+        set_color_ramp_colors(color_ramp_node.color_ramp, colormap)
+        color_ramp_node.label = colormap
+    else:
+        # Switching the group keeps the range inputs of the material,
+        # the LUT image of a colormap is only written the first time it is used
+        colormap_node.node_tree = get_colormap_node_group(colormap)
+        colormap_node.label = colormap
 
+    rebake_colors(self, context.object.data)
     update_colorbar(self, context)
 
 
 def update_attributes_enum(self, context):
+    if self.vtk_packed_display:
+        # Only the values of the display attribute change, not the shader
+        mesh = context.object.data
+        update_display_scalar(mesh, self)
+        mesh.update_tag()
+        update_data_range(context, "global")
+        update_colorbar(self, context)
+        return
+
     attribute_node = self.node_tree.nodes["Attribute"]
     attribute_node.attribute_name = self.vtk_attributes
 
-    map_range_node = self.node_tree.nodes["Map Range"]
+    value_input = get_data_range_node(self).inputs["Value"]
     mesh = context.object.data
     attr_type = mesh.attributes[self.vtk_attributes].data.data.data_type
     if attr_type == "FLOAT":
-        self.node_tree.links.new(
-            attribute_node.outputs["Fac"], map_range_node.inputs["Value"]
-        )
+        self.node_tree.links.new(attribute_node.outputs["Fac"], value_input)
     elif attr_type in ["FLOAT_VECTOR", "FLOAT2"]:
         if self.vtk_attribute_component == "Magnitude":
             length_node = self.node_tree.nodes["Vector Math"]
             self.node_tree.links.new(
                 attribute_node.outputs["Vector"], length_node.inputs["Vector"]
             )
-            self.node_tree.links.new(
-                length_node.outputs["Value"], map_range_node.inputs["Value"]
-            )
+            self.node_tree.links.new(length_node.outputs["Value"], value_input)
         elif self.vtk_attribute_component in ["X", "Y", "Z"]:
             separate_node = self.node_tree.nodes["Separate XYZ"]
             component = self.vtk_attribute_component
             self.node_tree.links.new(
                 attribute_node.outputs["Vector"], separate_node.inputs["Vector"]
             )
-            self.node_tree.links.new(
-                separate_node.outputs[component], map_range_node.inputs["Value"]
-            )
+            self.node_tree.links.new(separate_node.outputs[component], value_input)
 
     update_data_range(context, "global")
 
     update_colorbar(self, context)
 
 
+def update_packed_display(self, context):
+    if not self.vtk_packed_display:
+        update_attributes_enum(self, context)
+        return
+
+    # Last shader change: the attribute node reads the display attribute directly
+    attribute_node = self.node_tree.nodes["Attribute"]
+    attribute_node.attribute_name = DISPLAY_ATTRIBUTE
+    self.node_tree.links.new(
+        attribute_node.outputs["Fac"], get_data_range_node(self).inputs["Value"]
+    )
+    update_attributes_enum(self, context)
+
+
+def update_bake_colors(self, context):
+    mesh = context.object.data
+    if not self.vtk_bake_colors:
+        if BAKED_COLORS_ATTRIBUTE in mesh.attributes:
+            mesh.attributes.remove(mesh.attributes[BAKED_COLORS_ATTRIBUTE])
+        return
+
+    rebake_colors(self, mesh)
+    # Solid mode shows the active color attribute
+    for area in context.screen.areas if context.screen else []:
+        if area.type == "VIEW_3D":
+            area.spaces.active.shading.color_type = "VERTEX"
+
+
 def show_scalar_bar(self, context):
     if self.vtk_show_scalar_bar:
         create_colorbar(context)
@@ -289,6 +348,165 @@ def show_scalar_bar(self, context):
         remove_colorbar(context)
 
 
+BATCH_TARGETS = [
+    ("SELECTED", "Selected objects", "Objects selected in the viewport"),
+    ("COLLECTION", "Active collection", "Objects of the active collection"),
+]
+
+# Enum items of the batch operators, referenced to keep their strings alive
+_batch_attribute_items = []
+
+
+def get_batch_objects(context, target):
+    # One object per material: linked duplicates and shared materials once
+    if target == "SELECTED":
+        objects = context.selected_objects
+    else:
+        objects = context.collection.all_objects
+    members = {}
+    for obj in objects:
+        if obj.type != "MESH" or obj.active_material is None:
+            continue
+        mat = obj.active_material
+        if "attributes" in mat and mat.name not in members:
+            members[mat.name] = obj
+    return list(members.values())
+
+
+def vtk_enum_batch_attributes(self, context):
+    attributes = []
+    for obj in get_batch_objects(context, self.target):
+        for attribute in obj.active_material["attributes"].keys():
+            if attribute not in attributes:
+                attributes.append(attribute)
+    _batch_attribute_items[:] = [(attribute,) * 3 for attribute in attributes]
+    return _batch_attribute_items
+
+
+class VTK_OT_Batch_Colormap(bpy.types.Operator):
+    bl_idname = "vtk.batch_colormap"
+    bl_label = "Colormap of all objects"
+    bl_description = (
+        "Apply a colormap to the selected objects or the active collection"
+    )
+    bl_options = {"REGISTER", "UNDO"}
+
+    target: bpy.props.EnumProperty(name="Objects", items=BATCH_TARGETS)
+    colormap: bpy.props.EnumProperty(name="Colormap", items=vtk_enum_colormaps)
+    reversed: bpy.props.BoolProperty(name="Reverse", default=False)
+
+    def execute(self, context):
+        for obj in get_batch_objects(context, self.target):
+            mat = obj.active_material
+            # The update callbacks read the material and mesh of context.object
+            with context.temp_override(object=obj, active_object=obj):
+                mat.vtk_colormap_reversed = self.reversed
+                mat.vtk_colormaps = self.colormap
+
+        return {"FINISHED"}
+
+    def invoke(self, context, event):
+        mat = context.object.active_material if context.object else None
+        if mat is not None and "attributes" in mat:
+            self.colormap = mat.vtk_colormaps
+            self.reversed = mat.vtk_colormap_reversed
+        return context.window_manager.invoke_props_dialog(self)
+
+
+class VTK_OT_Batch_Data_Range(bpy.types.Operator):
+    bl_idname = "vtk.batch_data_range"
+    bl_label = "Attribute and range of all objects"
+    bl_description = (
+        "Display an attribute with the same kind of data range on the selected "
+        "objects or the active collection"
+    )
+    bl_options = {"REGISTER", "UNDO"}
+
+    target: bpy.props.EnumProperty(name="Objects", items=BATCH_TARGETS)
+    attribute: bpy.props.EnumProperty(
+        name="Attribute", items=vtk_enum_batch_attributes
+    )
+    component: bpy.props.EnumProperty(
+        name="Component",
+        description="Component of the vector attributes",
+        items=[(component,) * 3 for component in ("Magnitude", "X", "Y", "Z")],
+    )
+    data_range: bpy.props.EnumProperty(
+        name="Data range",
+        items=[
+            ("global", "All frames", "Data range over all time steps"),
+            ("current_frame", "Current", "Data range of the current frame"),
+            ("custom", "Custom", "Custom data range"),
+        ],
+    )
+    linked: bpy.props.BoolProperty(
+        name="Linked range",
+        description="One range covering all the objects, "
+        "from their cached statistics",
+        default=True,
+    )
+    min_value: bpy.props.FloatProperty(name="Min Value")
+    max_value: bpy.props.FloatProperty(name="Max Value")
+
+    def execute(self, context):
+        members = [
+            obj
+            for obj in get_batch_objects(context, self.target)
+            if self.attribute in obj.active_material["attributes"]
+        ]
+
+        ranges = []
+        for obj in members:
+            mat = obj.active_material
+            with context.temp_override(object=obj, active_object=obj):
+                mat.vtk_attributes = self.attribute
+                attribute = obj.data.attributes.get(self.attribute)
+                if attribute is not None and attribute.data_type != "FLOAT":
+                    components = ("Magnitude", "X", "Y", "Z")
+                    if attribute.data_type == "FLOAT2":
+                        components = components[:3]
+                    if self.component in components:
+                        mat.vtk_attribute_component = self.component
+            if self.data_range != "custom":
+                component = mat.vtk_attribute_component
+                ranges.append(
+                    get_attribute_range(mat, self.attribute, component, self.data_range)
+                )
+
+        if self.data_range == "custom":
+            ranges = [(self.min_value, self.max_value)] * len(members)
+        elif self.linked and len(ranges) > 0:
+            ranges = [get_linked_range(ranges)] * len(members)
+
+        for obj, (min_value, max_value) in zip(members, ranges):
+            mat = obj.active_material
+            set_data_range(mat, min_value, max_value)
+            rebake_colors(mat, obj.data)
+            with context.temp_override(object=obj, active_object=obj):
+                update_colorbar(self, context)
+
+        return {"FINISHED"}
+
+    def invoke(self, context, event):
+        mat = context.object.active_material if context.object else None
+        if mat is not None and "attributes" in mat:
+            self.min_value, self.max_value = get_data_range(mat)
+        return context.window_manager.invoke_props_dialog(self)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "target")
+        layout.prop(self, "attribute")
+        layout.prop(self, "component")
+        layout.prop(self, "data_range")
+        if self.data_range == "custom":
+            row = layout.row(align=True)
+            row.prop(self, "min_value")
+            row.prop(self, "max_value")
+        else:
+            layout.prop(self, "linked")
+
+
 def register():
     bpy.utils.register_class(MATERIAL_PT_VTK_Attributes)
     bpy.types.Material.vtk_colormaps = bpy.props.EnumProperty(
@@ -297,6 +515,12 @@ def register():
         items=vtk_enum_colormaps,
         update=update_colormap_enum,
     )
+    bpy.types.Material.vtk_colormap_reversed = bpy.props.BoolProperty(
+        name="Reverse",
+        description="Reverse the colormap",
+        default=False,
+        update=update_colormap_enum,
+    )
     bpy.types.Material.vtk_attributes = bpy.props.EnumProperty(
         name="Attributes",
         description="",
@@ -309,6 +533,21 @@ def register():
         items=vtk_enum_attribute_component,
         update=update_attributes_enum,
     )
+    bpy.types.Material.vtk_packed_display = bpy.props.BoolProperty(
+        name="Packed display attribute",
+        description="Copy the displayed attribute or component into a single "
+        f"{DISPLAY_ATTRIBUTE} attribute, so switching attributes does not "
+        "recompile the shader",
+        default=False,
+        update=update_packed_display,
+    )
+    bpy.types.Material.vtk_bake_colors = bpy.props.BoolProperty(
+        name="Bake colors",
+        description="Write the colormapped values into a byte color attribute "
+        "for the solid mode attribute coloring, at each frame",
+        default=False,
+        update=update_bake_colors,
+    )
     bpy.types.Material.vtk_show_scalar_bar = bpy.props.BoolProperty(
         default=False, update=show_scalar_bar
     )
@@ -340,12 +579,17 @@ def register():
     bpy.utils.register_class(VTK_OT_Data_range_all_frames)
     bpy.utils.register_class(VTK_OT_Data_range_current_frame)
     bpy.utils.register_class(VTK_OT_Data_range_custom)
+    bpy.utils.register_class(VTK_OT_Batch_Colormap)
+    bpy.utils.register_class(VTK_OT_Batch_Data_Range)
 
 
 def unregister():
     del bpy.types.Material.vtk_colormaps
+    del bpy.types.Material.vtk_colormap_reversed
     del bpy.types.Material.vtk_attributes
     del bpy.types.Material.vtk_attribute_component
+    del bpy.types.Material.vtk_packed_display
+    del bpy.types.Material.vtk_bake_colors
     del bpy.types.Material.vtk_show_scalar_bar
     del bpy.types.Material.vtk_scalar_bar_labels_color
     del bpy.types.Material.vtk_scalar_bar_attribute_name
@@ -356,3 +600,5 @@ def unregister():
     bpy.utils.unregister_class(VTK_OT_Data_range_all_frames)
     bpy.utils.unregister_class(VTK_OT_Data_range_current_frame)
     bpy.utils.unregister_class(VTK_OT_Data_range_custom)
+    bpy.utils.unregister_class(VTK_OT_Batch_Colormap)
+    bpy.utils.unregister_class(VTK_OT_Batch_Data_Range)
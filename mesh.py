@@ -1,3 +1,4 @@
+import itertools
 import warnings
 from typing import Union
 
@@ -5,40 +6,131 @@ import bpy
 import numpy as np
 import pyvista as pv
 
-from .attributes import initialize_material_attributes, update_attributes_from_vtk
+from .attributes import (
+    initialize_material_attributes,
+    merge_attribute_ranges,
+    update_attributes_from_vtk,
+    update_display_attributes,
+    update_material_attributes,
+)
+from .calculator import apply_calculators
+from .lod import get_display_data, is_proxy_shown
 from .material_panel import update_attributes_enum
 from .nodes import convert_mesh_to_pointcloud, create_attribute_material_nodes
+from .playback import (
+    get_file_position,
+    get_frame_stride,
+    get_prefetch_frames,
+    interpolate_datasets,
+    is_playing,
+)
+from .reader import get_block, prefetch_frames, read_frame, read_keyframe
 
 VTK_data = Union[pv.PolyData, pv.UnstructuredGrid]
 
+# File and display mode uploaded to each sequence
+_displayed_frames = {}
 
-def update_mesh(scene):
+# Point data arrays giving the radius of the particles of a point cloud
+RADIUS_ARRAYS = ("radius", "rad")
+
+
+def update_mesh(scene, force=False):
     if (
         "vtk_files" not in bpy.context.scene
         and "vtk_directory" not in bpy.context.scene
     ):
         return
 
-    frame = scene.frame_current
-
     files = bpy.context.scene["vtk_files"]
     directory = bpy.context.scene["vtk_directory"]
     frame_sep = bpy.context.scene["frame_sep"]
+    stride = get_frame_stride(scene)
+    proxy_shown = is_proxy_shown(scene)
 
+    frames_per_file = scene.vtk_frames_per_file
+    interpolate = scene.vtk_interpolate_frames and frames_per_file * stride > 1
+
+    prefetch = []
     for file in files:
         mesh_name = file[0].split(".")[0].split(frame_sep)[0]
 
         if len(file) > 1:
-            polydata = pv.read(f"{directory}/{file[frame]}")
-            mesh: bpy.types.Mesh = bpy.data.meshes[mesh_name]
-
-            if (polydata.n_points, polydata.n_cells) == (
-                len(mesh.vertices),
-                len(mesh.polygons),
-            ):
-                update_attributes_from_vtk(polydata, mesh_name)
-            else:  # mesh has changed
-                update_mesh_from_vtk(mesh, polydata, update_attributes=True)
+            index, next_index, alpha = get_file_position(
+                scene.frame_current, len(file), stride, frames_per_file
+            )
+            if not interpolate:
+                alpha = 0.0
+            file_path = f"{directory}/{file[index]}"
+            next_path = f"{directory}/{file[next_index]}" if alpha > 0.0 else None
+            if is_playing():
+                prefetch += [
+                    f"{directory}/{file[f]}"
+                    for f in get_prefetch_frames(
+                        index, len(file), stride, scene.vtk_prefetch_frames
+                    )
+                ]
+
+            # Frames held by the stride are not read again
+            displayed = (file_path, next_path, alpha, proxy_shown)
+            if not force and _displayed_frames.get(mesh_name) == displayed:
+                continue
+            _displayed_frames[mesh_name] = displayed
+
+            if next_path is None:
+                vtk_data, next_data = read_frame(file_path), None
+            else:
+                # Both files are kept while the frames in between are shown
+                vtk_data = read_keyframe(file_path, mesh_name)
+                next_data = read_keyframe(next_path, mesh_name)
+            proxy_key = (file_path, next_path, alpha)
+
+            if isinstance(vtk_data, pv.MultiBlock):
+                # Block placeholders are empties, only enabled blocks are updated
+                for obj in bpy.data.objects:
+                    if obj.type != "MESH" or obj.get("vtk_sequence_name") != mesh_name:
+                        continue
+                    block = get_frame_data(vtk_data, next_data, alpha, obj)
+                    update_object_mesh(
+                        obj.data, get_display_data(block, (obj.name, *proxy_key))
+                    )
+            else:
+                obj = bpy.data.objects.get(mesh_name)
+                vtk_data = get_frame_data(vtk_data, next_data, alpha, obj)
+                update_object_mesh(
+                    bpy.data.meshes[mesh_name],
+                    get_display_data(vtk_data, (mesh_name, *proxy_key)),
+                )
+
+    if len(prefetch) > 0:
+        prefetch_frames(prefetch)
+
+
+def get_frame_data(vtk_data, next_data, alpha, obj):
+    # Dataset of the object at this frame, blended with the next file when
+    # interpolating and the topology matches, else the held file
+    block = get_block(vtk_data, obj) if obj is not None else vtk_data
+    if next_data is not None:
+        next_block = get_block(next_data, obj) if obj is not None else next_data
+        interpolated = interpolate_datasets(block, next_block, alpha)
+        if interpolated is not None:
+            # Calculator results are cached by file, not for blended frames
+            return apply_calculators(interpolated, obj, cache=False)
+    return apply_calculators(block, obj)
+
+
+def clear_displayed_frames():
+    _displayed_frames.clear()
+
+
+def update_object_mesh(mesh: bpy.types.Mesh, polydata: VTK_data):
+    if (polydata.n_points, polydata.n_cells) == (
+        len(mesh.vertices),
+        len(mesh.polygons),
+    ):
+        update_attributes_from_vtk(polydata, mesh.name)
+    else:  # mesh has changed
+        update_mesh_from_vtk(mesh, polydata, update_attributes=True)
 
 
 def get_mesh_data_from_vtk(vtk_data: VTK_data):
@@ -74,6 +166,66 @@ def update_mesh_from_vtk(
         set_mesh_attributes(mesh, vtk_data)
 
 
+def has_same_topology(mesh: bpy.types.Mesh, edges, faces) -> bool:
+    if len(faces) != len(mesh.polygons):
+        return False
+    if len(faces) == 0:  # edges are only computed from faces otherwise
+        if len(edges) != len(mesh.edges):
+            return False
+        edge_vertices = np.empty(2 * len(mesh.edges), dtype=np.int64)
+        mesh.edges.foreach_get("vertices", edge_vertices)
+        return np.array_equal(np.ravel(edges), edge_vertices)
+
+    if isinstance(faces, np.ndarray):
+        face_vertices = faces.ravel()
+    else:
+        face_vertices = np.fromiter(
+            itertools.chain.from_iterable(faces), dtype=np.int64
+        )
+    if len(face_vertices) != len(mesh.loops):
+        return False
+    loop_vertices = np.empty(len(mesh.loops), dtype=np.int64)
+    mesh.loops.foreach_get("vertex_index", loop_vertices)
+    return np.array_equal(face_vertices, loop_vertices)
+
+
+def update_mesh_in_place(mesh: bpy.types.Mesh, vtk_data: VTK_data):
+    # Reuse the mesh datablock: positions only when topology matches, else rebuild it
+    vertices, edges, faces = get_mesh_data_from_vtk(vtk_data)
+    previous_ranges = None
+
+    if len(vertices) == len(mesh.vertices) and has_same_topology(mesh, edges, faces):
+        mesh.attributes["position"].data.foreach_set("vector", np.ravel(vertices))
+    else:
+        # The attributes are cleared with the geometry, not their ranges
+        material = mesh.materials[0] if len(mesh.materials) > 0 else None
+        if material is not None and "attributes" in material:
+            previous_ranges = material["attributes"].to_dict()
+        mesh.clear_geometry()
+        mesh.from_pydata(vertices=vertices, edges=edges, faces=faces)
+
+    if len(mesh.materials) > 0 and "attributes" in mesh.materials[0]:
+        for attr_name, values in vtk_data.point_data.items():
+            update_material_attributes(
+                attr_name, values, mesh, mesh.materials[0], "POINT"
+            )
+        for attr_name, values in vtk_data.cell_data.items():
+            update_material_attributes(
+                attr_name, values, mesh, mesh.materials[0], "FACE"
+            )
+        if previous_ranges is not None:
+            merge_attribute_ranges(mesh.materials[0]["attributes"], previous_ranges)
+        update_display_attributes(mesh, mesh.materials[0])
+
+    mesh.update()
+
+
+def remove_orphan_meshes(prefix: str):
+    for mesh in list(bpy.data.meshes):
+        if mesh.users == 0 and mesh.name.startswith(prefix):
+            bpy.data.meshes.remove(mesh)
+
+
 def vtk_to_mesh(vtk_data, mesh_name):
     vertices, edges, faces = get_mesh_data_from_vtk(vtk_data)
 
@@ -95,6 +247,15 @@ def set_mesh_attributes(mesh, vtk_data):
             attr_name, values, mesh, mesh.materials[0], "FACE"
         )
 
+    update_display_attributes(mesh, mesh.materials[0])
+
+
+def get_radius_array_name(vtk_data):
+    for name in RADIUS_ARRAYS:
+        if name in vtk_data.point_data and np.ndim(vtk_data.point_data[name]) == 1:
+            return name
+    return None
+
 
 def create_object(context, vtk_data, mesh_name) -> bpy.types.Object:
     # convert vtk mesh to blender mesh
@@ -125,10 +286,9 @@ def create_object(context, vtk_data, mesh_name) -> bpy.types.Object:
         create_attribute_material_nodes(mesh_name)
         update_attributes_enum(mat, context)
 
-    is_point_cloud = (
-        len(mesh.polygons) + len(mesh.edges) == 0 and "rad" in vtk_data.point_data
-    )
-    if is_point_cloud:
-        convert_mesh_to_pointcloud(mesh_name)
+    if len(mesh.polygons) + len(mesh.edges) == 0:
+        radius_name = get_radius_array_name(vtk_data)
+        if radius_name is not None:
+            convert_mesh_to_pointcloud(mesh_name, radius_name)
 
     return obj
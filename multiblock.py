@@ -0,0 +1,111 @@
+import bpy
+import numpy as np
+import pyvista as pv
+
+from .mesh import create_object
+from .reader import (
+    get_block,
+    get_frame_file_path,
+    get_read_key,
+    get_read_settings,
+    read_frame,
+)
+
+# Last MultiBlock read, enabling several blocks of the same frame reads it once
+_multiblock_cache = {}
+
+
+def read_multiblock(file_path):
+    key = get_read_key(file_path, *get_read_settings())
+    if key not in _multiblock_cache:
+        _multiblock_cache.clear()
+        _multiblock_cache[key] = read_frame(file_path)
+    return _multiblock_cache[key]
+
+
+def create_block_placeholders(context, vtk_data, name, file_path, parent=None, path=()):
+    # Empties only: no mesh, material or node tree is created before a block is enabled
+    obj = bpy.data.objects.new(name, None)
+    context.scene.collection.objects.link(obj)
+    obj.parent = parent
+    obj["vtk_file_path"] = file_path
+    obj["vtk_block_path"] = list(path)
+
+    if isinstance(vtk_data, pv.MultiBlock):
+        obj.empty_display_type = "PLAIN_AXES"
+        for block_name in vtk_data.keys():
+            block = vtk_data[block_name]
+            if block is None:
+                continue
+            create_block_placeholders(
+                context,
+                block,
+                f"{name} : {block_name}",
+                file_path,
+                parent=obj,
+                path=(*path, block_name),
+            )
+        return obj
+
+    bounds = np.reshape(vtk_data.bounds, (3, 2))
+    center = bounds.mean(axis=1)
+    half_size = np.maximum(0.5 * (bounds[:, 1] - bounds[:, 0]), 1e-6)
+    obj.empty_display_type = "CUBE"
+    obj.empty_display_size = 1.0
+    obj.location = center
+    obj.scale = half_size
+    obj["vtk_block_placeholder"] = True
+
+    return obj
+
+
+def materialize_block(context, placeholder):
+    vtk_data = read_multiblock(get_frame_file_path(placeholder))
+    block = get_block(vtk_data, placeholder)
+
+    obj = create_object(context, block, f"{placeholder.name}_mesh")
+    obj.parent = placeholder
+    obj.matrix_parent_inverse = placeholder.matrix_world.inverted()
+    obj["vtk_file_path"] = placeholder["vtk_file_path"]
+    obj["vtk_block_path"] = placeholder["vtk_block_path"]
+    if "vtk_sequence_name" in placeholder:
+        obj["vtk_sequence_name"] = placeholder["vtk_sequence_name"]
+
+    return obj
+
+
+def remove_block(placeholder):
+    for child in list(placeholder.children):
+        if child.type != "MESH":
+            continue
+        mesh = child.data
+        materials = [mat for mat in mesh.materials if mat is not None]
+        bpy.data.objects.remove(child)
+        if mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+        for mat in materials:
+            if mat.users == 0:
+                bpy.data.materials.remove(mat)
+
+
+def update_block_enabled(self, context):
+    if "vtk_block_placeholder" not in self:
+        return
+    has_mesh = any(child.type == "MESH" for child in self.children)
+    if self.vtk_block_enabled and not has_mesh:
+        materialize_block(context, self)
+    elif not self.vtk_block_enabled and has_mesh:
+        remove_block(self)
+
+
+def register():
+    bpy.types.Object.vtk_block_enabled = bpy.props.BoolProperty(
+        name="Enabled",
+        description="Load the geometry of this block",
+        default=False,
+        update=update_block_enabled,
+    )
+
+
+def unregister():
+    del bpy.types.Object.vtk_block_enabled
@@ -1,5 +1,193 @@
 import bpy
 import matplotlib.pyplot as plt
+import numpy as np
+
+
+LUT_PREFIX = "VTK LUT "
+COLORMAP_PREFIX = "VTK Colormap "
+
+
+def srgb_to_linear(rgb):
+    rgb = np.asarray(rgb, dtype=float)
+    return np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+
+
+def linear_to_srgb(rgb):
+    rgb = np.asarray(rgb, dtype=float)
+    return np.where(
+        rgb <= 0.0031308, rgb * 12.92, 1.055 * np.power(rgb, 1.0 / 2.4) - 0.055
+    )
+
+
+def get_cmap(colormap):
+    # Reversed colormaps are named like matplotlib ones, even when not registered
+    if colormap.endswith("_r") and colormap not in plt.colormaps():
+        return plt.get_cmap(colormap[:-2]).reversed()
+    return plt.get_cmap(colormap)
+
+
+def get_colormap_pixels(colormap, size):
+    # Flat linear RGBA buffer of a size x 1 image, sampled at the texel centers
+    rgba = get_cmap(colormap)(np.linspace(0.0, 1.0, size))
+    rgba[:, :3] = srgb_to_linear(rgba[:, :3])
+    return rgba.astype(np.float32).ravel()
+
+
+_srgb_luts = {}
+
+
+def get_colormap_lut(colormap, size):
+    # sRGB RGBA colors of the LUT texels, for colors computed on the CPU
+    key = (colormap, size)
+    if key not in _srgb_luts:
+        _srgb_luts[key] = get_cmap(colormap)(np.linspace(0.0, 1.0, size)).astype(
+            np.float32
+        )
+    return _srgb_luts[key]
+
+
+def apply_colormap(values, min_value, max_value, lut):
+    # Same mapping as the material: clamped Map Range, then the LUT
+    values = np.asarray(values, dtype=np.float32)
+    if max_value > min_value:
+        fac = (values - min_value) / (max_value - min_value)
+    else:
+        fac = np.zeros_like(values)
+    indices = np.rint(np.clip(fac, 0.0, 1.0) * (len(lut) - 1)).astype(np.intp)
+    return lut[indices]
+
+
+def set_color_ramp_colors(color_ramp, colormap):
+    # Color ramps of materials created before the colormap LUTs
+    positions = [element.position for element in color_ramp.elements]
+    colors = get_cmap(colormap)(positions)
+    colors[:, :3] = srgb_to_linear(colors[:, :3])
+    for element, color in zip(color_ramp.elements, colors):
+        element.color = color
+
+
+def get_colormap_image(colormap, size):
+    name = f"{LUT_PREFIX}{colormap}"
+    image = bpy.data.images.get(name)
+    if image is None:
+        image = bpy.data.images.new(name, size, 1, alpha=True, float_buffer=True)
+        # The pixels are already linear
+        image.colorspace_settings.name = "Non-Color"
+    elif tuple(image.size) == (size, 1):
+        return image
+    else:
+        image.scale(size, 1)
+
+    image.pixels.foreach_set(get_colormap_pixels(colormap, size))
+    image.update()
+    # Generated images are not saved with the file unless packed
+    image.pack()
+    return image
+
+
+def set_colormap_lut(node_group, colormap, size):
+    node_group.nodes["LUT"].image = get_colormap_image(colormap, size)
+    # Map [0, 1] to the centers of the first and last texels
+    map_range_node = node_group.nodes["Map Range"]
+    map_range_node.inputs["To Min"].default_value = 0.5 / size
+    map_range_node.inputs["To Max"].default_value = 1.0 - 0.5 / size
+
+
+def update_lut_size(self, context):
+    size = int(self.vtk_lut_size)
+    for node_group in bpy.data.node_groups:
+        if node_group.name.startswith(COLORMAP_PREFIX) and "LUT" in node_group.nodes:
+            colormap = node_group.name[len(COLORMAP_PREFIX) :]
+            set_colormap_lut(node_group, colormap, size)
+
+
+def get_colormap_node_group(colormap):
+    # Shared by all the materials using this colormap: Map Range -> 1D LUT image,
+    # the range is a group input set by each material
+    name = f"{COLORMAP_PREFIX}{colormap}"
+    node_group = bpy.data.node_groups.get(name)
+    if node_group is not None and "LUT" in node_group.nodes:
+        return node_group
+
+    if node_group is None:
+        node_group = bpy.data.node_groups.new(name, "ShaderNodeTree")
+        new_group_socket(node_group, "Value", "INPUT", "NodeSocketFloat")
+        new_group_socket(node_group, "From Min", "INPUT", "NodeSocketFloat")
+        new_group_socket(node_group, "From Max", "INPUT", "NodeSocketFloat")
+        new_group_socket(node_group, "Color", "OUTPUT", "NodeSocketColor")
+    else:  # group built with a Color Ramp
+        node_group.nodes.clear()
+
+    input_node = node_group.nodes.new("NodeGroupInput")
+    output_node = node_group.nodes.new("NodeGroupOutput")
+    map_range_node = node_group.nodes.new("ShaderNodeMapRange")
+    map_range_node.name = "Map Range"
+    map_range_node.label = "Data range"
+    uv_node = node_group.nodes.new("ShaderNodeCombineXYZ")
+    uv_node.inputs["Y"].default_value = 0.5
+    lut_node = node_group.nodes.new("ShaderNodeTexImage")
+    lut_node.name = "LUT"
+    lut_node.label = colormap
+    lut_node.interpolation = "Linear"
+    lut_node.extension = "EXTEND"
+    set_colormap_lut(node_group, colormap, int(bpy.context.scene.vtk_lut_size))
+
+    links = node_group.links
+    links.new(input_node.outputs["Value"], map_range_node.inputs["Value"])
+    links.new(input_node.outputs["From Min"], map_range_node.inputs["From Min"])
+    links.new(input_node.outputs["From Max"], map_range_node.inputs["From Max"])
+    links.new(map_range_node.outputs["Result"], uv_node.inputs["X"])
+    links.new(uv_node.outputs["Vector"], lut_node.inputs["Vector"])
+    links.new(lut_node.outputs["Color"], output_node.inputs["Color"])
+
+    input_node.location = (-700, 0)
+    map_range_node.location = (-500, 0)
+    uv_node.location = (-300, 0)
+    lut_node.location = (-100, 0)
+    output_node.location = (250, 0)
+
+    return node_group
+
+
+def get_material_colormap(mat):
+    if mat.vtk_colormap_reversed:
+        return f"{mat.vtk_colormaps}_r"
+    return mat.vtk_colormaps
+
+
+def get_colormap_node(mat):
+    return mat.node_tree.nodes.get("Colormap")
+
+
+def get_color_ramp_node(mat):
+    # Only materials created before the shared colormap groups have a Color Ramp
+    if get_colormap_node(mat) is not None:
+        return None
+    return mat.node_tree.nodes.get("Color Ramp")
+
+
+def get_data_range_node(mat):
+    # Node with the Value, From Min and From Max inputs of the material
+    node = get_colormap_node(mat)
+    if node is None:
+        return mat.node_tree.nodes["Map Range"]
+    return node
+
+
+def get_range_inputs(mat):
+    node = get_data_range_node(mat)
+    return node.inputs["From Min"], node.inputs["From Max"]
+
+
+def get_data_range(mat):
+    min_input, max_input = get_range_inputs(mat)
+    return min_input.default_value, max_input.default_value
+
+
+def set_data_range(mat, min_value, max_value):
+    min_input, max_input = get_range_inputs(mat)
+    min_input.default_value = min_value
+    max_input.default_value = max_value
 
 
 def create_attribute_material_nodes(mesh_name):
@@ -25,51 +213,32 @@ def create_attribute_material_nodes(mesh_name):
         attribute_node.outputs["Vector"], separate_node.inputs["Vector"]
     )
 
-    map_range_node = mat.node_tree.nodes.new("ShaderNodeMapRange")
-    map_range_node.label = "Data range"
-
     colormap = bpy.context.scene.default_colormap
+    colormap_node = mat.node_tree.nodes.new("ShaderNodeGroup")
+    colormap_node.node_tree = get_colormap_node_group(colormap)
+    colormap_node.name = "Colormap"
+    colormap_node.label = colormap
     mat.vtk_colormaps = colormap
-    n_colors = bpy.context.scene.number_elem_cmap
-    color_ramp_node = mat.node_tree.nodes.new("ShaderNodeValToRGB")
-    cmap = plt.get_cmap(colormap)
-    color_ramp_node.color_ramp.elements.remove(
-        color_ramp_node.color_ramp.elements[-1]
-    )  # remove to create it again in the last iteration to have it selected
-    for i in range(n_colors):
-        location = i / (n_colors - 1)
-        if i != 0:
-            color_ramp_node.color_ramp.elements.new(location)
-        color_ramp_node.color_ramp.elements[i].color = [
-            c**2.2 for c in cmap(location)
-        ]  # sRGB to Linear RGB
-
-    color_ramp_node.select = False
-    color_ramp_node.location = (
-        bsdf.location.x - color_ramp_node.width - 50,
+
+    colormap_node.select = False
+    colormap_node.location = (
+        bsdf.location.x - colormap_node.width - 50,
         bsdf.location.y,
     )
-    color_ramp_node.label = colormap
 
     bsdf.select = False
 
     attribute_node.select = False
     length_node.select = False
     separate_node.select = False
-    map_range_node.select = False
-
-    map_range_node.location = (
-        color_ramp_node.location.x - map_range_node.width - 50,
-        bsdf.location.y,
-    )
 
     length_node.location = (
-        map_range_node.location.x - length_node.width - 50,
+        colormap_node.location.x - length_node.width - 50,
         bsdf.location.y - 150,
     )
 
     separate_node.location = (
-        map_range_node.location.x - separate_node.width - 50,
+        colormap_node.location.x - separate_node.width - 50,
         bsdf.location.y - 300,
     )
 
@@ -79,9 +248,8 @@ def create_attribute_material_nodes(mesh_name):
     )
 
     mat.node_tree.links.new(
-        map_range_node.outputs["Result"], color_ramp_node.inputs["Fac"]
+        colormap_node.outputs["Color"], bsdf.inputs["Base Color"]
     )
-    mat.node_tree.links.new(color_ramp_node.outputs["Color"], bsdf.inputs["Base Color"])
     mat.node_tree.links.new(
         bsdf.outputs["BSDF"], material_output_node.inputs["Surface"]
     )
@@ -89,72 +257,344 @@ def create_attribute_material_nodes(mesh_name):
     bpy.data.objects[mesh_name].data.materials.append(mat)
 
     if "global_min" in mat["attributes"][attr_name].to_dict().keys():
-        map_range_node.inputs["From Min"].default_value = mat["attributes"][attr_name][
-            "global_min"
-        ]
-        map_range_node.inputs["From Max"].default_value = mat["attributes"][attr_name][
-            "global_max"
-        ]
+        set_data_range(
+            mat,
+            mat["attributes"][attr_name]["global_min"],
+            mat["attributes"][attr_name]["global_max"],
+        )
     else:
         component = mat.vtk_attribute_component
         attr_stats = mat["attributes"][attr_name][component]
-        map_range_node.inputs["From Min"].default_value = attr_stats["global_min"]
-        map_range_node.inputs["From Max"].default_value = attr_stats["global_max"]
+        set_data_range(mat, attr_stats["global_min"], attr_stats["global_max"])
 
 
-def convert_mesh_to_pointcloud(mesh_name):
-    bpy.context.scene.render.engine = "CYCLES"
-    bpy.context.scene.cycles.device = "GPU"
+def new_group_socket(node_group, name, in_out, socket_type):
+    if hasattr(node_group, "interface"):  # Blender 4
+        return node_group.interface.new_socket(
+            name=name, in_out=in_out, socket_type=socket_type
+        )
+    sockets = node_group.inputs if in_out == "INPUT" else node_group.outputs
+    return sockets.new(socket_type, name)  # Blender 3
 
-    obj = bpy.data.objects[mesh_name]
-    modifier = obj.modifiers.new(name=f"modifier_{mesh_name}", type="NODES")
-    geo_node = bpy.data.node_groups.new(f"node_{mesh_name}", "GeometryNodeTree")
-    if hasattr(geo_node, "inputs"):  # Blender 3
-        geo_node.inputs.new("NodeSocketGeometry", "Geometry")
-        geo_node.outputs.new("NodeSocketGeometry", "Geometry")
-    elif hasattr(geo_node, "interface"):  # Blender 4
-        geo_node.interface.new_socket(
-            name="Geometry", in_out="INPUT", socket_type="NodeSocketGeometry"
+
+def get_group_input_identifier(node_group, name):
+    if hasattr(node_group, "interface"):  # Blender 4
+        return node_group.interface.items_tree[name].identifier
+    return node_group.inputs[name].identifier  # Blender 3
+
+
+def set_modifier_input(modifier, name, value):
+    modifier[get_group_input_identifier(modifier.node_group, name)] = value
+    modifier.id_data.update_tag()
+
+
+def get_warp_node_group(mode):
+    # Shared by all warped objects, the attribute and factor are modifier inputs
+    name = f"VTK Warp By {mode.capitalize()}"
+    if name in bpy.data.node_groups:
+        return bpy.data.node_groups[name]
+
+    geo_node = bpy.data.node_groups.new(name, "GeometryNodeTree")
+    new_group_socket(geo_node, "Geometry", "INPUT", "NodeSocketGeometry")
+    new_group_socket(geo_node, "Attribute", "INPUT", "NodeSocketString")
+    new_group_socket(geo_node, "Factor", "INPUT", "NodeSocketFloat")
+    new_group_socket(geo_node, "Geometry", "OUTPUT", "NodeSocketGeometry")
+
+    input_node = geo_node.nodes.new("NodeGroupInput")
+    output_node = geo_node.nodes.new("NodeGroupOutput")
+    output_node.is_active_output = True
+
+    attribute_node = geo_node.nodes.new("GeometryNodeInputNamedAttribute")
+    scale_node = geo_node.nodes.new("ShaderNodeVectorMath")
+    scale_node.operation = "SCALE"
+    set_position_node = geo_node.nodes.new("GeometryNodeSetPosition")
+
+    geo_node.links.new(input_node.outputs["Attribute"], attribute_node.inputs["Name"])
+
+    if mode == "VECTOR":
+        attribute_node.data_type = "FLOAT_VECTOR"
+        geo_node.links.new(
+            attribute_node.outputs["Attribute"], scale_node.inputs["Vector"]
         )
-        geo_node.interface.new_socket(
-            name="Geometry", in_out="OUTPUT", socket_type="NodeSocketGeometry"
+        geo_node.links.new(input_node.outputs["Factor"], scale_node.inputs["Scale"])
+    else:  # offset along the normal, scaled by the scalar attribute
+        attribute_node.data_type = "FLOAT"
+        normal_node = geo_node.nodes.new("GeometryNodeInputNormal")
+        multiply_node = geo_node.nodes.new("ShaderNodeMath")
+        multiply_node.operation = "MULTIPLY"
+        geo_node.links.new(
+            attribute_node.outputs["Attribute"], multiply_node.inputs[0]
         )
+        geo_node.links.new(input_node.outputs["Factor"], multiply_node.inputs[1])
+        geo_node.links.new(normal_node.outputs["Normal"], scale_node.inputs["Vector"])
+        geo_node.links.new(multiply_node.outputs["Value"], scale_node.inputs["Scale"])
+        normal_node.location = (-100, -250)
+        multiply_node.location = (-100, -100)
+
+    geo_node.links.new(
+        input_node.outputs["Geometry"], set_position_node.inputs["Geometry"]
+    )
+    geo_node.links.new(scale_node.outputs["Vector"], set_position_node.inputs["Offset"])
+    geo_node.links.new(
+        set_position_node.outputs["Geometry"], output_node.inputs["Geometry"]
+    )
+
+    input_node.location = (-500, 0)
+    attribute_node.location = (-300, -100)
+    scale_node.location = (100, -100)
+    set_position_node.location = (300, 0)
+    output_node.location = (500, 0)
+
+    return geo_node
+
+
+def get_live_clip_node_group():
+    # Faces are kept or deleted by the side of their center, a cell-center half-space test
+    name = "VTK Live Clip"
+    if name in bpy.data.node_groups:
+        return bpy.data.node_groups[name]
+
+    geo_node = bpy.data.node_groups.new(name, "GeometryNodeTree")
+    new_group_socket(geo_node, "Geometry", "INPUT", "NodeSocketGeometry")
+    new_group_socket(geo_node, "Plane", "INPUT", "NodeSocketObject")
+    new_group_socket(geo_node, "Invert", "INPUT", "NodeSocketBool")
+    new_group_socket(geo_node, "Geometry", "OUTPUT", "NodeSocketGeometry")
 
     input_node = geo_node.nodes.new("NodeGroupInput")
     output_node = geo_node.nodes.new("NodeGroupOutput")
     output_node.is_active_output = True
 
-    modifier.node_group = geo_node
+    object_info_node = geo_node.nodes.new("GeometryNodeObjectInfo")
+    object_info_node.transform_space = "RELATIVE"
 
-    radius_node = geo_node.nodes.new("GeometryNodeInputNamedAttribute")
-    radius_node.name = "rad"
+    normal_node = geo_node.nodes.new("ShaderNodeVectorRotate")
+    normal_node.rotation_type = "EULER_XYZ"
+    normal_node.inputs["Vector"].default_value = (0.0, 0.0, 1.0)
 
-    mesh_to_points_node = geo_node.nodes.new("GeometryNodeMeshToPoints")
+    position_node = geo_node.nodes.new("GeometryNodeInputPosition")
+    subtract_node = geo_node.nodes.new("ShaderNodeVectorMath")
+    subtract_node.operation = "SUBTRACT"
+    dot_node = geo_node.nodes.new("ShaderNodeVectorMath")
+    dot_node.operation = "DOT_PRODUCT"
+    compare_node = geo_node.nodes.new("FunctionNodeCompare")
+    compare_node.data_type = "FLOAT"
+    compare_node.operation = "GREATER_THAN"
+    compare_node.inputs["B"].default_value = 0.0
+    invert_node = geo_node.nodes.new("FunctionNodeBooleanMath")
+    invert_node.operation = "XOR"
 
-    set_material_node = geo_node.nodes.new("GeometryNodeSetMaterial")
-    set_material_node.inputs[2].default_value = bpy.data.materials[
-        f"{mesh_name}_attributes"
-    ]
+    delete_node = geo_node.nodes.new("GeometryNodeDeleteGeometry")
+    delete_node.domain = "FACE"
 
-    radius_node.select = False
-    set_material_node.select = False
-    output_node.select = False
-    input_node.select = False
-    mesh_to_points_node.select = False
+    links = geo_node.links
+    links.new(input_node.outputs["Plane"], object_info_node.inputs["Object"])
+    links.new(object_info_node.outputs["Rotation"], normal_node.inputs["Rotation"])
+    links.new(position_node.outputs["Position"], subtract_node.inputs[0])
+    links.new(object_info_node.outputs["Location"], subtract_node.inputs[1])
+    links.new(subtract_node.outputs["Vector"], dot_node.inputs[0])
+    links.new(normal_node.outputs["Vector"], dot_node.inputs[1])
+    links.new(dot_node.outputs["Value"], compare_node.inputs["A"])
+    links.new(compare_node.outputs["Result"], invert_node.inputs[0])
+    links.new(input_node.outputs["Invert"], invert_node.inputs[1])
+    links.new(input_node.outputs["Geometry"], delete_node.inputs["Geometry"])
+    links.new(invert_node.outputs["Boolean"], delete_node.inputs["Selection"])
+    links.new(delete_node.outputs["Geometry"], output_node.inputs["Geometry"])
 
-    input_node.location = (-300, 0)
-    radius_node.location = (-300, -100)
-    mesh_to_points_node.location = (-100, 0)
-    set_material_node.location = (100, 0)
-    output_node.location = (300, 0)
+    input_node.location = (-900, 0)
+    object_info_node.location = (-700, -200)
+    position_node.location = (-700, -450)
+    normal_node.location = (-500, -300)
+    subtract_node.location = (-500, -450)
+    dot_node.location = (-300, -350)
+    compare_node.location = (-100, -300)
+    invert_node.location = (100, -250)
+    delete_node.location = (300, 0)
+    output_node.location = (500, 0)
+
+    return geo_node
 
-    geo_node.links.new(input_node.outputs[0], mesh_to_points_node.inputs["Mesh"])
+
+def get_glyph_node_group(shape):
+    # Instances keep a single copy of the glyph mesh, frame changes only upload the
+    # point attributes of the shared mesh
+    name = f"VTK Glyph {shape.capitalize()}"
+    if name in bpy.data.node_groups:
+        return bpy.data.node_groups[name]
+
+    geo_node = bpy.data.node_groups.new(name, "GeometryNodeTree")
+    new_group_socket(geo_node, "Geometry", "INPUT", "NodeSocketGeometry")
+    new_group_socket(geo_node, "Vectors", "INPUT", "NodeSocketString")
+    new_group_socket(geo_node, "Scalars", "INPUT", "NodeSocketString")
+    new_group_socket(geo_node, "Scale By Scalars", "INPUT", "NodeSocketBool")
+    new_group_socket(geo_node, "Factor", "INPUT", "NodeSocketFloat")
+    new_group_socket(geo_node, "Stride", "INPUT", "NodeSocketInt")
+    new_group_socket(geo_node, "Ratio", "INPUT", "NodeSocketFloat")
+    new_group_socket(geo_node, "Seed", "INPUT", "NodeSocketInt")
+    new_group_socket(geo_node, "Geometry", "OUTPUT", "NodeSocketGeometry")
+
+    input_node = geo_node.nodes.new("NodeGroupInput")
+    output_node = geo_node.nodes.new("NodeGroupOutput")
+    output_node.is_active_output = True
+    links = geo_node.links
+
+    if shape == "ARROW":  # unit length along Z
+        shaft_node = geo_node.nodes.new("GeometryNodeMeshCylinder")
+        shaft_node.inputs["Vertices"].default_value = 8
+        shaft_node.inputs["Radius"].default_value = 0.03
+        shaft_node.inputs["Depth"].default_value = 0.7
+        head_node = geo_node.nodes.new("GeometryNodeMeshCone")
+        head_node.inputs["Vertices"].default_value = 8
+        head_node.inputs["Radius Bottom"].default_value = 0.08
+        head_node.inputs["Depth"].default_value = 0.3
+        shaft_transform_node = geo_node.nodes.new("GeometryNodeTransform")
+        shaft_transform_node.inputs["Translation"].default_value = (0.0, 0.0, 0.35)
+        head_transform_node = geo_node.nodes.new("GeometryNodeTransform")
+        head_transform_node.inputs["Translation"].default_value = (0.0, 0.0, 0.85)
+        glyph_node = geo_node.nodes.new("GeometryNodeJoinGeometry")
+        links.new(shaft_node.outputs["Mesh"], shaft_transform_node.inputs["Geometry"])
+        links.new(head_node.outputs["Mesh"], head_transform_node.inputs["Geometry"])
+        links.new(shaft_transform_node.outputs["Geometry"], glyph_node.inputs[0])
+        links.new(head_transform_node.outputs["Geometry"], glyph_node.inputs[0])
+        shaft_node.location = (-500, 300)
+        head_node.location = (-500, 550)
+        shaft_transform_node.location = (-300, 300)
+        head_transform_node.location = (-300, 550)
+        glyph_node.location = (-100, 400)
+    else:
+        glyph_node = geo_node.nodes.new("GeometryNodeMeshUVSphere")
+        glyph_node.inputs["Segments"].default_value = 12
+        glyph_node.inputs["Rings"].default_value = 6
+        glyph_node.inputs["Radius"].default_value = 0.5
+        glyph_node.location = (-100, 400)
+
+    # Subsampling: every Stride-th point, then a random Ratio of them
+    index_node = geo_node.nodes.new("GeometryNodeInputIndex")
+    modulo_node = geo_node.nodes.new("ShaderNodeMath")
+    modulo_node.operation = "MODULO"
+    stride_node = geo_node.nodes.new("FunctionNodeCompare")
+    stride_node.data_type = "FLOAT"
+    stride_node.operation = "EQUAL"
+    random_node = geo_node.nodes.new("FunctionNodeRandomValue")
+    random_node.data_type = "BOOLEAN"
+    selection_node = geo_node.nodes.new("FunctionNodeBooleanMath")
+    selection_node.operation = "AND"
+
+    links.new(index_node.outputs["Index"], modulo_node.inputs[0])
+    links.new(input_node.outputs["Stride"], modulo_node.inputs[1])
+    links.new(modulo_node.outputs["Value"], stride_node.inputs["A"])
+    links.new(input_node.outputs["Ratio"], random_node.inputs["Probability"])
+    links.new(input_node.outputs["Seed"], random_node.inputs["Seed"])
+    links.new(stride_node.outputs["Result"], selection_node.inputs[0])
+    random_output = next(out for out in random_node.outputs if out.type == "BOOLEAN")
+    links.new(random_output, selection_node.inputs[1])
+
+    # Orientation along the vectors
+    vectors_node = geo_node.nodes.new("GeometryNodeInputNamedAttribute")
+    vectors_node.data_type = "FLOAT_VECTOR"
+    align_node = geo_node.nodes.new("FunctionNodeAlignEulerToVector")
+    align_node.axis = "Z"
+    links.new(input_node.outputs["Vectors"], vectors_node.inputs["Name"])
+    links.new(vectors_node.outputs["Attribute"], align_node.inputs["Vector"])
+
+    # Scale: Factor * (scalars if Scale By Scalars else 1)
+    scalars_node = geo_node.nodes.new("GeometryNodeInputNamedAttribute")
+    scalars_node.data_type = "FLOAT"
+    unscaled_node = geo_node.nodes.new("ShaderNodeMath")
+    unscaled_node.operation = "SUBTRACT"
+    unscaled_node.inputs[0].default_value = 1.0
+    scaled_node = geo_node.nodes.new("ShaderNodeMath")
+    scaled_node.operation = "MULTIPLY_ADD"
+    factor_node = geo_node.nodes.new("ShaderNodeMath")
+    factor_node.operation = "MULTIPLY"
+    links.new(input_node.outputs["Scalars"], scalars_node.inputs["Name"])
+    links.new(input_node.outputs["Scale By Scalars"], unscaled_node.inputs[1])
+    links.new(scalars_node.outputs["Attribute"], scaled_node.inputs[0])
+    links.new(input_node.outputs["Scale By Scalars"], scaled_node.inputs[1])
+    links.new(unscaled_node.outputs["Value"], scaled_node.inputs[2])
+    links.new(scaled_node.outputs["Value"], factor_node.inputs[0])
+    links.new(input_node.outputs["Factor"], factor_node.inputs[1])
+
+    instance_node = geo_node.nodes.new("GeometryNodeInstanceOnPoints")
+    links.new(input_node.outputs["Geometry"], instance_node.inputs["Points"])
+    links.new(selection_node.outputs["Boolean"], instance_node.inputs["Selection"])
+    links.new(glyph_node.outputs[0], instance_node.inputs["Instance"])
+    links.new(align_node.outputs["Rotation"], instance_node.inputs["Rotation"])
+    links.new(factor_node.outputs["Value"], instance_node.inputs["Scale"])
+    links.new(instance_node.outputs["Instances"], output_node.inputs["Geometry"])
+
+    input_node.location = (-900, 0)
+    index_node.location = (-700, -100)
+    modulo_node.location = (-500, -100)
+    stride_node.location = (-300, -100)
+    random_node.location = (-300, -300)
+    selection_node.location = (-100, -150)
+    vectors_node.location = (-500, -500)
+    align_node.location = (-300, -500)
+    scalars_node.location = (-700, -700)
+    unscaled_node.location = (-500, -850)
+    scaled_node.location = (-300, -700)
+    factor_node.location = (-100, -700)
+    instance_node.location = (300, 0)
+    output_node.location = (500, 0)
+
+    return geo_node
+
+
+def get_pointcloud_node_group():
+    # Shared by all point clouds, the radius attribute and material are modifier
+    # inputs: positions and radii are mesh attributes updated with foreach_set
+    name = "VTK Point Cloud"
+    if name in bpy.data.node_groups:
+        return bpy.data.node_groups[name]
+
+    geo_node = bpy.data.node_groups.new(name, "GeometryNodeTree")
+    new_group_socket(geo_node, "Geometry", "INPUT", "NodeSocketGeometry")
+    new_group_socket(geo_node, "Radius", "INPUT", "NodeSocketString")
+    new_group_socket(geo_node, "Material", "INPUT", "NodeSocketMaterial")
+    new_group_socket(geo_node, "Geometry", "OUTPUT", "NodeSocketGeometry")
+
+    input_node = geo_node.nodes.new("NodeGroupInput")
+    output_node = geo_node.nodes.new("NodeGroupOutput")
+    output_node.is_active_output = True
+
+    radius_node = geo_node.nodes.new("GeometryNodeInputNamedAttribute")
+    radius_node.data_type = "FLOAT"
+    mesh_to_points_node = geo_node.nodes.new("GeometryNodeMeshToPoints")
+    set_material_node = geo_node.nodes.new("GeometryNodeSetMaterial")
+
+    geo_node.links.new(input_node.outputs["Radius"], radius_node.inputs["Name"])
+    geo_node.links.new(
+        input_node.outputs["Geometry"], mesh_to_points_node.inputs["Mesh"]
+    )
     geo_node.links.new(
         radius_node.outputs["Attribute"], mesh_to_points_node.inputs["Radius"]
     )
     geo_node.links.new(
         mesh_to_points_node.outputs["Points"], set_material_node.inputs["Geometry"]
     )
+    geo_node.links.new(
+        input_node.outputs["Material"], set_material_node.inputs["Material"]
+    )
     geo_node.links.new(
         set_material_node.outputs["Geometry"], output_node.inputs["Geometry"]
     )
+
+    input_node.location = (-300, 0)
+    radius_node.location = (-300, -150)
+    mesh_to_points_node.location = (-100, 0)
+    set_material_node.location = (100, 0)
+    output_node.location = (300, 0)
+
+    return geo_node
+
+
+def convert_mesh_to_pointcloud(mesh_name, radius_name):
+    # The render engine and device are left to the user, Eevee Next and Cycles
+    # on CPU or GPU render the points
+    obj = bpy.data.objects[mesh_name]
+    modifier = obj.modifiers.new(name="VTK Point Cloud", type="NODES")
+    modifier.node_group = get_pointcloud_node_group()
+    set_modifier_input(modifier, "Radius", radius_name)
+    material = bpy.data.materials.get(f"{mesh_name}_attributes")
+    if material is not None:
+        set_modifier_input(modifier, "Material", material)
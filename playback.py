@@ -0,0 +1,104 @@
+import bpy
+import numpy as np
+import pyvista as pv
+
+# Set between the render_pre and render_complete/render_cancel handlers
+_rendering = False
+
+
+def set_rendering(rendering):
+    global _rendering
+    _rendering = rendering
+
+
+def is_rendering():
+    return _rendering
+
+
+def is_final_render():
+    # Renders use every frame at full resolution, whatever the preview settings
+    return _rendering
+
+
+def is_playing():
+    screen = getattr(bpy.context, "screen", None)
+    return is_final_render() or (screen is not None and screen.is_animation_playing)
+
+
+def get_frame_stride(scene):
+    if is_final_render():
+        return 1
+    return max(scene.vtk_frame_stride, 1)
+
+
+def get_file_position(frame, n_files, stride=1, frames_per_file=1):
+    # Files shown at this frame: held file, next strided file and the weight
+    # of the next one when interpolating between them
+    position = max(frame, 0) / frames_per_file
+    index = min(int(position), n_files - 1)
+    index -= index % stride
+    next_index = min(index + stride, n_files - 1)
+    if next_index == index:
+        return index, index, 0.0
+    return index, next_index, min((position - index) / (next_index - index), 1.0)
+
+
+def get_sequence_frame(frame, n_files, stride=1, frames_per_file=1):
+    # Index of the file shown at this frame, held between the strided files
+    return get_file_position(frame, n_files, stride, frames_per_file)[0]
+
+
+def get_prefetch_frames(frame, n_frames, stride, count):
+    frames = [frame + stride * i for i in range(1, count + 1)]
+    return [f for f in frames if f < n_frames]
+
+
+def has_same_topology(first, second):
+    if type(first) is not type(second):
+        return False
+    if (first.n_points, first.n_cells) != (second.n_points, second.n_cells):
+        return False
+    if isinstance(first, pv.UnstructuredGrid):
+        return np.array_equal(first.celltypes, second.celltypes) and np.array_equal(
+            first.cells, second.cells
+        )
+    if isinstance(first, pv.PolyData):
+        return all(
+            np.array_equal(getattr(first, cells), getattr(second, cells))
+            for cells in ("verts", "lines", "faces", "strips")
+        )
+    if hasattr(first, "dimensions"):
+        return tuple(first.dimensions) == tuple(second.dimensions)
+    return True
+
+
+def blend_arrays(first, second, alpha):
+    first, second = np.asarray(first), np.asarray(second)
+    if np.issubdtype(first.dtype, np.floating):
+        return (1.0 - alpha) * first + alpha * second
+    # Integer ids and labels are not interpolated, the nearest file is used
+    return first if alpha < 0.5 else second
+
+
+def interpolate_datasets(first, second, alpha):
+    # Linear blend of the points and arrays of two files with the same topology,
+    # None when the topology changed between them
+    if not has_same_topology(first, second):
+        return None
+
+    result = first.copy(deep=False)
+    if isinstance(result, (pv.PolyData, pv.UnstructuredGrid, pv.StructuredGrid)):
+        # New points, the shallow copy shares the points of the first file
+        points = blend_arrays(first.points, second.points, alpha)
+        result.SetPoints(pv.vtk_points(points))
+    for data, first_data, second_data in (
+        (result.point_data, first.point_data, second.point_data),
+        (result.cell_data, first.cell_data, second.cell_data),
+    ):
+        for name in first_data.keys():
+            if name not in second_data:
+                continue
+            if np.shape(first_data[name]) != np.shape(second_data[name]):
+                continue
+            data[name] = blend_arrays(first_data[name], second_data[name], alpha)
+    return result
@@ -7,6 +7,7 @@ import bpy
 
 from . import dependencies
 from .material_panel import vtk_enum_colormaps, get_availbale_colormaps
+from .nodes import update_lut_size
 
 COLORMAP = "viridis"
 
@@ -74,8 +75,11 @@ class VtkImporterPreferences(bpy.types.AddonPreferences):
         box = layout.box()
         box.prop(context.scene, "default_colormap", icon_value=0, emboss=True)
         row = box.row()
-        row.label(text="Color map discretization")
-        row.prop(context.scene, "number_elem_cmap", text="")
+        row.label(text="Colormap resolution")
+        row.prop(context.scene, "vtk_lut_size", text="")
+        row = box.row()
+        row.label(text="Filter cache size")
+        row.prop(context.scene, "vtk_filter_cache_size", text="")
 
 def register():
     colormaps = get_availbale_colormaps()
@@ -87,12 +91,15 @@ def register():
         items=vtk_enum_colormaps,
         default=default_cmap_index,
     )
-    bpy.types.Scene.number_elem_cmap = bpy.props.IntProperty(
-        name='Color map discretization',
-        description='Number of color map elements',
-        default=9,
-        min=2,
-        max=32,
+    bpy.types.Scene.vtk_lut_size = bpy.props.EnumProperty(
+        name='Colormap resolution',
+        description='Number of texels of the colormap lookup tables',
+        items=[
+            ('256', '256', 'Colormaps sampled on 256 texels'),
+            ('1024', '1024', 'Colormaps sampled on 1024 texels'),
+        ],
+        default='256',
+        update=update_lut_size,
     )
     bpy.utils.register_class(VTK_OT_Upgrade_Dependencies)
     bpy.utils.register_class(VtkImporterPreferences)
@@ -100,6 +107,6 @@ def register():
 
 def unregister():
     del bpy.types.Scene.default_colormap
-    del bpy.types.Scene.number_elem_cmap
+    del bpy.types.Scene.vtk_lut_size
     bpy.utils.unregister_class(VTK_OT_Upgrade_Dependencies)
     bpy.utils.unregister_class(VtkImporterPreferences)
@@ -0,0 +1,374 @@
+import json
+import os
+import warnings
+import xml.etree.ElementTree as ET
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import bpy
+import numpy as np
+import pyvista as pv
+from pyvista.core.utilities.reader import PointCellDataSelection
+
+from .playback import get_frame_stride, get_sequence_frame
+
+PARTITIONED_EXTENSIONS = (".pvtu", ".pvtp")
+# Frames read ahead of the playback, by file and read settings
+_prefetched = OrderedDict()
+_prefetch_executor = ThreadPoolExecutor(max_workers=2)
+# Files blended by the temporal interpolation, by sequence then by file and
+# read settings: each sequence keeps its two neighbouring files
+_keyframes = {}
+MAX_KEYFRAMES = 2
+
+POLYDATA_CELL_ARRAYS = (
+    ("GetVerts", "verts"),
+    ("GetLines", "lines"),
+    ("GetPolys", "faces"),
+    ("GetStrips", "strips"),
+)
+
+
+def get_array_names(file_path):
+    if file_path.endswith(PARTITIONED_EXTENSIONS):
+        piece_files = get_piece_files(file_path)
+        if len(piece_files) == 0:
+            return [], []
+        return get_array_names(piece_files[0])
+
+    # XML readers only parse the file header to list the arrays
+    try:
+        reader = pv.get_reader(file_path)
+    except ValueError:
+        return [], []
+
+    if isinstance(reader, PointCellDataSelection):
+        return reader.point_array_names, reader.cell_array_names
+
+    vtk_data = reader.read()
+    if isinstance(vtk_data, pv.MultiBlock):
+        point_arrays, cell_arrays = [], []
+        for block in vtk_data.recursive_iterator(skip_none=True):
+            point_arrays += [k for k in block.point_data if k not in point_arrays]
+            cell_arrays += [k for k in block.cell_data if k not in cell_arrays]
+        return point_arrays, cell_arrays
+    return list(vtk_data.point_data.keys()), list(vtk_data.cell_data.keys())
+
+
+def get_array_selection():
+    if "vtk_array_selection" not in bpy.context.scene:
+        return None
+    return bpy.context.scene["vtk_array_selection"].to_dict()
+
+
+def remove_unselected_arrays(vtk_data, array_selection):
+    if isinstance(vtk_data, pv.MultiBlock):
+        for block in vtk_data.recursive_iterator(skip_none=True):
+            remove_unselected_arrays(block, array_selection)
+        return
+
+    for data, domain in ((vtk_data.point_data, "point"), (vtk_data.cell_data, "cell")):
+        for name in list(data.keys()):
+            if name not in array_selection[domain]:
+                data.remove(name)
+
+
+def read_vtk(file_path, array_selection=None, merge_points=False):
+    if file_path.endswith(PARTITIONED_EXTENSIONS):
+        return read_partitioned(file_path, array_selection, merge_points)
+
+    if array_selection is None:
+        return pv.read(file_path)
+
+    reader = pv.get_reader(file_path)
+    if not isinstance(reader, PointCellDataSelection):
+        # Legacy files are read entirely, only the upload to Blender is saved
+        vtk_data = reader.read()
+        remove_unselected_arrays(vtk_data, array_selection)
+        return vtk_data
+
+    reader.disable_all_point_arrays()
+    reader.disable_all_cell_arrays()
+    for name in array_selection["point"]:
+        if name in reader.point_array_names:
+            reader.enable_point_array(name)
+    for name in array_selection["cell"]:
+        if name in reader.cell_array_names:
+            reader.enable_cell_array(name)
+
+    return reader.read()
+
+
+def get_read_settings():
+    scene = bpy.context.scene
+    return get_array_selection(), scene.get("vtk_merge_points", False)
+
+
+def get_read_key(file_path, array_selection, merge_points):
+    return (file_path, json.dumps(array_selection, sort_keys=True), merge_points)
+
+
+def read_frame(file_path):
+    array_selection, merge_points = get_read_settings()
+    future = _prefetched.pop(
+        get_read_key(file_path, array_selection, merge_points), None
+    )
+    if future is not None:
+        return future.result()
+    return read_vtk(file_path, array_selection, merge_points=merge_points)
+
+
+def read_keyframe(file_path, sequence_name):
+    # Kept in memory while the frames between two files are interpolated
+    keyframes = _keyframes.setdefault(sequence_name, OrderedDict())
+    key = get_read_key(file_path, *get_read_settings())
+    if key not in keyframes:
+        keyframes[key] = read_frame(file_path)
+        while len(keyframes) > MAX_KEYFRAMES:
+            keyframes.popitem(last=False)
+    keyframes.move_to_end(key)
+    return keyframes[key]
+
+
+def prefetch_frames(file_paths):
+    # Read the next frames in the background, the settings are read here
+    # since bpy is only accessed from the main thread
+    array_selection, merge_points = get_read_settings()
+    for file_path in file_paths:
+        key = get_read_key(file_path, array_selection, merge_points)
+        if key not in _prefetched:
+            _prefetched[key] = _prefetch_executor.submit(
+                read_vtk, file_path, array_selection, merge_points
+            )
+
+    # Frames skipped while scrubbing are dropped
+    while len(_prefetched) > 2 * len(file_paths):
+        _, future = _prefetched.popitem(last=False)
+        future.cancel()
+
+
+def clear_prefetched_frames():
+    for future in _prefetched.values():
+        future.cancel()
+    _prefetched.clear()
+    _keyframes.clear()
+
+
+def get_frame_file_path(obj):
+    scene = bpy.context.scene
+    if "vtk_sequence_name" not in obj or "vtk_files" not in scene:
+        return obj["vtk_file_path"]
+
+    frame_sep = scene["frame_sep"]
+    for file in scene["vtk_files"]:
+        if file[0].split(".")[0].split(frame_sep)[0] == obj["vtk_sequence_name"]:
+            frame = get_sequence_frame(
+                scene.frame_current,
+                len(file),
+                get_frame_stride(scene),
+                scene.vtk_frames_per_file,
+            )
+            return f"{scene['vtk_directory']}/{file[frame]}"
+    return obj["vtk_file_path"]
+
+
+def get_block(vtk_data, obj):
+    if "vtk_merged_blocks" in obj:
+        return merge_blocks(vtk_data)
+    if "vtk_block_path" in obj:
+        for block_name in obj["vtk_block_path"]:
+            vtk_data = vtk_data[block_name]
+        return vtk_data
+    if "vtk_block_name" in obj:
+        return vtk_data[obj["vtk_block_name"]]
+    return vtk_data
+
+
+def get_piece_files(file_path):
+    directory = os.path.dirname(file_path)
+    root = ET.parse(file_path).getroot()
+    return [
+        os.path.join(directory, piece.attrib["Source"])
+        for piece in root.iter("Piece")
+        if "Source" in piece.attrib
+    ]
+
+
+def read_partitioned(file_path, array_selection=None, merge_points=False):
+    piece_files = get_piece_files(file_path)
+    max_workers = min(len(piece_files), os.cpu_count() or 1) or 1
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        pieces = list(
+            executor.map(lambda path: read_vtk(path, array_selection), piece_files)
+        )
+    return concatenate_pieces(pieces, merge_points)
+
+
+def cell_array_to_numpy(cell_array):
+    offsets = pv.convert_array(cell_array.GetOffsetsArray()).astype(np.int64)
+    connectivity = pv.convert_array(cell_array.GetConnectivityArray()).astype(
+        np.int64
+    )
+    return offsets, connectivity
+
+
+def padded_cells(offsets, connectivity):
+    # Legacy layout [n0, id, id, ..., n1, id, ...] expected by pyvista constructors
+    n_cells = len(offsets) - 1
+    cells = np.empty(len(connectivity) + n_cells, dtype=np.int64)
+    count_positions = offsets[:-1] + np.arange(n_cells)
+    is_count = np.zeros(len(cells), dtype=bool)
+    is_count[count_positions] = True
+    cells[count_positions] = np.diff(offsets)
+    cells[~is_count] = connectivity
+    return cells
+
+
+def concatenate_cell_arrays(cell_arrays, point_offsets):
+    offsets = [np.zeros(1, dtype=np.int64)]
+    connectivity = []
+    connectivity_offset = 0
+    for cell_array, point_offset in zip(cell_arrays, point_offsets):
+        piece_offsets, piece_connectivity = cell_array_to_numpy(cell_array)
+        offsets.append(piece_offsets[1:] + connectivity_offset)
+        connectivity.append(piece_connectivity + point_offset)
+        connectivity_offset += len(piece_connectivity)
+    return np.concatenate(offsets), np.concatenate(connectivity or [[]]).astype(
+        np.int64
+    )
+
+
+def concatenate_data(datas, slices, fill_missing=False):
+    # slices: (index in datas, start, stop) of each chunk, in output order
+    if fill_missing:
+        names = []
+        for data in datas:
+            names += [name for name in data.keys() if name not in names]
+    else:
+        names = [name for name in datas[0].keys() if all(name in d for d in datas)]
+
+    arrays = {}
+    for name in names:
+        shapes = {np.shape(data[name])[1:] for data in datas if name in data}
+        if len(shapes) > 1:
+            warnings.warn(
+                f"Inconsistent shapes {shapes} for attribute {name}", stacklevel=2
+            )
+            continue
+        shape = shapes.pop()
+
+        chunks = []
+        for i, start, stop in slices:
+            if name in datas[i]:
+                chunks.append(np.asarray(datas[i][name])[start:stop])
+            else:
+                chunks.append(np.full((stop - start, *shape), np.nan))
+        if fill_missing and len({chunk.dtype for chunk in chunks}) > 1:
+            chunks = [chunk.astype(float) for chunk in chunks]
+        arrays[name] = np.concatenate(chunks)
+    return arrays
+
+
+def concatenate_pieces(pieces, merge_points=False, fill_missing=False):
+    pieces = [piece for piece in pieces if piece is not None and piece.n_points > 0]
+    if len(pieces) == 0:
+        return pv.UnstructuredGrid()
+
+    n_points = np.array([piece.n_points for piece in pieces])
+    point_offsets = np.concatenate(([0], np.cumsum(n_points)[:-1]))
+    points = np.concatenate([np.asarray(piece.points) for piece in pieces])
+    point_data = concatenate_data(
+        [piece.point_data for piece in pieces],
+        [(i, 0, piece.n_points) for i, piece in enumerate(pieces)],
+        fill_missing,
+    )
+
+    cell_arrays = {}
+    if isinstance(pieces[0], pv.PolyData):
+        # PolyData cells are ordered verts, lines, polys, strips in every piece
+        order = []
+        starts = np.zeros(len(pieces), dtype=np.int64)
+        for getter, key in POLYDATA_CELL_ARRAYS:
+            piece_cell_arrays = [getattr(piece, getter)() for piece in pieces]
+            for i, cell_array in enumerate(piece_cell_arrays):
+                count = cell_array.GetNumberOfCells()
+                order.append((i, starts[i], starts[i] + count))
+                starts[i] += count
+            if any(cell_array.GetNumberOfCells() for cell_array in piece_cell_arrays):
+                cell_arrays[key] = concatenate_cell_arrays(
+                    piece_cell_arrays, point_offsets
+                )
+        cell_data = concatenate_data(
+            [piece.cell_data for piece in pieces], order, fill_missing
+        )
+    else:
+        cell_arrays["cells"] = concatenate_cell_arrays(
+            [piece.GetCells() for piece in pieces], point_offsets
+        )
+        celltypes = np.concatenate([piece.celltypes for piece in pieces])
+        cell_data = concatenate_data(
+            [piece.cell_data for piece in pieces],
+            [(i, 0, piece.n_cells) for i, piece in enumerate(pieces)],
+            fill_missing,
+        )
+
+    if merge_points:
+        # Interface points are written identically by every piece sharing them
+        # Kept in first occurrence order, the connectivity of a deforming
+        # sequence then doesn't change between frames
+        _, first_index, inverse = np.unique(
+            points, axis=0, return_index=True, return_inverse=True
+        )
+        order = np.argsort(first_index)
+        first_index = first_index[order]
+        inverse = np.argsort(order)[inverse.ravel()]
+        points = points[first_index]
+        point_data = {name: array[first_index] for name, array in point_data.items()}
+        cell_arrays = {
+            key: (offsets, inverse[connectivity])
+            for key, (offsets, connectivity) in cell_arrays.items()
+        }
+
+    cells = {key: padded_cells(*cell_array) for key, cell_array in cell_arrays.items()}
+    if isinstance(pieces[0], pv.PolyData):
+        vtk_data = pv.PolyData(points, **cells)
+    else:
+        vtk_data = pv.UnstructuredGrid(cells["cells"], celltypes, points)
+
+    for name, array in point_data.items():
+        vtk_data.point_data[name] = array
+    for name, array in cell_data.items():
+        vtk_data.cell_data[name] = array
+
+    return vtk_data
+
+
+def merge_blocks(vtk_data):
+    blocks = [
+        (block_id, block.cast_to_unstructured_grid())
+        for block_id, block in enumerate(vtk_data.recursive_iterator(skip_none=True))
+        if block.n_points > 0
+    ]
+    merged = concatenate_pieces([block for _, block in blocks], fill_missing=True)
+    if len(blocks) == 0:
+        return merged
+
+    block_ids = np.array([block_id for block_id, _ in blocks], dtype=float)
+    merged.point_data["block_id"] = np.repeat(
+        block_ids, [block.n_points for _, block in blocks]
+    )
+    merged.cell_data["block_id"] = np.repeat(
+        block_ids, [block.n_cells for _, block in blocks]
+    )
+    return merged
+
+
+def get_block_names(vtk_data, prefix=""):
+    names = []
+    for block_name in vtk_data.keys():
+        block = vtk_data[block_name]
+        if isinstance(block, pv.MultiBlock):
+            names += get_block_names(block, f"{prefix}{block_name}/")
+        elif block is not None:
+            names.append(f"{prefix}{block_name}")
+    return names
@@ -13,6 +13,7 @@ import pytest
 #   The tests that do not match any expression are run last
 ordered_list_of_tests = [
     "utilities",
+    "reader_read_vtk",
     "mesh_get_mesh_data_from_vtk",
     "mesh_vtk_to_mesh",
     "attributes_initialize_material_attributes",
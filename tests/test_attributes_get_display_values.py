@@ -0,0 +1,31 @@
+# Unit tests of attributes.get_display_values()
+
+import numpy as np
+
+import pytest
+
+from utilities import *
+
+
+m_attributes = import_submodule("attributes")
+
+
+class TestClass:
+
+    def test_scalars(self, pvUG_three_segments):
+        values = pvUG_three_segments.point_data["flt_scalars_point"]
+        result = m_attributes.get_display_values(values)
+        assert np.allclose(result, values)
+        
+
+    def test_magnitude(self, pvUG_three_segments):
+        values = pvUG_three_segments.point_data["flt_vectors_point"]
+        result = m_attributes.get_display_values(values, "Magnitude")
+        assert np.allclose(result, np.linalg.norm(values, axis=1))
+        
+
+    @pytest.mark.parametrize("component, index", [("X", 0), ("Y", 1), ("Z", 2)])
+    def test_component(self, pvUG_three_segments, component, index):
+        values = pvUG_three_segments.point_data["flt_vectors_point"]
+        result = m_attributes.get_display_values(values, component)
+        assert np.allclose(result, values[:, index])
@@ -121,4 +121,23 @@ class TestClass:
         mesh.attributes[t_name].data.foreach_get(property_name, np.ravel(b_values))
         assert b_values == pytest.approx(expected_values)
         
-    
\ No newline at end of file
+    
+
+class TestClassMissingValues:
+
+    def test_range_ignores_nan(self, pvUG_one_triangle):
+        # Attributes missing from some merged blocks are filled with NaN
+        mesh_name = unique_mesh_name()
+        mesh = m_mesh.vtk_to_mesh(pvUG_one_triangle, mesh_name)
+        mat = bpy.data.materials.new(name=f"{mesh_name}_attributes")
+        mat["attributes"] = {}
+
+        scalars = np.array([np.nan, 1.0, 3.0])
+        vectors = np.array([[np.nan] * 3, [1.0, 0.0, 0.0], [0.0, 4.0, 3.0]])
+        m_attributes.initialize_material_attributes("scalars", scalars, mesh, mat, "POINT")
+        m_attributes.initialize_material_attributes("vectors", vectors, mesh, mat, "POINT")
+
+        ranges = mat["attributes"]["scalars"]
+        assert (ranges["global_min"], ranges["global_max"]) == (1.0, 3.0)
+        ranges = mat["attributes"]["vectors"]["Magnitude"]
+        assert (ranges["global_min"], ranges["global_max"]) == (1.0, 5.0)
@@ -0,0 +1,45 @@
+# Unit tests of attributes.merge_attribute_ranges()
+
+from utilities import *
+
+
+m_attributes = import_submodule("attributes")
+
+
+def stats(minimum, maximum):
+    return {
+        "current_frame_min": minimum,
+        "current_frame_max": maximum,
+        "global_min": minimum,
+        "global_max": maximum,
+    }
+
+
+class TestClass:
+
+    def test_scalar(self):
+        ranges = {"pressure": stats(-1.0, 1.0)}
+        m_attributes.merge_attribute_ranges(ranges, {"pressure": stats(-5.0, 0.5)})
+        assert ranges["pressure"] == {
+            "current_frame_min": -1.0,
+            "current_frame_max": 1.0,
+            "global_min": -5.0,
+            "global_max": 1.0,
+        }
+        
+
+    def test_vector_components(self):
+        # Rebuilt vector attributes only get their magnitude range
+        ranges = {"velocity": {"Magnitude": stats(0.0, 1.0)}}
+        previous = {
+            "velocity": {
+                "Magnitude": stats(0.0, 3.0),
+                "X": stats(-2.0, 2.0),
+                "Y": stats(-1.0, 1.0),
+                "Z": stats(0.0, 0.0),
+            }
+        }
+        m_attributes.merge_attribute_ranges(ranges, previous)
+        assert ranges["velocity"]["Magnitude"]["global_max"] == 3.0
+        assert ranges["velocity"]["X"] == stats(-2.0, 2.0)
+        assert set(ranges["velocity"]) == {"Magnitude", "X", "Y", "Z"}
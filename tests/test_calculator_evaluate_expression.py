@@ -0,0 +1,111 @@
+# Unit tests of calculator.evaluate_expression()
+
+import numpy as np
+
+import pytest
+
+from utilities import *
+
+
+m_calculator = import_submodule("calculator")
+
+
+class TestClass_PointData:
+
+    def test_scalar_expression(self, pvUG_three_segments):
+        result = m_calculator.evaluate_expression(
+            "2 * flt_scalars_point + 1", pvUG_three_segments
+        )
+        assert np.allclose(result, [2.0, 22.0, 42.0])
+        
+
+    def test_magnitude(self, pvUG_three_segments):
+        result = m_calculator.evaluate_expression(
+            "mag(flt_vectors_point)", pvUG_three_segments
+        )
+        vectors = pvUG_three_segments.point_data["flt_vectors_point"]
+        assert np.allclose(result, np.linalg.norm(vectors, axis=1))
+        
+
+    def test_vector_result(self, pvUG_three_segments):
+        result = m_calculator.evaluate_expression("coords * 2", pvUG_three_segments)
+        assert np.allclose(result, 2 * pvUG_three_segments.points)
+        
+
+    def test_constant(self, pvUG_three_segments):
+        result = m_calculator.evaluate_expression("pi", pvUG_three_segments)
+        assert np.allclose(result, [np.pi] * 3)
+        
+
+class TestClass_CellData:
+
+    def test_von_mises(self, pvUG_three_segments):
+        # Uniaxial stress: von Mises equals the axial stress
+        tensors = np.zeros((3, 9))
+        tensors[:, 0] = [1.0, 2.0, 3.0]
+        pvUG_three_segments = pvUG_three_segments.copy()
+        pvUG_three_segments.cell_data["stress"] = tensors
+        result = m_calculator.evaluate_expression(
+            "von_mises(stress)", pvUG_three_segments, "CELL"
+        )
+        assert np.allclose(result, [1.0, 2.0, 3.0])
+        
+
+    def test_point_arrays_hidden(self, pvUG_three_segments):
+        with pytest.raises(NameError):
+            m_calculator.evaluate_expression(
+                "flt_scalars_point", pvUG_three_segments, "CELL"
+            )
+        
+
+class TestClass_Errors:
+
+    def test_no_builtins(self, pvUG_three_segments):
+        with pytest.raises(NameError):
+            m_calculator.evaluate_expression("open('file')", pvUG_three_segments)
+        
+
+    def test_wrong_size(self, pvUG_three_segments):
+        with pytest.raises(ValueError):
+            m_calculator.evaluate_expression(
+                "flt_scalars_point[:2]", pvUG_three_segments
+            )
+        
+
+    @pytest.mark.parametrize(
+        "expression",
+        [
+            "().__class__.__subclasses__()",
+            "flt_scalars_point.__class__",
+            "np.sqrt(flt_scalars_point)",
+            "[c for c in flt_scalars_point]",
+            "lambda: 0",
+        ],
+    )
+    def test_unsupported_syntax(self, pvUG_three_segments, expression):
+        with pytest.raises((ValueError, NameError)):
+            m_calculator.evaluate_expression(expression, pvUG_three_segments)
+        
+
+    @pytest.mark.parametrize(
+        "expression", ["9**9**9", "flt_scalars_point ** (9**9**9)", "-9 ** -(-999999)"]
+    )
+    def test_constant_power(self, pvUG_three_segments, expression):
+        with pytest.raises(ValueError):
+            m_calculator.evaluate_expression(expression, pvUG_three_segments)
+        
+
+    def test_power(self, pvUG_three_segments):
+        result = m_calculator.evaluate_expression(
+            "flt_scalars_point ** 2 + 2 ** flt_scalars_point ** -1", pvUG_three_segments
+        )
+        values = pvUG_three_segments.point_data["flt_scalars_point"]
+        assert np.allclose(result, values**2 + 2 ** (1 / values))
+        
+
+    def test_data_subscript(self, pvUG_three_segments):
+        result = m_calculator.evaluate_expression(
+            "(data['flt_scalars_point'] - min(flt_scalars_point)) / ptp(flt_scalars_point)",
+            pvUG_three_segments,
+        )
+        assert np.allclose(result, [0.0, 0.5, 1.0])
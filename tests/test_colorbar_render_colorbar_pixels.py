@@ -0,0 +1,40 @@
+# Unit tests of colorbar.render_colorbar_pixels()
+
+import numpy as np
+
+import pytest
+
+from utilities import *
+
+
+m_colorbar = import_submodule("colorbar")
+
+ARGS = ("viridis", 0.0, 1.0, "pressure", (1.0, 1.0, 1.0, 1.0), 1.0, ":.2f")
+
+
+class TestClass:
+
+    def test_size(self):
+        pixels = m_colorbar.render_colorbar_pixels(*ARGS)
+        assert pixels.shape == (4 * m_colorbar.CBAR_WIDTH * m_colorbar.CBAR_HEIGHT,)
+        assert pixels.min() >= 0.0 and pixels.max() <= 1.0
+        
+
+    def test_transparent_background(self):
+        pixels = m_colorbar.render_colorbar_pixels(*ARGS)
+        rgba = pixels.reshape(m_colorbar.CBAR_HEIGHT, m_colorbar.CBAR_WIDTH, 4)
+        assert rgba[0, -1, 3] == 0.0
+        
+
+    def test_gradient_bottom_to_top(self):
+        pixels = m_colorbar.render_colorbar_pixels(*ARGS)
+        rgba = pixels.reshape(m_colorbar.CBAR_HEIGHT, m_colorbar.CBAR_WIDTH, 4)
+        column = int(0.15 * m_colorbar.CBAR_WIDTH)
+        bottom = rgba[int(0.1 * m_colorbar.CBAR_HEIGHT), column, :3]
+        top = rgba[int(0.9 * m_colorbar.CBAR_HEIGHT), column, :3]
+        # viridis goes from dark purple to bright yellow
+        assert bottom.sum() < top.sum()
+        
+
+    def test_cached(self):
+        assert m_colorbar.render_colorbar_pixels(*ARGS) is m_colorbar.render_colorbar_pixels(*ARGS)
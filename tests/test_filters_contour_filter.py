@@ -0,0 +1,71 @@
+# Unit tests of filters.contour_filter()
+
+import numpy as np
+import pyvista as pv
+
+import pytest
+
+from utilities import *
+
+
+m_filters = import_submodule("filters")
+
+
+@pytest.fixture
+def pvID_linear_fields():
+    image = pv.ImageData(
+        dimensions=(6, 5, 4), spacing=(0.5, 1.0, 2.0), origin=(1.0, 2.0, 3.0)
+    )
+    image.point_data["distance"] = np.linalg.norm(image.points - image.center, axis=1)
+    image.point_data["linear"] = image.points @ [1.0, 2.0, 3.0]
+    image.point_data["vectors"] = 2.0 * image.points
+    image.cell_data["cell_id"] = np.arange(image.n_cells, dtype=float)
+    return image
+
+
+class TestClass_ImageData:
+
+    def test_iso_values(self, pvID_linear_fields):
+        params = {"scalars": "distance", "values": [2.0, 3.0]}
+        result = m_filters.contour_filter(pvID_linear_fields, params)
+        assert result.n_points > 0
+        on_first  = np.isclose(result["distance"], 2.0)
+        on_second = np.isclose(result["distance"], 3.0)
+        assert np.all(on_first | on_second)
+        assert np.any(on_first) and np.any(on_second)
+        
+
+    def test_interpolated_point_data(self, pvID_linear_fields):
+        params = {"scalars": "distance", "values": [2.0]}
+        result = m_filters.contour_filter(pvID_linear_fields, params)
+        # Trilinear interpolation is exact for linear fields
+        assert np.allclose(result["linear"],  result.points @ [1.0, 2.0, 3.0])
+        assert np.allclose(result["vectors"], 2.0 * result.points)
+        
+
+    def test_cell_data(self, pvID_linear_fields):
+        params = {"scalars": "distance", "values": [2.0]}
+        result = m_filters.contour_filter(pvID_linear_fields, params)
+        cell_ids = pvID_linear_fields.find_containing_cell(result.cell_centers().points)
+        assert np.array_equal(result["cell_id"], cell_ids)
+        
+
+class TestClass_UnstructuredGrid:
+
+    def test_same_surface(self, pvID_linear_fields):
+        params = {"scalars": "distance", "values": [2.0]}
+        image_result = m_filters.contour_filter(pvID_linear_fields, params)
+        grid = pvID_linear_fields.cast_to_unstructured_grid()
+        grid_result = m_filters.contour_filter(grid, params)
+        assert grid_result.n_points > 0
+        assert np.allclose(grid_result["linear"], grid_result.points @ [1.0, 2.0, 3.0])
+        assert np.allclose(grid_result.bounds, image_result.bounds)
+        
+
+    def test_missing_attribute(self, pvUG_one_triangle):
+        with pytest.warns(UserWarning):
+            result = m_filters.contour_filter(
+                pvUG_one_triangle, {"scalars": "missing", "values": [0.0]}
+            )
+        assert result.n_points == 0
+        
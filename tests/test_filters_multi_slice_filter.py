@@ -0,0 +1,57 @@
+# Unit tests of filters.multi_slice_filter()
+
+import numpy as np
+import pyvista as pv
+
+import pytest
+
+from utilities import *
+
+
+m_filters = import_submodule("filters")
+
+
+@pytest.fixture
+def pvUG_cube():
+    image = pv.ImageData(dimensions=(11, 6, 5), spacing=(0.1, 0.2, 0.25))
+    image.point_data["linear"] = image.points @ [1.0, 2.0, 3.0]
+    return image.cast_to_unstructured_grid()
+
+
+class TestClass:
+
+    def test_range(self, pvUG_cube):
+        params = {
+            "normal": [1.0, 0.0, 0.0],
+            "origin": [0.0, 0.0, 0.0],
+            "mode": "RANGE", "first": 0.15, "last": 0.85, "count": 8,
+        }
+        result = m_filters.multi_slice_filter(pvUG_cube, params)
+        offsets = np.linspace(0.15, 0.85, 8)
+        slice_id = result.point_data["slice_id"].astype(int)
+        assert np.array_equal(np.unique(slice_id), np.arange(8))
+        assert np.allclose(result.points[:, 0], offsets[slice_id])
+        
+
+    def test_list(self, pvUG_cube):
+        params = {
+            "normal": [0.0, 0.0, 2.0],
+            "origin": [0.0, 0.0, 0.5],
+            "mode": "LIST", "values": [-0.3, 0.1],
+        }
+        result = m_filters.multi_slice_filter(pvUG_cube, params)
+        assert np.allclose(np.unique(np.round(result.points[:, 2], 6)), [0.2, 0.6])
+        assert np.array_equal(np.unique(result.cell_data["slice_id"]), [0.0, 1.0])
+        
+
+    def test_interpolated_attributes(self, pvUG_cube):
+        params = {
+            "normal": [1.0, 1.0, 0.0],
+            "origin": [0.5, 0.5, 0.5],
+            "mode": "RANGE", "first": -0.2, "last": 0.2, "count": 3,
+        }
+        result = m_filters.multi_slice_filter(pvUG_cube, params)
+        assert np.allclose(result.point_data["linear"], result.points @ [1.0, 2.0, 3.0])
+        assert "_slice_distance" not in result.point_data
+        assert "_slice_distance" not in pvUG_cube.point_data
+        
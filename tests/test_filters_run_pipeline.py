@@ -0,0 +1,72 @@
+# Unit tests of filters.run_pipeline()
+
+import bpy
+
+import pytest
+
+from utilities import *
+
+
+m_filters = import_submodule("filters")
+
+
+@pytest.fixture
+def filtered_object(tmp_path, pvUG_one_triangle):
+    file_path = str(tmp_path / "one_triangle.vtu")
+    pvUG_one_triangle.save(file_path)
+    obj = bpy.data.objects.new(unique_mesh_name(), None)
+    obj["vtk_file_path"] = file_path
+    obj["vtk_filters"] = [
+        {"type": "counted", "name": "first"},
+        {"type": "counted", "name": "second"},
+    ]
+    yield obj
+    m_filters.clear_filter_cache(obj)
+    bpy.data.objects.remove(obj)
+
+
+@pytest.fixture
+def counted_filter(monkeypatch):
+    calls = []
+
+    def counted(vtk_data, params):
+        calls.append(params["name"])
+        return vtk_data.copy()
+
+    monkeypatch.setitem(m_filters.FILTERS, "counted", counted)
+    return calls
+
+
+class TestClass:
+
+    def test_all_stages_run(self, filtered_object, counted_filter):
+        vtk_data, key = m_filters.run_pipeline(filtered_object)
+        assert vtk_data.n_points == 3
+        assert counted_filter    == ["first", "second"]
+        
+
+    def test_cached_stages(self, filtered_object, counted_filter):
+        m_filters.run_pipeline(filtered_object)
+        m_filters.run_pipeline(filtered_object)
+        assert counted_filter == ["first", "second"]
+        
+
+    def test_downstream_stage_only(self, filtered_object, counted_filter):
+        m_filters.run_pipeline(filtered_object)
+        m_filters.set_pipeline_stage(
+            filtered_object, {"type": "counted", "name": "third"}, 1
+        )
+        m_filters.run_pipeline(filtered_object)
+        assert counted_filter == ["first", "second", "third"]
+        
+
+    def test_legacy_layout(self):
+        obj = bpy.data.objects.new(unique_mesh_name(), None)
+        obj["vtk_filters"] = {
+            "clip": {"normal": [1.0, 0.0, 0.0], "origin": [0.0, 0.0, 0.0], "invert": False}
+        }
+        stages = m_filters.get_pipeline(obj)
+        bpy.data.objects.remove(obj)
+        assert len(stages)        == 1
+        assert stages[0]["type"]  == "clip"
+        
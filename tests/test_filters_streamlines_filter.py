@@ -0,0 +1,96 @@
+# Unit tests of filters.streamlines_filter()
+
+import numpy as np
+import pyvista as pv
+
+import pytest
+
+from utilities import *
+
+
+m_filters = import_submodule("filters")
+
+
+# Rotation around the axis (9.5, 9.5, z), streamlines are circles
+@pytest.fixture
+def pvID_rotation():
+    image = pv.ImageData(dimensions=(20, 20, 5))
+    relative = image.points - [9.5, 9.5, 0.0]
+    image.point_data["rotation"] = np.column_stack(
+        (-relative[:, 1], relative[:, 0], np.zeros(image.n_points))
+    )
+    image.point_data["x"] = image.points[:, 0]
+    return image
+
+
+@pytest.fixture
+def params():
+    return {
+        "vectors": "rotation",
+        "seed_type": "LINE",
+        "point_a": [12.5, 9.5, 2.0],
+        "point_b": [15.5, 9.5, 2.0],
+        "resolution": 3,
+        "direction": "FORWARD",
+        "step_length": 0.5,
+        "max_steps": 2000,
+        "tubes": False,
+        "radius": 0.0,
+    }
+
+
+class TestClass_ImageData:
+
+    def test_circles(self, pvID_rotation, params):
+        result = m_filters.streamlines_filter(pvID_rotation, params)
+        radius = np.linalg.norm(result.points[:, :2] - 9.5, axis=1)
+        assert set(np.round(radius, 3)) == {3.0, 4.0, 5.0, 6.0}
+        assert np.allclose(result.point_data["x"], result.points[:, 0])
+        
+
+    def test_segments(self, pvID_rotation, params):
+        result = m_filters.streamlines_filter(pvID_rotation, params)
+        assert isinstance(result, pv.UnstructuredGrid)
+        assert np.all(result.celltypes == pv.CellType.LINE)
+        
+
+    def test_tubes(self, pvID_rotation, params):
+        params["tubes"] = True
+        result = m_filters.streamlines_filter(pvID_rotation, params)
+        assert result.n_cells > 0
+        assert result.is_all_triangles
+        
+
+class TestClass_UnstructuredGrid:
+
+    def test_circles(self, pvID_rotation, params):
+        grid = pvID_rotation.cast_to_unstructured_grid()
+        result = m_filters.streamlines_filter(grid, params)
+        radius = np.linalg.norm(result.points[:, :2] - 9.5, axis=1)
+        assert set(np.round(radius, 1)) == {3.0, 4.0, 5.0, 6.0}
+        assert np.allclose(result.point_data["x"], result.points[:, 0])
+        
+
+    def test_same_result_next_frame(self, pvID_rotation, params):
+        # Second frame of the same geometry traced with the cached dataset
+        grid = pvID_rotation.cast_to_unstructured_grid()
+        first = m_filters.streamlines_filter(grid, params)
+        grid = grid.copy()
+        grid.point_data["rotation"] = 2.0 * grid.point_data["rotation"]
+        second = m_filters.streamlines_filter(grid, params)
+        assert np.allclose(second.points, first.points, atol=1e-3)
+        assert np.allclose(
+            second.point_data["rotation"], 2.0 * first.point_data["rotation"], atol=1e-2
+        )
+        
+
+class TestClass_PolylinesToSegments:
+
+    def test_two_lines(self):
+        points = np.zeros((5, 3))
+        polydata = pv.PolyData(points, lines=[3, 0, 1, 2, 2, 3, 4])
+        polydata.cell_data["line_id"] = [0.0, 1.0]
+        result = m_filters.polylines_to_segments(polydata)
+        assert np.array_equal(result.cells, [2, 0, 1, 2, 1, 2, 2, 3, 4])
+        assert np.array_equal(result.cell_data["line_id"], [0.0, 0.0, 1.0])
+        
@@ -0,0 +1,85 @@
+# Unit tests of filters.threshold_filter() and filters.threshold_mask()
+
+import numpy as np
+import pyvista as pv
+
+import pytest
+
+from utilities import *
+
+
+m_filters = import_submodule("filters")
+
+
+def threshold(vtk_data, scalars, lower, upper, method="ALL", invert=False):
+    params = {
+        "scalars": scalars,
+        "lower": lower,
+        "upper": upper,
+        "method": method,
+        "invert": invert,
+    }
+    return m_filters.threshold_filter(vtk_data, params)
+
+
+# Point values of the segments: [0.5, 10.5], [10.5, 20.5], [20.5, 0.5]
+class TestClass_PointData:
+
+    def test_all(self, pvUG_three_segments):
+        result = threshold(pvUG_three_segments, "flt_scalars_point", 0.0, 15.0, "ALL")
+        assert np.array_equal(result.cell_data["int_scalars_cell"], [-1])
+        
+
+    def test_any(self, pvUG_three_segments):
+        result = threshold(pvUG_three_segments, "flt_scalars_point", 0.0, 15.0, "ANY")
+        assert result.n_cells == 3
+        
+
+    def test_centroid(self, pvUG_three_segments):
+        result = threshold(
+            pvUG_three_segments, "flt_scalars_point", 0.0, 15.0, "CENTROID"
+        )
+        assert np.array_equal(result.cell_data["int_scalars_cell"], [-1, -21])
+        
+
+    def test_vector_magnitude(self, pvUG_three_segments):
+        # Point magnitudes: 3.0, 19.9, 37.5
+        result = threshold(pvUG_three_segments, "flt_vectors_point", 0.0, 20.0, "ALL")
+        assert np.array_equal(result.cell_data["int_scalars_cell"], [-1])
+        
+
+# Cell values of the segments: -0.5, -10.5, -20.5
+class TestClass_CellData:
+
+    def test_range(self, pvUG_three_segments):
+        result = threshold(pvUG_three_segments, "flt_scalars_cell", -25.0, -5.0)
+        assert np.array_equal(result.cell_data["int_scalars_cell"], [-11, -21])
+        
+
+    def test_invert(self, pvUG_three_segments):
+        result = threshold(
+            pvUG_three_segments, "flt_scalars_cell", -25.0, -5.0, invert=True
+        )
+        assert np.array_equal(result.cell_data["int_scalars_cell"], [-1])
+        
+
+    def test_missing_attribute(self, pvUG_three_segments):
+        with pytest.warns(UserWarning):
+            result = threshold(pvUG_three_segments, "missing", 0.0, 1.0)
+        assert result.n_cells == 3
+        
+
+
+class TestClass_threshold_mask:
+
+    @pytest.mark.parametrize("method", ["ANY", "CENTROID"])
+    def test_trailing_empty_cells(self, method):
+        # Triangle followed by two empty cells, only its last point is in range
+        points = np.eye(3)
+        cells = [3, 0, 1, 2, 0, 0]
+        celltypes = [pv.CellType.TRIANGLE, pv.CellType.EMPTY_CELL, pv.CellType.EMPTY_CELL]
+        grid = pv.UnstructuredGrid(cells, celltypes, points)
+        grid.point_data["values"] = [0.0, 0.0, 3.0]
+        params = {"scalars": "values", "lower": 0.5, "upper": 3.0, "method": method}
+        mask = m_filters.threshold_mask(grid, params)
+        assert np.array_equal(mask, [True, False, False])
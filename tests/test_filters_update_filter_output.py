@@ -0,0 +1,68 @@
+# Unit tests of view3d_panel.filters_panel.update_filter_output()
+#   Playback must not leak mesh datablocks: the output mesh is updated in place
+
+import bpy
+
+import numpy as np
+import pyvista as pv
+
+import pytest
+
+from utilities import *
+
+
+m_filters       = import_submodule("filters")
+m_filters_panel = import_submodule("view3d_panel.filters_panel")
+
+
+@pytest.fixture
+def clipped_object():
+    obj = bpy.data.objects.new(unique_mesh_name(), None)
+    obj["vtk_filters"] = [
+        {"type": "clip", "normal": [1.0, 0.0, 0.0], "origin": [0.0, 0.0, 0.0], "invert": False}
+    ]
+    yield obj
+    m_filters_panel.remove_filter_output(obj)
+    m_filters.clear_filter_cache(obj)
+    bpy.data.objects.remove(obj)
+
+
+def set_frame(obj, directory, frame):
+    # Same topology, moving points and changing values
+    dataset = pv.Sphere().cast_to_unstructured_grid()
+    dataset.points = dataset.points + [0.0, 0.0, 0.1 * frame]
+    dataset.point_data["pressure"] = dataset.points[:, 2]
+    file_path = str(directory / f"frame-{frame}.vtu")
+    dataset.save(file_path)
+    obj["vtk_file_path"] = file_path
+
+
+class TestClass:
+
+    def test_playback_memory(self, tmp_path, clipped_object):
+        set_frame(clipped_object, tmp_path, 0)
+        m_filters_panel.update_filter_output(bpy.context, clipped_object)
+        output = m_filters_panel.get_filter_output(clipped_object)
+        mesh = output.data
+        n_meshes = len(bpy.data.meshes)
+
+        for frame in range(1, 20):
+            set_frame(clipped_object, tmp_path, frame)
+            m_filters_panel.update_filter_output(bpy.context, clipped_object)
+
+        assert len(bpy.data.meshes) == n_meshes
+        assert output.data          == mesh
+        assert mesh.users           == 1
+        
+
+    def test_updated_positions(self, tmp_path, clipped_object):
+        set_frame(clipped_object, tmp_path, 0)
+        m_filters_panel.update_filter_output(bpy.context, clipped_object)
+        set_frame(clipped_object, tmp_path, 5)
+        m_filters_panel.update_filter_output(bpy.context, clipped_object)
+
+        mesh = m_filters_panel.get_filter_output(clipped_object).data
+        positions = np.zeros(3 * len(mesh.vertices))
+        mesh.attributes["position"].data.foreach_get("vector", positions)
+        assert positions.reshape(-1, 3)[:, 2].max() == pytest.approx(0.5 + 0.5, abs=1e-3)
+        
@@ -0,0 +1,77 @@
+# Unit tests of instancing.rigid_transform() and instancing.topology_fingerprint()
+
+import numpy as np
+import pyvista as pv
+
+import pytest
+
+from utilities import *
+
+
+m_instancing = import_submodule("instancing")
+
+
+class TestClass_rigid_transform:
+
+    def test_rotation_translation(self):
+        points = np.asarray(pv.Sphere().points, dtype=float)
+        angle = 0.7
+        rotation = np.asarray(
+            [[np.cos(angle), -np.sin(angle), 0.0],
+             [np.sin(angle),  np.cos(angle), 0.0],
+             [0.0,            0.0,           1.0]]
+        )
+        moved = points @ rotation.T + [1.0, 2.0, 3.0]
+        transform = m_instancing.rigid_transform(points, moved)
+        assert transform is not None
+        assert transform[:3, :3] == pytest.approx(rotation)
+        assert transform[:3, 3]  == pytest.approx([1.0, 2.0, 3.0])
+        
+
+    def test_float32_offset_part(self):
+        # Float32 VTK points of a part placed far from the origin
+        points = np.asarray(pv.Sphere().points, dtype=float) + [1000.0, 2000.0, 3000.0]
+        angle = 0.7
+        rotation = np.asarray(
+            [[np.cos(angle), -np.sin(angle), 0.0],
+             [np.sin(angle),  np.cos(angle), 0.0],
+             [0.0,            0.0,           1.0]]
+        )
+        moved = (points @ rotation.T + [500.0, -800.0, 250.0]).astype(np.float32)
+        transform = m_instancing.rigid_transform(points.astype(np.float32), moved)
+        assert transform is not None
+        assert transform[:3, :3] == pytest.approx(rotation, abs=1e-4)
+        assert m_instancing.rigid_transform(
+            points.astype(np.float32), (1.1 * points).astype(np.float32)
+        ) is None
+        
+
+    def test_scaling(self):
+        points = np.asarray(pv.Sphere().points, dtype=float)
+        assert m_instancing.rigid_transform(points, 2.0 * points) is None
+        
+
+    def test_reflection(self):
+        points = np.asarray(pv.Sphere().points, dtype=float)
+        assert m_instancing.rigid_transform(points, -points + 0.1) is None
+        
+
+class TestClass_topology_fingerprint:
+
+    def test_moved_copy(self, pvUG_one_triangle):
+        moved = pvUG_one_triangle.copy()
+        moved.points = moved.points + 1.0
+        assert (
+            m_instancing.topology_fingerprint(pvUG_one_triangle)
+            == m_instancing.topology_fingerprint(moved)
+        )
+        
+
+    def test_different_attribute(self, pvUG_one_triangle):
+        other = pvUG_one_triangle.copy()
+        other.point_data["flt_scalars_point"] = -other.point_data["flt_scalars_point"]
+        assert (
+            m_instancing.topology_fingerprint(pvUG_one_triangle)
+            != m_instancing.topology_fingerprint(other)
+        )
+        
@@ -0,0 +1,53 @@
+# Unit tests of lod.cluster_vertices()
+
+import numpy as np
+import pyvista as pv
+
+import pytest
+
+from utilities import *
+
+
+m_lod = import_submodule("lod")
+
+
+@pytest.fixture
+def sphere():
+    sphere = pv.Sphere(theta_resolution=60, phi_resolution=60)
+    sphere.point_data["height"] = sphere.points[:, 2]
+    sphere.cell_data["cell_id"] = np.arange(sphere.n_cells, dtype=float)
+    return sphere
+
+
+class TestClass:
+
+    def test_decimated(self, sphere):
+        proxy = m_lod.cluster_vertices(sphere, 8)
+        assert 0 < proxy.n_points < sphere.n_points
+        assert 0 < proxy.n_cells < sphere.n_cells
+        assert proxy.is_all_triangles
+        
+
+    def test_bounds(self, sphere):
+        proxy = m_lod.cluster_vertices(sphere, 8)
+        assert np.all(np.abs(proxy.points) <= 0.5 + 1e-6)
+        
+
+    def test_point_data_averaged(self, sphere):
+        proxy = m_lod.cluster_vertices(sphere, 8)
+        assert np.allclose(proxy.point_data["height"], proxy.points[:, 2])
+        
+
+    def test_cell_data_kept(self, sphere):
+        proxy = m_lod.cluster_vertices(sphere, 8)
+        assert proxy.cell_data["cell_id"].shape == (proxy.n_cells,)
+        assert np.all(np.isin(proxy.cell_data["cell_id"], sphere.cell_data["cell_id"]))
+        
+
+    def test_unstructured_grid(self, pvUG_one_triangle):
+        proxy = m_lod.cluster_vertices(pvUG_one_triangle, 100)
+        assert proxy.n_cells == 1
+        
+
+    def test_lines_not_decimated(self, pvUG_three_segments):
+        assert m_lod.cluster_vertices(pvUG_three_segments, 2) is None
@@ -0,0 +1,43 @@
+# Unit tests of material_panel.get_attribute_range()
+
+import pytest
+
+from utilities import *
+
+
+m_material_panel = import_submodule("material_panel")
+
+
+STATS = {"current_frame_min": -1.0, "current_frame_max": 1.0,
+         "global_min": -2.0, "global_max": 3.0}
+MATERIAL = {
+    "attributes": {
+        "scalars": STATS,
+        "vectors": {"Magnitude": {k: abs(v) for k, v in STATS.items()}, "X": STATS},
+    }
+}
+
+
+class TestClass:
+
+    @pytest.mark.parametrize("frame_range, expected",
+                             [("global", (-2.0, 3.0)), ("current_frame", (-1.0, 1.0))])
+    def test_scalars(self, frame_range, expected):
+        result = m_material_panel.get_attribute_range(
+            MATERIAL, "scalars", "Magnitude", frame_range
+        )
+        assert result == expected
+        
+
+    def test_vector_component(self):
+        result = m_material_panel.get_attribute_range(
+            MATERIAL, "vectors", "Magnitude", "global"
+        )
+        assert result == (2.0, 3.0)
+        result = m_material_panel.get_attribute_range(MATERIAL, "vectors", "X", "global")
+        assert result == (-2.0, 3.0)
+        
+
+    def test_linked_range(self):
+        result = m_material_panel.get_linked_range([(0.0, 1.0), (-2.0, 0.5), (1.0, 4.0)])
+        assert result == (-2.0, 4.0)
@@ -0,0 +1,40 @@
+# Unit tests of mesh.get_radius_array_name()
+
+import numpy as np
+import pyvista as pv
+
+import pytest
+
+from utilities import *
+
+
+m_mesh = import_submodule("mesh")
+
+
+@pytest.fixture
+def points():
+    return pv.PolyData(np.random.default_rng(0).random((10, 3)))
+
+
+class TestClass:
+
+    @pytest.mark.parametrize("name", ["radius", "rad"])
+    def test_radius_name(self, points, name):
+        points.point_data[name] = np.full(points.n_points, 0.1)
+        assert m_mesh.get_radius_array_name(points) == name
+        
+
+    def test_radius_preferred(self, points):
+        points.point_data["rad"] = np.full(points.n_points, 0.1)
+        points.point_data["radius"] = np.full(points.n_points, 0.2)
+        assert m_mesh.get_radius_array_name(points) == "radius"
+        
+
+    def test_no_radius(self, points):
+        points.point_data["velocity"] = np.ones((points.n_points, 3))
+        assert m_mesh.get_radius_array_name(points) is None
+        
+
+    def test_vector_radius_ignored(self, points):
+        points.point_data["radius"] = np.ones((points.n_points, 3))
+        assert m_mesh.get_radius_array_name(points) is None
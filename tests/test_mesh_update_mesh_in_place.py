@@ -0,0 +1,41 @@
+# Unit tests of mesh.update_mesh_in_place()
+
+import bpy
+
+import numpy as np
+import pyvista as pv
+
+import pytest
+
+from utilities import *
+
+
+m_mesh = import_submodule("mesh")
+
+
+def sphere(resolution, scale):
+    dataset = pv.Sphere(theta_resolution=resolution).cast_to_unstructured_grid()
+    dataset.point_data["pressure"] = scale * dataset.points[:, 2]
+    dataset.point_data["velocity"] = scale * dataset.points
+    return dataset
+
+
+class TestClass:
+
+    def test_topology_change_keeps_ranges(self):
+        first = sphere(30, 10.0)
+        obj = m_mesh.create_object(bpy.context, first, unique_mesh_name())
+        mesh = obj.data
+
+        m_mesh.update_mesh_in_place(mesh, sphere(12, 1.0))
+        ranges = mesh.materials[0]["attributes"]
+
+        pressure = first.point_data["pressure"]
+        assert ranges["pressure"]["global_min"] == pytest.approx(pressure.min())
+        assert ranges["pressure"]["global_max"] == pytest.approx(pressure.max())
+        assert ranges["pressure"]["current_frame_max"] < pressure.max()
+        for component in ("Magnitude", "X", "Y", "Z"):
+            assert component in ranges["velocity"]
+        assert ranges["velocity"]["Magnitude"]["global_max"] == pytest.approx(
+            np.linalg.norm(first.point_data["velocity"], axis=1).max(), rel=1e-5
+        )
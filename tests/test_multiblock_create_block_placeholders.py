@@ -0,0 +1,38 @@
+# Unit tests of multiblock.create_block_placeholders()
+
+import bpy
+
+import pyvista as pv
+
+from utilities import *
+
+
+m_multiblock = import_submodule("multiblock")
+
+
+class TestClass:
+
+    def test_no_mesh_created(self, pvUG_one_triangle, pvUG_three_segments):
+        vtk_data = pv.MultiBlock(
+            {"triangle": pvUG_one_triangle, "segments": pvUG_three_segments}
+        )
+        n_meshes = len(bpy.data.meshes)
+        root = m_multiblock.create_block_placeholders(
+            bpy.context, vtk_data, unique_mesh_name(), "blocks.vtm"
+        )
+        assert len(bpy.data.meshes)   == n_meshes
+        assert root.type              == "EMPTY"
+        assert len(root.children)     == 2
+        assert all("vtk_block_placeholder" in child for child in root.children)
+        
+
+    def test_bounding_box(self, pvUG_one_triangle):
+        vtk_data = pv.MultiBlock({"triangle": pvUG_one_triangle})
+        root = m_multiblock.create_block_placeholders(
+            bpy.context, vtk_data, unique_mesh_name(), "blocks.vtm"
+        )
+        placeholder = root.children[0]
+        assert list(placeholder.location)         == [0.5, 0.5, 0.0]
+        assert list(placeholder.scale)[:2]        == [0.5, 0.5]
+        assert list(placeholder["vtk_block_path"]) == ["triangle"]
+        
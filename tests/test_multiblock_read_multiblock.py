@@ -0,0 +1,42 @@
+# Unit tests of multiblock.read_multiblock()
+
+import pytest
+
+from utilities import *
+
+
+m_multiblock = import_submodule("multiblock")
+
+
+@pytest.fixture
+def read_settings(monkeypatch):
+    reads = []
+    settings = [({}, False)]
+
+    def read_frame(file_path):
+        reads.append((file_path, settings[0]))
+        return file_path
+
+    monkeypatch.setattr(m_multiblock, "read_frame", read_frame)
+    monkeypatch.setattr(m_multiblock, "get_read_settings", lambda: settings[0])
+    yield reads, settings
+    m_multiblock._multiblock_cache.clear()
+
+
+class TestClass:
+
+    def test_same_settings(self, read_settings):
+        reads, _ = read_settings
+        m_multiblock.read_multiblock("blocks.vtm")
+        m_multiblock.read_multiblock("blocks.vtm")
+        assert len(reads) == 1
+        
+
+    def test_changed_settings(self, read_settings):
+        reads, settings = read_settings
+        m_multiblock.read_multiblock("blocks.vtm")
+        settings[0] = ({"point": ["pressure"]}, False)
+        m_multiblock.read_multiblock("blocks.vtm")
+        settings[0] = ({"point": ["pressure"]}, True)
+        m_multiblock.read_multiblock("blocks.vtm")
+        assert len(reads) == 3
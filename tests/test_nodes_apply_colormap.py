@@ -0,0 +1,31 @@
+# Unit tests of nodes.apply_colormap()
+
+import numpy as np
+
+import pytest
+
+from utilities import *
+
+
+m_nodes = import_submodule("nodes")
+
+
+class TestClass:
+
+    def test_range_ends(self):
+        lut = m_nodes.get_colormap_lut("viridis", 256)
+        colors = m_nodes.apply_colormap([0.0, 10.0], 0.0, 10.0, lut)
+        assert np.allclose(colors, lut[[0, -1]])
+        
+
+    def test_clamped(self, pvUG_three_segments):
+        lut = m_nodes.get_colormap_lut("viridis", 256)
+        values = pvUG_three_segments.point_data["flt_scalars_point"]
+        colors = m_nodes.apply_colormap(values, 5.0, 15.0, lut)
+        assert np.allclose(colors, lut[[0, 140, -1]])
+        
+
+    def test_constant_range(self):
+        lut = m_nodes.get_colormap_lut("viridis", 256)
+        colors = m_nodes.apply_colormap([1.0, 2.0], 1.0, 1.0, lut)
+        assert np.allclose(colors, lut[[0, 0]])
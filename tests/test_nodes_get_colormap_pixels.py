@@ -0,0 +1,47 @@
+# Unit tests of nodes.get_colormap_pixels()
+
+import matplotlib.pyplot as plt
+import numpy as np
+
+import pytest
+
+from utilities import *
+
+
+m_nodes = import_submodule("nodes")
+
+
+class TestClass_ColormapPixels:
+
+    def test_size(self):
+        pixels = m_nodes.get_colormap_pixels("viridis", 256)
+        assert pixels.shape == (4 * 256,)
+        assert pixels.dtype == np.float32
+        
+
+    def test_end_colors(self):
+        rgba = m_nodes.get_colormap_pixels("viridis", 256).reshape(-1, 4)
+        cmap = plt.get_cmap("viridis")
+        assert np.allclose(rgba[0, :3], m_nodes.srgb_to_linear(cmap(0.0)[:3]))
+        assert np.allclose(rgba[-1, :3], m_nodes.srgb_to_linear(cmap(1.0)[:3]))
+        assert np.allclose(rgba[:, 3], 1.0)
+        
+
+    def test_reversed(self):
+        rgba = m_nodes.get_colormap_pixels("viridis", 64).reshape(-1, 4)
+        reversed_rgba = m_nodes.get_colormap_pixels("viridis_r", 64).reshape(-1, 4)
+        assert np.allclose(rgba, reversed_rgba[::-1])
+
+
+class TestClass_SRGBToLinear:
+
+    def test_end_points(self):
+        assert np.allclose(m_nodes.srgb_to_linear([0.0, 1.0]), [0.0, 1.0])
+        
+
+    def test_linear_segment(self):
+        assert np.isclose(m_nodes.srgb_to_linear(0.04), 0.04 / 12.92)
+        
+
+    def test_mid_gray(self):
+        assert np.isclose(m_nodes.srgb_to_linear(0.5), 0.2140, atol=1e-4)
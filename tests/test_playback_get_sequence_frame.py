@@ -0,0 +1,63 @@
+# Unit tests of playback.get_sequence_frame() and playback.get_prefetch_frames()
+
+import pytest
+
+from utilities import *
+
+
+m_playback = import_submodule("playback")
+
+
+class TestClass_SequenceFrame:
+
+    @pytest.mark.parametrize("frame, expected", [(0, 0), (3, 3), (9, 9)])
+    def test_every_frame(self, frame, expected):
+        assert m_playback.get_sequence_frame(frame, 10) == expected
+        
+
+    @pytest.mark.parametrize("frame, expected", [(-2, 0), (10, 9), (50, 9)])
+    def test_clamped(self, frame, expected):
+        assert m_playback.get_sequence_frame(frame, 10) == expected
+        
+
+    @pytest.mark.parametrize("frame, expected", [(0, 0), (3, 0), (4, 4), (7, 4), (9, 8)])
+    def test_stride_holds_frames(self, frame, expected):
+        assert m_playback.get_sequence_frame(frame, 10, 4) == expected
+
+
+class TestClass_PrefetchFrames:
+
+    def test_next_frames(self):
+        assert m_playback.get_prefetch_frames(2, 10, 1, 3) == [3, 4, 5]
+        
+
+    def test_stride(self):
+        assert m_playback.get_prefetch_frames(0, 10, 4, 3) == [4, 8]
+        
+
+    def test_disabled(self):
+        assert m_playback.get_prefetch_frames(0, 10, 1, 0) == []
+
+
+class TestClass_FilePosition:
+
+    @pytest.mark.parametrize("frame, expected", [(0, 0), (4, 0), (5, 1), (12, 2)])
+    def test_frames_per_file(self, frame, expected):
+        assert m_playback.get_sequence_frame(frame, 10, 1, 5) == expected
+        
+
+    def test_interpolation_weight(self):
+        assert m_playback.get_file_position(7, 10, 1, 5) == (1, 2, pytest.approx(0.4))
+        
+
+    def test_interpolation_stride(self):
+        assert m_playback.get_file_position(6, 10, 4, 1) == (4, 8, pytest.approx(0.5))
+        
+
+    def test_last_file(self):
+        assert m_playback.get_file_position(100, 10, 1, 5) == (9, 9, 0.0)
+        
+
+    def test_towards_last_file(self):
+        # 4 files per stride but only one left after the 8th
+        assert m_playback.get_file_position(20, 10, 4, 2) == (8, 9, 1.0)
@@ -0,0 +1,55 @@
+# Unit tests of playback.interpolate_datasets()
+
+import numpy as np
+import pyvista as pv
+
+import pytest
+
+from utilities import *
+
+
+m_playback = import_submodule("playback")
+
+
+@pytest.fixture
+def next_segments(pvUG_three_segments):
+    next_segments = pvUG_three_segments.copy()
+    next_segments.points = pvUG_three_segments.points + 1.0
+    for data in (next_segments.point_data, next_segments.cell_data):
+        for name in data.keys():
+            data[name] = 2 * np.asarray(data[name])
+    return next_segments
+
+
+class TestClass:
+
+    def test_points(self, pvUG_three_segments, next_segments):
+        result = m_playback.interpolate_datasets(pvUG_three_segments, next_segments, 0.25)
+        assert np.allclose(result.points, pvUG_three_segments.points + 0.25)
+        
+
+    def test_float_arrays(self, pvUG_three_segments, next_segments):
+        result = m_playback.interpolate_datasets(pvUG_three_segments, next_segments, 0.5)
+        values = pvUG_three_segments.point_data["flt_scalars_point"]
+        assert np.allclose(result.point_data["flt_scalars_point"], 1.5 * values)
+        values = pvUG_three_segments.cell_data["flt_vectors_cell"]
+        assert np.allclose(result.cell_data["flt_vectors_cell"], 1.5 * values)
+        
+
+    @pytest.mark.parametrize("alpha, factor", [(0.25, 1), (0.75, 2)])
+    def test_integer_arrays_nearest(self, pvUG_three_segments, next_segments, alpha, factor):
+        result = m_playback.interpolate_datasets(pvUG_three_segments, next_segments, alpha)
+        values = pvUG_three_segments.point_data["int_scalars_point"]
+        assert np.array_equal(result.point_data["int_scalars_point"], factor * values)
+        
+
+    def test_inputs_unchanged(self, pvUG_three_segments, next_segments):
+        points = np.array(pvUG_three_segments.points)
+        values = np.array(pvUG_three_segments.point_data["flt_scalars_point"])
+        m_playback.interpolate_datasets(pvUG_three_segments, next_segments, 0.5)
+        assert np.array_equal(pvUG_three_segments.points, points)
+        assert np.array_equal(pvUG_three_segments.point_data["flt_scalars_point"], values)
+        
+
+    def test_topology_changed(self, pvUG_three_segments, pvUG_one_triangle):
+        assert m_playback.interpolate_datasets(pvUG_three_segments, pvUG_one_triangle, 0.5) is None
@@ -0,0 +1,40 @@
+# Unit tests of reader.read_keyframe()
+
+import pytest
+
+from utilities import *
+
+
+m_reader = import_submodule("reader")
+
+
+@pytest.fixture
+def counted_reads(monkeypatch):
+    reads = []
+
+    def read_frame(file_path):
+        reads.append(file_path)
+        return file_path
+
+    monkeypatch.setattr(m_reader, "read_frame", read_frame)
+    monkeypatch.setattr(m_reader, "get_read_settings", lambda: ({}, False))
+    yield reads
+    m_reader.clear_prefetched_frames()
+
+
+class TestClass:
+
+    def test_sequences_keep_their_keyframes(self, counted_reads):
+        # Three interpolated sequences, each blending its two neighbouring files
+        for _ in range(3):
+            for sequence in ("a", "b", "c"):
+                m_reader.read_keyframe(f"{sequence}_0.vtu", sequence)
+                m_reader.read_keyframe(f"{sequence}_1.vtu", sequence)
+        assert len(counted_reads) == 6
+        
+
+    def test_next_keyframes(self, counted_reads):
+        for index in range(3):
+            m_reader.read_keyframe(f"a_{index}.vtu", "a")
+            m_reader.read_keyframe(f"a_{index + 1}.vtu", "a")
+        assert counted_reads == ["a_0.vtu", "a_1.vtu", "a_2.vtu", "a_3.vtu"]
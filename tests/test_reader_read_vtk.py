@@ -0,0 +1,115 @@
+# Unit tests of reader.read_vtk()
+
+import numpy as np
+import pyvista as pv
+
+from utilities import *
+
+
+m_reader = import_submodule("reader")
+
+
+class TestClass_array_selection:
+
+    def test_no_selection(self, tmp_path, pvUG_one_triangle):
+        file_path = str(tmp_path / "one_triangle.vtu")
+        pvUG_one_triangle.save(file_path)
+        vtk_data = m_reader.read_vtk(file_path)
+        assert set(vtk_data.point_data.keys()) == set(pvUG_one_triangle.point_data.keys())
+        assert set(vtk_data.cell_data.keys())  == set(pvUG_one_triangle.cell_data.keys())
+        
+
+    def test_xml_selection(self, tmp_path, pvUG_one_triangle):
+        file_path = str(tmp_path / "one_triangle.vtu")
+        pvUG_one_triangle.save(file_path)
+        selection = {"point": ["flt_scalars_point"], "cell": []}
+        vtk_data = m_reader.read_vtk(file_path, selection)
+        assert list(vtk_data.point_data.keys()) == ["flt_scalars_point"]
+        assert len(vtk_data.cell_data.keys())   == 0
+        
+
+    def test_legacy_selection(self, tmp_path, pvUG_one_triangle):
+        file_path = str(tmp_path / "one_triangle.vtk")
+        pvUG_one_triangle.save(file_path)
+        selection = {"point": [], "cell": ["flt_scalars_cell"]}
+        vtk_data = m_reader.read_vtk(file_path, selection)
+        assert len(vtk_data.point_data.keys())  == 0
+        assert list(vtk_data.cell_data.keys())  == ["flt_scalars_cell"]
+        
+
+    def test_array_names(self, tmp_path, pvUG_one_triangle):
+        file_path = str(tmp_path / "one_triangle.vtu")
+        pvUG_one_triangle.save(file_path)
+        point_arrays, cell_arrays = m_reader.get_array_names(file_path)
+        assert "flt_scalars_point" in point_arrays
+        assert "flt_scalars_cell"  in cell_arrays
+        
+
+class TestClass_concatenate_pieces:
+
+    def test_two_triangles(self, pvUG_one_triangle):
+        vtk_data = m_reader.concatenate_pieces([pvUG_one_triangle] * 2)
+        assert vtk_data.n_points == 6
+        assert vtk_data.n_cells  == 2
+        assert list(vtk_data.cells) == [3, 0, 1, 2, 3, 3, 4, 5]
+        assert len(vtk_data.point_data["flt_scalars_point"]) == 6
+        
+
+    def test_merge_points(self, pvUG_one_triangle):
+        vtk_data = m_reader.concatenate_pieces(
+            [pvUG_one_triangle] * 2, merge_points=True
+        )
+        assert vtk_data.n_points == 3
+        assert vtk_data.n_cells  == 2
+        assert len(vtk_data.point_data["flt_scalars_point"]) == 3
+        assert len(vtk_data.cell_data["flt_scalars_cell"])   == 2
+        
+
+    def test_merge_points_moving(self):
+        # Two triangles sharing an edge, rotated between two frames
+        points = np.array(
+            [[0.0, 0.0, 0.0], [1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [1.0, 1.0, 0.0]]
+        )
+        rotation = np.array([[0.0, -1.0, 0.0], [1.0, 0.0, 0.0], [0.0, 0.0, 1.0]])
+        frames = []
+        for frame_points in (points, points @ rotation.T):
+            pieces = [
+                pv.UnstructuredGrid([3, 0, 1, 2], [pv.CellType.TRIANGLE], frame_points[[0, 1, 2]]),
+                pv.UnstructuredGrid([3, 0, 1, 2], [pv.CellType.TRIANGLE], frame_points[[2, 1, 3]]),
+            ]
+            frames.append(m_reader.concatenate_pieces(pieces, merge_points=True))
+        assert frames[0].n_points == 4
+        assert list(frames[0].cells) == list(frames[1].cells)
+        assert np.allclose(frames[1].points, frames[0].points @ rotation.T)
+        
+
+    def test_polydata_cell_order(self, pvPD_one_point):
+        vtk_data = m_reader.concatenate_pieces([pvPD_one_point] * 3)
+        assert vtk_data.n_points == 3
+        assert vtk_data.n_cells  == 3
+        
+
+class TestClass_merge_blocks:
+
+    def test_block_id(self, pvUG_one_triangle, pvUG_three_segments):
+        vtk_data = m_reader.merge_blocks(
+            pv.MultiBlock(
+                {"triangle": pvUG_one_triangle, "segments": pvUG_three_segments}
+            )
+        )
+        assert vtk_data.n_points == 6
+        assert vtk_data.n_cells  == 4
+        assert list(vtk_data.cell_data["block_id"])  == [0, 1, 1, 1]
+        assert list(vtk_data.point_data["block_id"]) == [0, 0, 0, 1, 1, 1]
+        
+
+    def test_missing_attribute(self, pvUG_one_triangle):
+        other = pvUG_one_triangle.copy()
+        other.point_data.remove("flt_scalars_point")
+        vtk_data = m_reader.merge_blocks(
+            pv.MultiBlock({"first": pvUG_one_triangle, "second": other})
+        )
+        values = vtk_data.point_data["flt_scalars_point"]
+        assert np.isnan(values[3:]).all()
+        assert not np.isnan(values[:3]).any()
+        
@@ -1,9 +1,21 @@
-from . import filters_panel, view_panel
+from . import (
+    blocks_panel,
+    calculator_panel,
+    filters_panel,
+    playback_panel,
+    view_panel,
+)
 
 def register():
     view_panel.register()
     filters_panel.register()
+    blocks_panel.register()
+    calculator_panel.register()
+    playback_panel.register()
 
 def unregister():
     view_panel.unregister()
     filters_panel.unregister()
+    blocks_panel.unregister()
+    calculator_panel.unregister()
+    playback_panel.unregister()
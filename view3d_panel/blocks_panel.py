@@ -0,0 +1,73 @@
+import bpy
+
+from .view3d_panel import View3D_VTK_Panel
+
+
+def get_blocks_root(obj):
+    while obj.parent is not None and "vtk_block_path" in obj.parent:
+        obj = obj.parent
+    return obj
+
+
+def get_block_placeholders(root):
+    return [obj for obj in root.children_recursive if "vtk_block_placeholder" in obj]
+
+
+class VTK_OT_Enable_Blocks(bpy.types.Operator):
+    bl_idname = "vtk.enable_blocks"
+    bl_label = "Enable blocks"
+    bl_description = "Load or unload the geometry of all blocks"
+    bl_options = {"REGISTER", "UNDO"}
+
+    enable: bpy.props.BoolProperty(name="Enable", default=True)
+
+    def execute(self, context):
+        root = get_blocks_root(context.object)
+        for placeholder in get_block_placeholders(root):
+            placeholder.vtk_block_enabled = self.enable
+        return {"FINISHED"}
+
+
+class VIEW3D_PT_blocks(View3D_VTK_Panel, bpy.types.Panel):
+    bl_label = "Blocks"
+    bl_idname = "VIEW3D_PT_VTK_Blocks"
+
+    @classmethod
+    def poll(cls, context):
+        obj = context.object
+        if obj is None:
+            return False
+        return "vtk_block_path" in obj
+
+    def draw_block(self, layout, obj, depth):
+        row = layout.row()
+        row.separator(factor=2.0 * depth)
+        name = obj.name.split(" : ")[-1]
+        if "vtk_block_placeholder" in obj:
+            row.prop(obj, "vtk_block_enabled", text=name)
+            return
+        row.label(text=name, icon="OUTLINER_OB_EMPTY")
+        for child in obj.children:
+            if "vtk_block_path" in child and child.type == "EMPTY":
+                self.draw_block(layout, child, depth + 1)
+
+    def draw(self, context):
+        layout = self.layout
+        root = get_blocks_root(context.object)
+
+        row = layout.row(align=True)
+        row.operator("vtk.enable_blocks", text="Enable all").enable = True
+        row.operator("vtk.enable_blocks", text="Disable all").enable = False
+
+        box = layout.box()
+        self.draw_block(box, root, 0)
+
+
+def register():
+    bpy.utils.register_class(VTK_OT_Enable_Blocks)
+    bpy.utils.register_class(VIEW3D_PT_blocks)
+
+
+def unregister():
+    bpy.utils.unregister_class(VTK_OT_Enable_Blocks)
+    bpy.utils.unregister_class(VIEW3D_PT_blocks)
@@ -0,0 +1,169 @@
+import bpy
+
+from ..attributes import update_material_attributes
+from ..calculator import (
+    apply_calculators,
+    clear_calculator_results,
+    evaluate_expression,
+    get_calculators,
+    is_auto_run_allowed,
+)
+from ..filters import clear_filter_cache, get_pipeline
+from ..lod import clear_proxies
+from ..reader import get_block, get_frame_file_path, read_frame
+from .filters_panel import get_filter_source, update_filter_output
+from .view3d_panel import View3D_VTK_Panel
+
+DOMAINS = {"POINT": "POINT", "CELL": "FACE"}
+
+
+def remove_calculator_attribute(obj, name):
+    mesh = obj.data
+    if name in mesh.attributes:
+        mesh.attributes.remove(mesh.attributes[name])
+    for mat in mesh.materials:
+        if mat is not None and "attributes" in mat and name in mat["attributes"]:
+            del mat["attributes"][name]
+
+
+class VTK_OT_Calculator(bpy.types.Operator):
+    bl_idname = "vtk.calculator"
+    bl_label = "Calculator"
+    bl_description = "Add an attribute computed with a NumPy expression of the arrays"
+    bl_options = {"REGISTER", "UNDO"}
+
+    name: bpy.props.StringProperty(name="Name", default="Result")
+    expression: bpy.props.StringProperty(
+        name="Expression",
+        description="NumPy expression of the arrays, e.g. mag(velocity), "
+        "von_mises(stress), (p - min(p)) / ptp(p), coords[:, 2]",
+    )
+    domain: bpy.props.EnumProperty(
+        name="Domain",
+        items=[
+            ("POINT", "Point", "Expression of the point arrays"),
+            ("CELL", "Cell", "Expression of the cell arrays"),
+        ],
+    )
+    index: bpy.props.IntProperty(
+        name="Index",
+        description="Index of the edited calculator, -1 to add a new one",
+        default=-1,
+        options={"HIDDEN", "SKIP_SAVE"},
+    )
+
+    @classmethod
+    def poll(cls, context):
+        return context.object is not None and context.object.type == "MESH"
+
+    def execute(self, context):
+        obj = get_filter_source(context)
+        calculators = get_calculators(obj)
+        editing = 0 <= self.index < len(calculators)
+        previous = calculators[: self.index] if editing else calculators
+
+        # Validate the expression on the current frame before storing it
+        vtk_data = get_block(read_frame(get_frame_file_path(obj)), obj)
+        obj["vtk_calculators"] = previous
+        apply_calculators(vtk_data, obj)
+        try:
+            array = evaluate_expression(self.expression, vtk_data, self.domain)
+        except Exception as error:
+            obj["vtk_calculators"] = calculators
+            self.report({"ERROR"}, f"Invalid expression: {error}")
+            return {"CANCELLED"}
+
+        calculator = {
+            "name": self.name,
+            "expression": self.expression,
+            "domain": self.domain,
+        }
+        if editing:
+            remove_calculator_attribute(obj, calculators[self.index]["name"])
+            calculators[self.index] = calculator
+        else:
+            calculators.append(calculator)
+        obj["vtk_calculators"] = calculators
+        clear_calculator_results(obj)
+        clear_filter_cache(obj)
+        clear_proxies()
+
+        mesh = obj.data
+        if len(mesh.materials) > 0 and "attributes" in mesh.materials[0]:
+            update_material_attributes(
+                self.name, array, mesh, mesh.materials[0], DOMAINS[self.domain]
+            )
+            mesh.update()
+        if len(get_pipeline(obj)) > 0:
+            update_filter_output(context, obj)
+
+        return {"FINISHED"}
+
+    def invoke(self, context, event):
+        calculators = get_calculators(get_filter_source(context))
+        if 0 <= self.index < len(calculators):
+            self.name = calculators[self.index]["name"]
+            self.expression = calculators[self.index]["expression"]
+            self.domain = calculators[self.index]["domain"]
+        return context.window_manager.invoke_props_dialog(self, width=400)
+
+
+class VTK_OT_Remove_Calculator(bpy.types.Operator):
+    bl_idname = "vtk.remove_calculator"
+    bl_label = "Remove calculator"
+    bl_description = "Remove this calculator and its attribute"
+    bl_options = {"REGISTER", "UNDO"}
+
+    index: bpy.props.IntProperty(name="Index", default=0)
+
+    def execute(self, context):
+        obj = get_filter_source(context)
+        calculators = get_calculators(obj)
+        calculator = calculators.pop(self.index)
+        obj["vtk_calculators"] = calculators
+        remove_calculator_attribute(obj, calculator["name"])
+        clear_calculator_results(obj)
+        clear_filter_cache(obj)
+        clear_proxies()
+        obj.data.update()
+
+        return {"FINISHED"}
+
+
+class VIEW3D_PT_calculator(View3D_VTK_Panel, bpy.types.Panel):
+    bl_label = "Calculator"
+    bl_idname = "VIEW3D_PT_VTK_Calculator"
+
+    @classmethod
+    def poll(cls, context):
+        obj = context.object
+        return obj is not None and obj.type == "MESH" and "vtk_file_path" in obj
+
+    def draw(self, context):
+        layout = self.layout
+        obj = get_filter_source(context)
+
+        calculators = get_calculators(obj)
+        if len(calculators) > 0:
+            box = layout.box()
+            for index, calculator in enumerate(calculators):
+                row = box.row(align=True)
+                row.label(text=f"{calculator['name']} = {calculator['expression']}")
+                row.operator("vtk.calculator", text="", icon="PREFERENCES").index = index
+                row.operator("vtk.remove_calculator", text="", icon="X").index = index
+            if not is_auto_run_allowed():
+                box.label(text="Auto Run Python Scripts is disabled", icon="ERROR")
+
+        layout.operator("vtk.calculator", text="Add attribute")
+
+
+def register():
+    bpy.utils.register_class(VTK_OT_Calculator)
+    bpy.utils.register_class(VTK_OT_Remove_Calculator)
+    bpy.utils.register_class(VIEW3D_PT_calculator)
+
+
+def unregister():
+    bpy.utils.unregister_class(VTK_OT_Calculator)
+    bpy.utils.unregister_class(VTK_OT_Remove_Calculator)
+    bpy.utils.unregister_class(VIEW3D_PT_calculator)
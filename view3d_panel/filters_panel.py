@@ -1,94 +1,155 @@
+import functools
+import math
+
 import bpy
 import pyvista as pv
 from bpy.types import Context
 from bpy_extras.object_utils import AddObjectHelper, object_data_add
-
-from ..mesh import create_object, set_mesh_attributes, vtk_to_mesh
+from mathutils import Vector
+
+from ..attributes import INTERNAL_ATTRIBUTES
+from ..filters import (
+    get_pipeline,
+    is_pipeline_pending,
+    remove_pipeline_stage,
+    run_pipeline,
+    set_pipeline_stage,
+)
+from ..mesh import create_object, remove_orphan_meshes, update_mesh_in_place
+from ..nodes import (
+    get_glyph_node_group,
+    get_group_input_identifier,
+    get_live_clip_node_group,
+    get_warp_node_group,
+    set_modifier_input,
+)
+from ..playback import is_final_render
 from .view3d_panel import View3D_VTK_Panel
 
 
+# Pipeline result shown by each filter output object, to skip unchanged frames
+_displayed_keys = {}
+# Objects waiting for a threaded stage
+_refresh_scheduled = set()
+
+
 def update_filters(scene):
-    if (
-        "vtk_files" not in bpy.context.scene
-        and "vtk_directory" not in bpy.context.scene
-    ):
+    # Threaded stages don't hold the playback, except for rendered frames
+    wait = is_final_render()
+    for obj in bpy.data.objects:
+        if len(get_pipeline(obj)) > 0:
+            update_filter_output(bpy.context, obj, wait)
+            # Left over by versions replacing the output mesh on every frame
+            remove_orphan_meshes(f"{obj.name}_clipped")
+            remove_orphan_meshes(f"{obj.name}_filtered")
+
+
+def get_filter_source(context):
+    obj = context.object
+    if "vtk_file_path" not in obj and obj.parent is not None:
+        return obj.parent
+    return obj
+
+
+def get_filter_output(obj):
+    if "vtk_filter_output" not in obj:
+        return None
+    return bpy.data.objects.get(obj["vtk_filter_output"])
+
+
+def refresh_filter_output(obj_name):
+    obj = bpy.data.objects.get(obj_name)
+    if obj is not None and is_pipeline_pending(obj):
+        return 0.1
+    _refresh_scheduled.discard(obj_name)
+    if obj is not None:
+        update_filter_output(bpy.context, obj, wait=False)
+    return None
+
+
+def update_filter_output(context, obj, wait=True):
+    vtk_data, key = run_pipeline(obj, wait)
+    if vtk_data is None:
+        # Keep the previous result displayed until the worker thread is done
+        if obj.name not in _refresh_scheduled:
+            _refresh_scheduled.add(obj.name)
+            bpy.app.timers.register(
+                functools.partial(refresh_filter_output, obj.name), first_interval=0.1
+            )
         return
 
-    frame = scene.frame_current
-
-    files = bpy.context.scene["vtk_files"]
-    directory = bpy.context.scene["vtk_directory"]
-    frame_sep = bpy.context.scene["frame_sep"]
-
-    for file in files:
-        if len(file) > 1:
-            obj_name = file[0].split(".")[0].split(frame_sep)[0]
-            obj = bpy.data.objects[obj_name]
-            if "vtk_filters" in obj:
-                vtk_data = pv.read(f"{directory}/{file[frame]}")
-                for vtk_filter in obj["vtk_filters"]:
-                    if vtk_filter == "clip":
-                        clip_filter = obj["vtk_filters"]["clip"]
-                        normal = clip_filter["normal"]
-                        origin = clip_filter["origin"]
-                        invert = clip_filter["invert"]
-                        vtk_data = vtk_data.clip(
-                            normal=normal,
-                            origin=origin,
-                            invert=invert,
-                        )
-
-                        for child in obj.children:
-                            if "clip" in child.name:
-                                mesh = vtk_to_mesh(vtk_data, child.name)
-                                set_mesh_attributes(mesh, vtk_data)
-                                # update_mesh_from_vtk(child.data, vtk_data, update_attributes=True)
-                                child.data = mesh
-                                # child.data.clear_geometry()
-                                # child.data.from_pydata(vertices, [], triangles)
-
-
-# class VTK_OT_Clip(bpy.types.Operator):
-#     bl_idname = "vtk.clip"
-#     bl_label = "Clip"
-#     bl_description = "Clip"
-
-#     def execute(self, context):
-#         obj = context.object
-#         obj.clip_active = not obj.clip_active
-#         name = f"{obj.name}_clipped"
-
-#         if obj.clip_active:
-#             vtk_file_path = obj["vtk_file_path"]
-#             vtk_data = pv.read(vtk_file_path)
-#             normal = obj.clip_normal
-#             origin = obj.clip_origin
-#             invert = obj.clip_invert
-#             if "vtk_block_name" in obj:
-#                 vtk_data = vtk_data[obj["vtk_block_name"]]
-#             clipped = vtk_data.clip(normal=normal, origin=origin, invert=invert)
-
-#             create_object(context, clipped, name)
-#             obj.hide_set(True)
-#             bpy.data.objects[name].parent = obj
-#         else:
-#             obj.hide_set(False)
-#             bpy.data.meshes.remove(bpy.data.meshes[name])
-
-#         return {'FINISHED'}
-
-
-class VTK_OT_Clip(bpy.types.Operator):
+    output = get_filter_output(obj)
+
+    if output is None:
+        if vtk_data.n_points == 0:
+            return
+        output = create_object(context, vtk_data, f"{obj.name}_filtered")
+        output.parent = obj
+        obj["vtk_filter_output"] = output.name
+    elif _displayed_keys.get(obj.name) != key:
+        update_mesh_in_place(output.data, vtk_data)
+
+    _displayed_keys[obj.name] = key
+
+
+def remove_filter_output(obj):
+    output = get_filter_output(obj)
+    if output is not None:
+        mesh = output.data
+        bpy.data.objects.remove(output)
+        if mesh.users == 0:
+            bpy.data.meshes.remove(mesh)
+    if "vtk_filter_output" in obj:
+        del obj["vtk_filter_output"]
+    _displayed_keys.pop(obj.name, None)
+
+
+class VTK_FilterStage:
+    bl_options = {"REGISTER", "UNDO"}
+
+    stage_type = ""
+    stage_properties = ()
+
+    stage_index: bpy.props.IntProperty(
+        name="Stage Index",
+        description="Index of the edited stage, -1 to append a new stage",
+        default=-1,
+        options={"HIDDEN", "SKIP_SAVE"},
+    )
+
+    def get_stage(self):
+        stage = {"type": self.stage_type}
+        for name in self.stage_properties:
+            value = getattr(self, name)
+            if hasattr(value, "__len__") and not isinstance(value, str):
+                value = list(value)
+            stage[name] = value
+        return stage
+
+    def execute(self, context):
+        obj = get_filter_source(context)
+        set_pipeline_stage(obj, self.get_stage(), self.stage_index)
+        update_filter_output(context, obj)
+
+        return {"FINISHED"}
+
+    def invoke(self, context, event):
+        obj = get_filter_source(context)
+        stages = get_pipeline(obj)
+        if 0 <= self.stage_index < len(stages):
+            for name in self.stage_properties:
+                if name in stages[self.stage_index]:
+                    setattr(self, name, stages[self.stage_index][name])
+        return context.window_manager.invoke_props_dialog(self)
+
+
+class VTK_OT_Clip(VTK_FilterStage, bpy.types.Operator):
     bl_idname = "vtk.clip"
     bl_label = "Clip"
     bl_description = "Clip"
-    bl_options = {"REGISTER", "UNDO"}
 
-    obj_name: bpy.props.StringProperty(
-        name="Object Name",
-        description="Object Name",
-        default="",
-    )
+    stage_type = "clip"
+    stage_properties = ("normal", "origin", "invert")
 
     normal: bpy.props.FloatVectorProperty(
         name="Normal",
@@ -108,64 +169,678 @@ class VTK_OT_Clip(bpy.types.Operator):
         default=False,
     )
 
+
+class VTK_OT_Slice(VTK_FilterStage, bpy.types.Operator):
+    bl_idname = "vtk.slice"
+    bl_label = "Slice"
+    bl_description = "Slice"
+
+    stage_type = "slice"
+    stage_properties = ("normal", "origin")
+
+    normal: bpy.props.FloatVectorProperty(
+        name="Normal",
+        subtype="XYZ",
+        description="",
+        default=(1.0, 0.0, 0.0),
+    )
+    origin: bpy.props.FloatVectorProperty(
+        name="Origin",
+        subtype="XYZ",
+        description="",
+        default=(0.0, 0.0, 0.0),
+    )
+
+
+class VTK_OT_Multi_Slice(VTK_FilterStage, bpy.types.Operator):
+    bl_idname = "vtk.multi_slice"
+    bl_label = "Slices"
+    bl_description = "Parallel slices in a single mesh with a slice_id attribute"
+
+    stage_type = "multi_slice"
+    stage_properties = ("normal", "origin", "mode", "first", "last", "count")
+
+    normal: bpy.props.FloatVectorProperty(
+        name="Normal",
+        subtype="XYZ",
+        default=(1.0, 0.0, 0.0),
+    )
+    origin: bpy.props.FloatVectorProperty(
+        name="Origin",
+        subtype="XYZ",
+        default=(0.0, 0.0, 0.0),
+    )
+    mode: bpy.props.EnumProperty(
+        name="Offsets",
+        items=[
+            ("RANGE", "Range", "Evenly spaced offsets from the origin"),
+            ("LIST", "List", "Offsets from the origin separated by commas"),
+        ],
+    )
+    first: bpy.props.FloatProperty(name="First", default=-1.0)
+    last: bpy.props.FloatProperty(name="Last", default=1.0)
+    count: bpy.props.IntProperty(name="Count", default=10, min=1)
+    values: bpy.props.StringProperty(
+        name="Values",
+        description="Offsets separated by commas",
+        default="0.0",
+    )
+
+    def get_stage(self):
+        stage = super().get_stage()
+        values = self.values.replace(";", ",").split(",")
+        stage["values"] = [float(value) for value in values if value.strip()]
+        return stage
+
+    def execute(self, context):
+        try:
+            self.get_stage()
+        except ValueError:
+            self.report({"ERROR"}, f"Invalid offsets: {self.values}")
+            return {"CANCELLED"}
+        return super().execute(context)
+
+    def invoke(self, context, event):
+        obj = get_filter_source(context)
+        stages = get_pipeline(obj)
+        if 0 <= self.stage_index < len(stages):
+            self.values = ", ".join(
+                f"{value:g}" for value in stages[self.stage_index].get("values", [])
+            )
+        elif obj.type == "MESH":
+            # Span the object along the default normal
+            distances = [Vector(corner).dot(self.normal) for corner in obj.bound_box]
+            self.first, self.last = min(distances), max(distances)
+        return super().invoke(context, event)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "normal")
+        layout.prop(self, "origin")
+        layout.prop(self, "mode")
+        if self.mode == "RANGE":
+            layout.prop(self, "first")
+            layout.prop(self, "last")
+            layout.prop(self, "count")
+        else:
+            layout.prop(self, "values")
+
+
+def vtk_enum_filter_scalars(self, context):
+    obj = get_filter_source(context)
+    if obj.type != "MESH":
+        return []
+    return [
+        (attr.name,) * 3
+        for attr in obj.data.attributes
+        if attr.domain in ("POINT", "FACE")
+        and attr.data_type in ("FLOAT", "FLOAT_VECTOR", "FLOAT2")
+        and attr.name != "position"
+        and attr.name not in INTERNAL_ATTRIBUTES
+        and not attr.name.startswith(".")
+    ]
+
+
+class VTK_OT_Threshold(VTK_FilterStage, bpy.types.Operator):
+    bl_idname = "vtk.threshold"
+    bl_label = "Threshold"
+    bl_description = "Keep the cells whose attribute is in a range"
+
+    stage_type = "threshold"
+    stage_properties = ("scalars", "lower", "upper", "method", "invert")
+
+    scalars: bpy.props.EnumProperty(
+        name="Attribute",
+        description="Attribute to threshold, the magnitude is used for vectors",
+        items=vtk_enum_filter_scalars,
+    )
+    lower: bpy.props.FloatProperty(name="Lower", default=0.0)
+    upper: bpy.props.FloatProperty(name="Upper", default=1.0)
+    method: bpy.props.EnumProperty(
+        name="Method",
+        description="Criterion for point attributes",
+        items=[
+            ("ALL", "All points", "Keep cells with all their points in the range"),
+            ("ANY", "Any point", "Keep cells with at least one point in the range"),
+            ("CENTROID", "Centroid", "Keep cells with their mean value in the range"),
+        ],
+    )
+    invert: bpy.props.BoolProperty(name="Invert", default=False)
+
+    def execute(self, context):
+        if not self.scalars:
+            self.report({"WARNING"}, "No attribute to threshold")
+            return {"CANCELLED"}
+        return super().execute(context)
+
+
+def vtk_enum_contour_scalars(self, context):
+    obj = get_filter_source(context)
+    if obj.type != "MESH":
+        return []
+    attributes = obj.data.attributes
+    return [
+        item
+        for item in vtk_enum_filter_scalars(self, context)
+        if attributes[item[0]].data_type == "FLOAT"
+    ]
+
+
+class VTK_OT_Contour(VTK_FilterStage, bpy.types.Operator):
+    bl_idname = "vtk.contour"
+    bl_label = "Contour"
+    bl_description = "Isosurfaces of a scalar attribute"
+
+    stage_type = "contour"
+    stage_properties = ("scalars",)
+
+    scalars: bpy.props.EnumProperty(
+        name="Attribute",
+        description="Scalar attribute to contour",
+        items=vtk_enum_contour_scalars,
+    )
+    values: bpy.props.StringProperty(
+        name="Values",
+        description="Iso-values separated by commas",
+        default="0.0",
+    )
+
+    def get_stage(self):
+        stage = super().get_stage()
+        values = self.values.replace(";", ",").split(",")
+        stage["values"] = [float(value) for value in values if value.strip()]
+        return stage
+
+    def execute(self, context):
+        if not self.scalars:
+            self.report({"WARNING"}, "No scalar attribute to contour")
+            return {"CANCELLED"}
+        try:
+            self.get_stage()
+        except ValueError:
+            self.report({"ERROR"}, f"Invalid iso-values: {self.values}")
+            return {"CANCELLED"}
+        return super().execute(context)
+
+    def invoke(self, context, event):
+        stages = get_pipeline(get_filter_source(context))
+        if 0 <= self.stage_index < len(stages):
+            self.values = ", ".join(
+                f"{value:g}" for value in stages[self.stage_index]["values"]
+            )
+        return super().invoke(context, event)
+
+
+class VTK_OT_Remove_Filter(bpy.types.Operator):
+    bl_idname = "vtk.remove_filter"
+    bl_label = "Remove filter"
+    bl_description = "Remove this stage from the filter pipeline"
+    bl_options = {"REGISTER", "UNDO"}
+
+    stage_index: bpy.props.IntProperty(name="Stage Index", default=0)
+
+    def execute(self, context):
+        obj = get_filter_source(context)
+        remove_pipeline_stage(obj, self.stage_index)
+        if len(get_pipeline(obj)) == 0:
+            remove_filter_output(obj)
+        else:
+            update_filter_output(context, obj)
+
+        return {"FINISHED"}
+
+
+def vtk_enum_warp_attributes(self, context):
+    data_type = "FLOAT_VECTOR" if self.mode == "VECTOR" else "FLOAT"
+    mesh = context.object.data
+    return [
+        (attr.name,) * 3
+        for attr in mesh.attributes
+        if attr.data_type == data_type
+        and attr.name != "position"
+        and attr.name not in INTERNAL_ATTRIBUTES
+        and not attr.name.startswith(".")
+    ]
+
+
+def get_warp_modifier(obj):
+    if obj is None or obj.type != "MESH":
+        return None
+    return obj.modifiers.get("VTK Warp")
+
+
+class VTK_OT_Warp(bpy.types.Operator):
+    bl_idname = "vtk.warp"
+    bl_label = "Warp"
+    bl_description = "Warp by a vector or scalar attribute with geometry nodes"
+    bl_options = {"REGISTER", "UNDO"}
+
+    mode: bpy.props.EnumProperty(
+        name="Mode",
+        items=[
+            ("VECTOR", "Vector", "Offset the points by a vector attribute"),
+            ("SCALAR", "Scalar", "Offset along the normals by a scalar attribute"),
+        ],
+    )
+    attribute: bpy.props.EnumProperty(
+        name="Attribute",
+        items=vtk_enum_warp_attributes,
+    )
+    factor: bpy.props.FloatProperty(name="Factor", default=1.0)
+
+    @classmethod
+    def poll(cls, context):
+        return context.object is not None and context.object.type == "MESH"
+
     def execute(self, context):
         obj = context.object
+        if not self.attribute:
+            self.report({"WARNING"}, "No attribute to warp by")
+            return {"CANCELLED"}
+
+        # Geometry nodes read the attribute already on the mesh,
+        # frame changes only upload new attribute values
+        modifier = get_warp_modifier(obj)
+        if modifier is None:
+            modifier = obj.modifiers.new(name="VTK Warp", type="NODES")
+        modifier.node_group = get_warp_node_group(self.mode)
+        set_modifier_input(modifier, "Attribute", self.attribute)
+        set_modifier_input(modifier, "Factor", self.factor)
+
+        return {"FINISHED"}
+
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
+
+
+class VTK_OT_Remove_Warp(bpy.types.Operator):
+    bl_idname = "vtk.remove_warp"
+    bl_label = "Remove warp"
+    bl_description = "Remove the warp modifier"
+    bl_options = {"REGISTER", "UNDO"}
+
+    def execute(self, context):
+        modifier = get_warp_modifier(context.object)
+        if modifier is not None:
+            context.object.modifiers.remove(modifier)
+        return {"FINISHED"}
+
+
+def vtk_enum_glyph_vectors(self, context):
+    obj = get_filter_source(context)
+    if obj.type != "MESH":
+        return []
+    attributes = obj.data.attributes
+    return [
+        item
+        for item in vtk_enum_filter_scalars(self, context)
+        if attributes[item[0]].data_type == "FLOAT_VECTOR"
+    ]
+
 
-        # name = f"{obj.name}_clipped"
+def vtk_enum_glyph_scalars(self, context):
+    return vtk_enum_contour_scalars(self, context) or [("", "None", "")]
 
-        # vtk_file_path = obj["vtk_file_path"]
-        # vtk_data = pv.read(vtk_file_path)
-        # if "vtk_block_name" in obj:
-        #     vtk_data = vtk_data[obj["vtk_block_name"]]
 
-        if "vtk_filters" not in obj:
-            obj["vtk_filters"] = {}
-        if "clip" not in obj["vtk_filters"]:
-            obj["vtk_filters"]["clip"] = {}
-        obj["vtk_filters"]["clip"]["normal"] = self.normal
-        obj["vtk_filters"]["clip"]["origin"] = self.origin
-        obj["vtk_filters"]["clip"]["invert"] = self.invert
+def get_glyph_object(obj):
+    if "vtk_glyph_object" not in obj:
+        return None
+    return bpy.data.objects.get(obj["vtk_glyph_object"])
 
-        clipped = self.vtk_data.clip(
-            normal=self.normal, origin=self.origin, invert=self.invert
+
+class VTK_OT_Glyph(bpy.types.Operator):
+    bl_idname = "vtk.glyph"
+    bl_label = "Glyph"
+    bl_description = "Arrows or spheres instanced on the points with geometry nodes"
+    bl_options = {"REGISTER", "UNDO"}
+
+    shape: bpy.props.EnumProperty(
+        name="Shape",
+        items=[
+            ("ARROW", "Arrow", "Arrows oriented along the vectors"),
+            ("SPHERE", "Sphere", "Spheres"),
+        ],
+    )
+    vectors: bpy.props.EnumProperty(
+        name="Vectors",
+        description="Vector attribute orienting the glyphs",
+        items=vtk_enum_glyph_vectors,
+    )
+    scale_by_scalars: bpy.props.BoolProperty(name="Scale by scalars", default=False)
+    scalars: bpy.props.EnumProperty(
+        name="Scalars",
+        description="Scalar attribute scaling the glyphs",
+        items=vtk_enum_glyph_scalars,
+    )
+    factor: bpy.props.FloatProperty(name="Factor", default=1.0)
+    stride: bpy.props.IntProperty(
+        name="Stride", description="Keep one point out of Stride", default=1, min=1
+    )
+    ratio: bpy.props.FloatProperty(
+        name="Ratio",
+        description="Random fraction of the points kept after the stride",
+        default=1.0,
+        min=0.0,
+        max=1.0,
+        subtype="FACTOR",
+    )
+    seed: bpy.props.IntProperty(name="Seed", default=0)
+
+    @classmethod
+    def poll(cls, context):
+        return context.object is not None and context.object.type == "MESH"
+
+    def execute(self, context):
+        # The glyph object shares the mesh of the source, the frame update of the
+        # mesh attributes is the only per-frame cost
+        obj = get_filter_source(context)
+        glyphs = get_glyph_object(obj)
+        if glyphs is None:
+            glyphs = bpy.data.objects.new(f"{obj.name}_glyphs", obj.data)
+            context.scene.collection.objects.link(glyphs)
+            glyphs.parent = obj
+            obj["vtk_glyph_object"] = glyphs.name
+
+        modifier = glyphs.modifiers.get("VTK Glyph")
+        if modifier is None:
+            modifier = glyphs.modifiers.new(name="VTK Glyph", type="NODES")
+        modifier.node_group = get_glyph_node_group(self.shape)
+        set_modifier_input(modifier, "Vectors", self.vectors)
+        set_modifier_input(modifier, "Scalars", self.scalars)
+        set_modifier_input(
+            modifier, "Scale By Scalars", self.scale_by_scalars and bool(self.scalars)
         )
-        if clipped.n_points == 0:
-            return {"FINISHED"}
+        set_modifier_input(modifier, "Factor", self.factor)
+        set_modifier_input(modifier, "Stride", self.stride)
+        set_modifier_input(modifier, "Ratio", self.ratio)
+        set_modifier_input(modifier, "Seed", self.seed)
+
+        return {"FINISHED"}
 
-        clipped_obj = create_object(context, clipped, self.clip_name)
-        # context.view_layer.objects.active = obj
-        # obj.hide_set(True)
-        clipped_obj.parent = obj
+    def invoke(self, context, event):
+        return context.window_manager.invoke_props_dialog(self)
 
-        # object_data_add(context, bpy.data.meshes[name], operator=self)
 
+class VTK_OT_Remove_Glyph(bpy.types.Operator):
+    bl_idname = "vtk.remove_glyph"
+    bl_label = "Remove glyphs"
+    bl_description = "Remove the glyph object"
+    bl_options = {"REGISTER", "UNDO"}
+
+    def execute(self, context):
+        obj = get_filter_source(context)
+        glyphs = get_glyph_object(obj)
+        if glyphs is not None:
+            bpy.data.objects.remove(glyphs)
+        if "vtk_glyph_object" in obj:
+            del obj["vtk_glyph_object"]
         return {"FINISHED"}
 
+
+class VTK_OT_Streamlines(VTK_FilterStage, bpy.types.Operator):
+    bl_idname = "vtk.streamlines"
+    bl_label = "Streamlines"
+    bl_description = "Streamlines of a vector attribute, traced in a worker thread"
+
+    stage_type = "streamlines"
+    stage_properties = (
+        "vectors",
+        "seed_type",
+        "point_a",
+        "point_b",
+        "center",
+        "normal",
+        "size",
+        "resolution",
+        "seed_object",
+        "direction",
+        "step_length",
+        "max_steps",
+        "tubes",
+        "radius",
+    )
+
+    vectors: bpy.props.EnumProperty(
+        name="Vectors",
+        description="Point vector attribute to integrate",
+        items=vtk_enum_glyph_vectors,
+    )
+    seed_type: bpy.props.EnumProperty(
+        name="Seeds",
+        items=[
+            ("LINE", "Line", "Seeds evenly spaced on a line"),
+            ("PLANE", "Plane", "Seeds on a square grid"),
+            ("POINTS", "Object", "Seeds at the vertices of an object"),
+        ],
+    )
+    point_a: bpy.props.FloatVectorProperty(name="Point A", subtype="XYZ")
+    point_b: bpy.props.FloatVectorProperty(name="Point B", subtype="XYZ")
+    center: bpy.props.FloatVectorProperty(name="Center", subtype="XYZ")
+    normal: bpy.props.FloatVectorProperty(
+        name="Normal", subtype="XYZ", default=(0.0, 0.0, 1.0)
+    )
+    size: bpy.props.FloatProperty(name="Size", default=1.0, min=0.0)
+    resolution: bpy.props.IntProperty(name="Resolution", default=10, min=1)
+    seed_object: bpy.props.StringProperty(
+        name="Object", description="Object whose vertices are the seeds"
+    )
+    direction: bpy.props.EnumProperty(
+        name="Direction",
+        items=[
+            ("BOTH", "Both", ""),
+            ("FORWARD", "Forward", ""),
+            ("BACKWARD", "Backward", ""),
+        ],
+    )
+    step_length: bpy.props.FloatProperty(
+        name="Step length",
+        description="Integration step, relative to the cell size",
+        default=0.5,
+        min=1e-3,
+    )
+    max_steps: bpy.props.IntProperty(name="Max steps", default=2000, min=1)
+    tubes: bpy.props.BoolProperty(name="Tubes", default=False)
+    radius: bpy.props.FloatProperty(
+        name="Radius", description="Tube radius, 0 for automatic", default=0.0, min=0.0
+    )
+
+    def get_stage(self):
+        stage = super().get_stage()
+        if self.seed_type == "POINTS":
+            # Seed positions in the local space of the data, fixed at this point
+            obj = get_filter_source(bpy.context)
+            seed_object = bpy.data.objects[self.seed_object]
+            matrix = obj.matrix_world.inverted() @ seed_object.matrix_world
+            stage["seed_points"] = [
+                coordinate
+                for vertex in seed_object.data.vertices
+                for coordinate in matrix @ vertex.co
+            ]
+        return stage
+
+    def execute(self, context):
+        if not self.vectors:
+            self.report({"WARNING"}, "No vector attribute to trace")
+            return {"CANCELLED"}
+        if self.seed_type == "POINTS":
+            seed_object = bpy.data.objects.get(self.seed_object)
+            if seed_object is None or seed_object.type != "MESH":
+                self.report({"WARNING"}, "The seed object must be a mesh")
+                return {"CANCELLED"}
+        return super().execute(context)
+
     def invoke(self, context, event):
+        obj = get_filter_source(context)
+        if self.stage_index < 0 and obj.type == "MESH":
+            corners = [Vector(corner) for corner in obj.bound_box]
+            self.point_a, self.point_b = corners[0], corners[6]
+            self.center = 0.125 * sum(corners, Vector())
+            self.size = max(obj.dimensions)
+        return super().invoke(context, event)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "vectors")
+        layout.prop(self, "seed_type")
+        if self.seed_type == "LINE":
+            layout.prop(self, "point_a")
+            layout.prop(self, "point_b")
+            layout.prop(self, "resolution")
+        elif self.seed_type == "PLANE":
+            layout.prop(self, "center")
+            layout.prop(self, "normal")
+            layout.prop(self, "size")
+            layout.prop(self, "resolution")
+        else:
+            layout.prop_search(self, "seed_object", bpy.data, "objects")
+        layout.prop(self, "direction")
+        layout.prop(self, "step_length")
+        layout.prop(self, "max_steps")
+        row = layout.row()
+        row.prop(self, "tubes")
+        if self.tubes:
+            row.prop(self, "radius")
+
+
+def get_live_clip_modifier(obj):
+    if obj is None or obj.type != "MESH":
+        return None
+    return obj.modifiers.get("VTK Live Clip")
+
+
+def create_clip_plane(context, obj):
+    name = f"{obj.name}_clip_plane"
+    size = 0.5 * max(max(obj.dimensions), 1e-3)
+    vertices = [(-size, -size, 0.0), (size, -size, 0.0), (size, size, 0.0), (-size, size, 0.0)]
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata(vertices=vertices, edges=[], faces=[(0, 1, 2, 3)])
+
+    plane = bpy.data.objects.new(name, mesh)
+    plane.display_type = "WIRE"
+    plane.hide_render = True
+    plane["vtk_clip_plane"] = True
+    context.scene.collection.objects.link(plane)
+    plane.parent = obj
+    plane.location = 0.125 * sum(
+        (Vector(corner) for corner in obj.bound_box), Vector()
+    )
+    plane.rotation_euler = (0.0, 0.5 * math.pi, 0.0)  # normal along X as VTK_OT_Clip
+    return plane
+
+
+def update_clip_offset(self, context):
+    # Move the plane along its normal by the offset change of the gizmo
+    applied_offset = self.get("vtk_clip_applied_offset", 0.0)
+    normal = self.matrix_basis.to_3x3().col[2].normalized()
+    self.location += (self.vtk_clip_offset - applied_offset) * normal
+    self["vtk_clip_applied_offset"] = self.vtk_clip_offset
+
+
+class VTK_OT_Live_Clip(bpy.types.Operator):
+    bl_idname = "vtk.live_clip"
+    bl_label = "Live clip"
+    bl_description = "Clip by a plane object updated interactively with geometry nodes"
+    bl_options = {"REGISTER", "UNDO"}
+
+    invert: bpy.props.BoolProperty(name="Invert", default=False)
+
+    @classmethod
+    def poll(cls, context):
+        return context.object is not None and context.object.type == "MESH"
+
+    def execute(self, context):
         obj = context.object
-        self.clip_name = f"{obj.name}_clipped"
-        vtk_file_path = obj["vtk_file_path"]
-        self.vtk_data = pv.read(vtk_file_path)
-        if "vtk_block_name" in obj:
-            self.vtk_data = self.vtk_data[obj["vtk_block_name"]]
-        return context.window_manager.invoke_props_dialog(self)
+        modifier = get_live_clip_modifier(obj)
+        if modifier is None:
+            modifier = obj.modifiers.new(name="VTK Live Clip", type="NODES")
+            modifier.node_group = get_live_clip_node_group()
+            set_modifier_input(modifier, "Plane", create_clip_plane(context, obj))
+        set_modifier_input(modifier, "Invert", self.invert)
 
-    # def draw(self, context):
-    #     layout = self.layout
-    #     layout.prop(self, "normal", text="Normal")
-    #     layout.prop(self, "origin", text="Origin")
-    #     layout.prop(self, "invert", text="Invert")
+        return {"FINISHED"}
 
 
-class VTK_OT_Warp(bpy.types.Operator):
-    bl_idname = "vtk.warp"
-    bl_label = "Warp"
-    bl_description = "Warp"
+class VTK_OT_Apply_Live_Clip(bpy.types.Operator):
+    bl_idname = "vtk.apply_live_clip"
+    bl_label = "Exact clip"
+    bl_description = "Replace the live clip by an exact VTK clip stage in the filter pipeline"
+    bl_options = {"REGISTER", "UNDO"}
+
+    @classmethod
+    def poll(cls, context):
+        return get_live_clip_modifier(context.object) is not None
 
     def execute(self, context):
+        obj = context.object
+        modifier = get_live_clip_modifier(obj)
+        identifier = get_group_input_identifier(modifier.node_group, "Plane")
+        plane = modifier[identifier]
+        if plane is None:
+            self.report({"ERROR"}, "The clip plane object was deleted")
+            return {"CANCELLED"}
+        invert = modifier[get_group_input_identifier(modifier.node_group, "Invert")]
+
+        source = get_filter_source(context)
+        matrix = source.matrix_world.inverted() @ plane.matrix_world
+        normal = (matrix.to_3x3() @ Vector((0.0, 0.0, 1.0))).normalized()
+        # The live clip deletes the side the normal points to, as pyvista's invert
+        stage = {
+            "type": "clip",
+            "normal": list(normal),
+            "origin": list(matrix.translation),
+            "invert": not invert,
+        }
+        set_pipeline_stage(source, stage)
+
+        obj.modifiers.remove(modifier)
+        mesh = plane.data
+        bpy.data.objects.remove(plane)
+        bpy.data.meshes.remove(mesh)
+
+        update_filter_output(context, source)
+
         return {"FINISHED"}
 
 
+class VTK_GGT_Clip_Plane(bpy.types.GizmoGroup):
+    bl_idname = "VTK_GGT_clip_plane"
+    bl_label = "VTK clip plane"
+    bl_space_type = "VIEW_3D"
+    bl_region_type = "WINDOW"
+    bl_options = {"3D", "PERSISTENT"}
+
+    @classmethod
+    def poll(cls, context):
+        return context.object is not None and "vtk_clip_plane" in context.object
+
+    def setup(self, context):
+        gizmo = self.gizmos.new("GIZMO_GT_arrow_3d")
+        gizmo.target_set_prop("offset", context.object, "vtk_clip_offset")
+        gizmo.color = (1.0, 0.5, 0.0)
+        gizmo.alpha = 0.5
+        gizmo.color_highlight = (1.0, 0.8, 0.0)
+        gizmo.alpha_highlight = 1.0
+        self.arrow = gizmo
+
+    def refresh(self, context):
+        plane = context.object
+        self.arrow.target_set_prop("offset", plane, "vtk_clip_offset")
+        matrix = plane.matrix_world.normalized()
+        normal = matrix.to_3x3().col[2]
+        matrix.translation -= plane.vtk_clip_offset * normal
+        self.arrow.matrix_basis = matrix
+
+
+FILTER_OPERATORS = {
+    VTK_OT_Clip.stage_type: VTK_OT_Clip.bl_idname,
+    VTK_OT_Slice.stage_type: VTK_OT_Slice.bl_idname,
+    VTK_OT_Multi_Slice.stage_type: VTK_OT_Multi_Slice.bl_idname,
+    VTK_OT_Threshold.stage_type: VTK_OT_Threshold.bl_idname,
+    VTK_OT_Contour.stage_type: VTK_OT_Contour.bl_idname,
+    VTK_OT_Streamlines.stage_type: VTK_OT_Streamlines.bl_idname,
+}
+
+
 class VIEW3D_PT_filters(View3D_VTK_Panel, bpy.types.Panel):
     bl_label = "Filters"
     bl_idname = "VIEW3D_PT_VTK_Filters"
@@ -187,17 +862,80 @@ class VIEW3D_PT_filters(View3D_VTK_Panel, bpy.types.Panel):
         # layout.prop(context.object, "clip_normal", text="")
         # layout.prop(context.object, "clip_origin", text="")
         # layout.prop(context.object, "clip_invert", text="Invert")
-        layout.operator("vtk.clip", text="Clip")
+        obj = get_filter_source(context)
+        stages = get_pipeline(obj)
+        if len(stages) > 0:
+            box = layout.box()
+            for index, stage in enumerate(stages):
+                row = box.row(align=True)
+                row.label(text=f"{index + 1}. {stage['type'].capitalize()}")
+                if stage["type"] in FILTER_OPERATORS:
+                    row.operator(
+                        FILTER_OPERATORS[stage["type"]], text="", icon="PREFERENCES"
+                    ).stage_index = index
+                row.operator("vtk.remove_filter", text="", icon="X").stage_index = index
+
+        row = layout.row(align=True)
+        row.operator("vtk.clip", text="Clip")
+        row.operator("vtk.slice", text="Slice")
+        row.operator("vtk.multi_slice", text="Slices")
+        row = layout.row(align=True)
+        row.operator("vtk.contour", text="Contour")
+        row.operator("vtk.threshold", text="Threshold")
+        row.operator("vtk.streamlines", text="Streamlines")
 
         layout.separator()
 
-        layout.operator("vtk.warp", text="Warp")
+        row = layout.row(align=True)
+        modifier = get_live_clip_modifier(context.object)
+        if modifier is None:
+            row.operator("vtk.live_clip", text="Live clip")
+        else:
+            identifier = get_group_input_identifier(modifier.node_group, "Invert")
+            row.prop(modifier, f'["{identifier}"]', text="Invert")
+            row.operator("vtk.apply_live_clip", text="Exact clip")
+
+        row = layout.row(align=True)
+        row.operator("vtk.glyph", text="Glyphs")
+        glyphs = get_glyph_object(obj)
+        if glyphs is not None and "VTK Glyph" in glyphs.modifiers:
+            modifier = glyphs.modifiers["VTK Glyph"]
+            identifier = get_group_input_identifier(modifier.node_group, "Factor")
+            row.prop(modifier, f'["{identifier}"]', text="Factor")
+            row.operator("vtk.remove_glyph", text="", icon="X")
+
+        row = layout.row(align=True)
+        row.operator("vtk.warp", text="Warp")
+        modifier = get_warp_modifier(context.object)
+        if modifier is not None and modifier.node_group is not None:
+            identifier = get_group_input_identifier(modifier.node_group, "Factor")
+            row.prop(modifier, f'["{identifier}"]', text="Factor")
+            row.operator("vtk.remove_warp", text="", icon="X")
 
 
 def register():
     bpy.utils.register_class(VIEW3D_PT_filters)
     bpy.utils.register_class(VTK_OT_Clip)
+    bpy.utils.register_class(VTK_OT_Slice)
+    bpy.utils.register_class(VTK_OT_Multi_Slice)
+    bpy.utils.register_class(VTK_OT_Threshold)
+    bpy.utils.register_class(VTK_OT_Contour)
+    bpy.utils.register_class(VTK_OT_Streamlines)
+    bpy.utils.register_class(VTK_OT_Remove_Filter)
     bpy.utils.register_class(VTK_OT_Warp)
+    bpy.utils.register_class(VTK_OT_Remove_Warp)
+    bpy.utils.register_class(VTK_OT_Glyph)
+    bpy.utils.register_class(VTK_OT_Remove_Glyph)
+    bpy.utils.register_class(VTK_OT_Live_Clip)
+    bpy.utils.register_class(VTK_OT_Apply_Live_Clip)
+    bpy.utils.register_class(VTK_GGT_Clip_Plane)
+
+    bpy.types.Object.vtk_clip_offset = bpy.props.FloatProperty(
+        name="Clip offset",
+        description="Offset of the clip plane along its normal",
+        default=0.0,
+        update=update_clip_offset,
+    )
 
     # bpy.types.Object.clip_active = bpy.props.BoolProperty(
     #     name='Active',
@@ -231,4 +969,18 @@ def unregister():
 
     bpy.utils.unregister_class(VIEW3D_PT_filters)
     bpy.utils.unregister_class(VTK_OT_Clip)
+    bpy.utils.unregister_class(VTK_OT_Slice)
+    bpy.utils.unregister_class(VTK_OT_Multi_Slice)
+    bpy.utils.unregister_class(VTK_OT_Threshold)
+    bpy.utils.unregister_class(VTK_OT_Contour)
+    bpy.utils.unregister_class(VTK_OT_Streamlines)
+    bpy.utils.unregister_class(VTK_OT_Remove_Filter)
     bpy.utils.unregister_class(VTK_OT_Warp)
+    bpy.utils.unregister_class(VTK_OT_Remove_Warp)
+    bpy.utils.unregister_class(VTK_OT_Glyph)
+    bpy.utils.unregister_class(VTK_OT_Remove_Glyph)
+    bpy.utils.unregister_class(VTK_OT_Live_Clip)
+    bpy.utils.unregister_class(VTK_OT_Apply_Live_Clip)
+    bpy.utils.unregister_class(VTK_GGT_Clip_Plane)
+
+    del bpy.types.Object.vtk_clip_offset
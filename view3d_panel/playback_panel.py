@@ -0,0 +1,118 @@
+import bpy
+
+from ..lod import clear_proxies
+from ..mesh import update_mesh
+from .filters_panel import update_filters
+from .view3d_panel import View3D_VTK_Panel
+
+
+def update_lod(self, context):
+    clear_proxies()
+    update_mesh(context.scene, force=True)
+
+
+def update_frames_per_file(self, context):
+    scene = context.scene
+    max_frame = max(len(file) for file in scene["vtk_files"]) - 1
+    if max_frame > 0:
+        scene.frame_end = max_frame * scene.vtk_frames_per_file
+    update_mesh(scene)
+    update_filters(scene)
+
+
+def update_stride(self, context):
+    update_mesh(context.scene)
+    update_filters(context.scene)
+
+
+class VIEW3D_PT_playback(View3D_VTK_Panel, bpy.types.Panel):
+    bl_label = "Playback"
+    bl_idname = "VIEW3D_PT_VTK_Playback"
+
+    @classmethod
+    def poll(cls, context):
+        return "vtk_files" in context.scene
+
+    def draw(self, context):
+        layout = self.layout
+        scene = context.scene
+
+        col = layout.column(align=True)
+        col.prop(scene, "vtk_frames_per_file")
+        col.prop(scene, "vtk_interpolate_frames")
+
+        col = layout.column(align=True)
+        col.prop(scene, "vtk_frame_stride")
+        col.prop(scene, "vtk_prefetch_frames")
+
+        layout.prop(scene, "vtk_lod_enabled")
+        col = layout.column(align=True)
+        col.enabled = scene.vtk_lod_enabled
+        col.prop(scene, "vtk_lod_divisions")
+        col.prop(scene, "vtk_lod_min_cells")
+
+
+def register():
+    bpy.types.Scene.vtk_frames_per_file = bpy.props.IntProperty(
+        name="Frames per file",
+        description="Number of animation frames between two files of the sequences",
+        default=1,
+        min=1,
+        update=update_frames_per_file,
+    )
+    bpy.types.Scene.vtk_interpolate_frames = bpy.props.BoolProperty(
+        name="Interpolate",
+        description="Blend the points and attributes of two consecutive files "
+        "with the same topology, instead of holding the files",
+        default=False,
+        update=update_stride,
+    )
+    bpy.types.Scene.vtk_frame_stride = bpy.props.IntProperty(
+        name="Frame stride",
+        description="Read one file every N frames in the viewport, holding it in "
+        "between. Renders read every frame",
+        default=1,
+        min=1,
+        update=update_stride,
+    )
+    bpy.types.Scene.vtk_prefetch_frames = bpy.props.IntProperty(
+        name="Prefetch frames",
+        description="Number of following files read in the background "
+        "during playback and rendering",
+        default=2,
+        min=0,
+        max=16,
+    )
+    bpy.types.Scene.vtk_lod_enabled = bpy.props.BoolProperty(
+        name="Viewport proxy",
+        description="Show decimated surfaces in the viewport, "
+        "the full resolution frames are used when rendering",
+        default=False,
+        update=update_lod,
+    )
+    bpy.types.Scene.vtk_lod_divisions = bpy.props.IntProperty(
+        name="Preview resolution",
+        description="Number of clusters along the largest side of the bounding box",
+        default=64,
+        min=2,
+        update=update_lod,
+    )
+    bpy.types.Scene.vtk_lod_min_cells = bpy.props.IntProperty(
+        name="Min cells",
+        description="Datasets with fewer cells are shown at full resolution",
+        default=100000,
+        min=0,
+        update=update_lod,
+    )
+    bpy.utils.register_class(VIEW3D_PT_playback)
+
+
+def unregister():
+    del bpy.types.Scene.vtk_frames_per_file
+    del bpy.types.Scene.vtk_interpolate_frames
+    del bpy.types.Scene.vtk_frame_stride
+    del bpy.types.Scene.vtk_prefetch_frames
+    del bpy.types.Scene.vtk_lod_enabled
+    del bpy.types.Scene.vtk_lod_divisions
+    del bpy.types.Scene.vtk_lod_min_cells
+    bpy.utils.unregister_class(VIEW3D_PT_playback)